@@ -1,26 +1,58 @@
 from agents.prompts import SYSTEM_PROMPT, RECIPE_SCHEMA
+from services.metrics import AGENT_DURATION, traced
+import asyncio
 import json
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 class CookingExpertAgent:
     """
     An agent that specializes in recipe generation, optimization, and nutritional analysis.
     """
     
-    def __init__(self, model_name: str = "gemini-1.5-pro"):
+    def __init__(self, model_name: str = "gemini-1.5-pro", simulated_delay: float = 0.0, nutrient_cache_size: int = 4096):
         self.model_name = model_name
         self.system_prompt = SYSTEM_PROMPT
+        # Artificial latency for the simulated modes, to exercise callers under realistic timing
+        self.simulated_delay = simulated_delay
+        # extract_nutrients results by normalized ingredient name, least recently used evicted first
+        self.nutrient_cache_size = nutrient_cache_size
+        self._nutrient_cache: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
 
+    @traced("generate_recipe", AGENT_DURATION, "method")
     async def generate_recipe(self, prompt: str, mode: str = "freestyle") -> Dict[str, Any]:
         """
         Generates a recipe. 
         In a live environment, this would call an LLM with structured output.
         """
         # Simulated LLM processing
+        if self.simulated_delay:
+            await asyncio.sleep(self.simulated_delay)
         if mode == "assisted":
             return await self._simulate_assisted_mode(prompt)
         return await self._simulate_freestyle_mode(prompt)
 
+    @traced("stream_recipe", AGENT_DURATION, "method")
+    async def stream_recipe(self, prompt: str, mode: str = "freestyle") -> AsyncIterator[str]:
+        """
+        Streams the recipe JSON as text tokens.
+        In a live environment, these would be the model's streamed output tokens.
+        """
+        if mode == "assisted":
+            recipe = await self._simulate_assisted_mode(prompt)
+        else:
+            recipe = await self._simulate_freestyle_mode(prompt)
+        text = json.dumps(recipe)
+        tokens = [text[i:i + 16] for i in range(0, len(text), 16)]
+        for token in tokens:
+            if self.simulated_delay:
+                # Spread the simulated latency across the stream
+                await asyncio.sleep(self.simulated_delay / len(tokens))
+            yield token
+
     async def _simulate_freestyle_mode(self, prompt: str) -> Dict[str, Any]:
         # Realistic mock response based on prompts
         return {
@@ -71,10 +103,92 @@ class CookingExpertAgent:
         return [{"order": i+1, "instruction": s} for i, s in enumerate(raw_steps)]
 
     async def extract_nutrients(self, ingredient_name: str) -> Dict[str, float]:
-        # Logic to parse ingredient strings or query nutrition APIs
-        return {
-            "calories": 100.0,
-            "protein": 5.0,
-            "carbohydrates": 20.0,
-            "fats": 2.0
-        }
+        key = self.normalize_name(ingredient_name)
+        nutrients = self._cached_nutrients(key)
+        if nutrients is None:
+            nutrients = (await self._extract_nutrients_chunk([key]))[0]
+            self._store_nutrients(key, nutrients)
+        return dict(nutrients)
+
+    def _cached_nutrients(self, key: str) -> Optional[Dict[str, float]]:
+        nutrients = self._nutrient_cache.get(key)
+        if nutrients is not None:
+            self._nutrient_cache.move_to_end(key)
+        return nutrients
+
+    def _store_nutrients(self, key: str, nutrients: Dict[str, float]):
+        self._nutrient_cache[key] = nutrients
+        self._nutrient_cache.move_to_end(key)
+        while len(self._nutrient_cache) > self.nutrient_cache_size:
+            self._nutrient_cache.popitem(last=False)
+
+    @staticmethod
+    def normalize_name(ingredient_name: str) -> str:
+        return " ".join(ingredient_name.split()).casefold()
+
+    async def optimize_steps_batch(
+        self, recipes: List[List[str]], batch_size: int = 8, concurrency: int = 4
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Optimizes the steps of many recipes, batch_size recipes per model call
+        with up to `concurrency` calls in flight. Results keep the input order.
+        """
+        return await self._run_batched(recipes, batch_size, concurrency, self._optimize_steps_chunk)
+
+    async def extract_nutrients_batch(
+        self, ingredient_names: List[str], batch_size: int = 50, concurrency: int = 4
+    ) -> List[Dict[str, float]]:
+        """
+        Extracts nutrients for many ingredients. Names are normalized and
+        deduplicated, and only names not already memoized reach the model.
+        """
+        keys = [self.normalize_name(name) for name in ingredient_names]
+        # Collected locally, since a large batch can evict its own entries from the cache
+        found = {}
+        for key in dict.fromkeys(keys):
+            nutrients = self._cached_nutrients(key)
+            if nutrients is not None:
+                found[key] = nutrients
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        results = await self._run_batched(missing, batch_size, concurrency, self._extract_nutrients_chunk)
+        for key, nutrients in zip(missing, results):
+            self._store_nutrients(key, nutrients)
+            found[key] = nutrients
+        return [dict(found[key]) for key in keys]
+
+    async def _run_batched(
+        self, items: List[T], batch_size: int, concurrency: int, call: Callable[[List[T]], Awaitable[List[R]]]
+    ) -> List[R]:
+        if batch_size < 1 or concurrency < 1:
+            raise ValueError("batch_size and concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(chunk: List[T]) -> List[R]:
+            async with semaphore:
+                return await call(chunk)
+
+        chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    @traced("optimize_steps", AGENT_DURATION, "method")
+    async def _optimize_steps_chunk(self, recipes: List[List[str]]) -> List[List[Dict[str, Any]]]:
+        # One model call per chunk in a live environment
+        if self.simulated_delay:
+            await asyncio.sleep(self.simulated_delay)
+        return [await self.optimize_steps(raw_steps) for raw_steps in recipes]
+
+    @traced("extract_nutrients", AGENT_DURATION, "method")
+    async def _extract_nutrients_chunk(self, ingredient_names: List[str]) -> List[Dict[str, float]]:
+        # Logic to parse ingredient strings or query nutrition APIs, one call per chunk
+        if self.simulated_delay:
+            await asyncio.sleep(self.simulated_delay)
+        return [
+            {
+                "calories": 100.0,
+                "protein": 5.0,
+                "carbohydrates": 20.0,
+                "fats": 2.0
+            }
+            for _ in ingredient_names
+        ]
@@ -0,0 +1,160 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from agents.prompts import RECIPE_SCHEMA
+from agents.schema_validator import compile_schema
+
+RECIPE_VALIDATOR = compile_schema(RECIPE_SCHEMA)
+
+# Top-level arrays whose elements are emitted one by one as they complete
+_STREAMED_ARRAYS = {"ingredients": "ingredient", "steps": "step"}
+
+
+class RecipeStreamError(ValueError):
+    pass
+
+
+def _loads(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        raise RecipeStreamError(f"Malformed recipe JSON: {e}") from e
+
+
+class RecipeStreamParser:
+    """
+    Incremental parser for a recipe JSON document arriving as text tokens.
+
+    feed() returns the events completed by each token: one per top-level
+    field (title, description, servings, macros) and one per element of
+    the ingredients and steps arrays. Every event is validated against the
+    matching part of RECIPE_SCHEMA before it is emitted.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self.document: Dict[str, Any] = {}
+
+    def feed(self, token: str) -> List[Dict[str, Any]]:
+        self._text += token
+        events: List[Dict[str, Any]] = []
+        text = self._text
+        while self._pos < len(text):
+            pos = self._pos
+            char = text[pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._expect_key:
+                            self._key = _loads(text[self._string_start:pos + 1])
+                        else:
+                            self._emit_field(text[self._value_start:pos + 1], events)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+                if self._depth == 1 and not self._expect_key and self._value_start is None:
+                    self._value_start = pos
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 2:
+                    self._value_start = pos
+                    self._item_index = 0
+                elif self._depth == 3 and self._key in _STREAMED_ARRAYS:
+                    self._item_start = pos
+            elif char in "}]":
+                if self._depth == 3 and self._item_start is not None:
+                    self._emit_item(text[self._item_start:pos + 1], events)
+                    self._item_start = None
+                elif self._depth == 2:
+                    self._emit_field(text[self._value_start:pos + 1], events)
+                elif self._depth == 1:
+                    self._flush_scalar(text, pos, events)
+                self._depth -= 1
+            elif self._depth == 1:
+                if char == ",":
+                    self._flush_scalar(text, pos, events)
+                    self._expect_key = True
+                elif char == ":":
+                    self._expect_key = False
+                    self._value_start = None
+                elif not char.isspace() and self._value_start is None and not self._expect_key:
+                    # Start of a number or true/false/null literal
+                    self._value_start = pos
+            if self._depth == 1 and char == "{":
+                self._expect_key = True
+        return events
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Validates the complete document once the token stream has ended.
+        """
+        if self._depth != 0 or self._in_string:
+            raise RecipeStreamError("Recipe stream ended before the document was complete")
+        errors = RECIPE_VALIDATOR.errors(self.document)
+        if errors:
+            raise RecipeStreamError("; ".join(errors))
+        return self.document
+
+    def _flush_scalar(self, text: str, end: int, events: List[Dict[str, Any]]):
+        if self._value_start is not None and text[self._value_start] not in '"{[':
+            self._emit_field(text[self._value_start:end].strip(), events)
+
+    def _emit_field(self, raw: str, events: List[Dict[str, Any]]):
+        key, self._value_start = self._key, None
+        value = _loads(raw)
+        if key in _STREAMED_ARRAYS:
+            # Elements were already emitted as they completed
+            self.document[key] = value
+            return
+        schema = RECIPE_VALIDATOR.properties.get(key)
+        self._check(schema, value, f"$.{key}")
+        self.document[key] = value
+        events.append({"event": key, "data": value})
+
+    def _emit_item(self, raw: str, events: List[Dict[str, Any]]):
+        value = _loads(raw)
+        schema = RECIPE_VALIDATOR.properties[self._key].items
+        self._check(schema, value, f"$.{self._key}[{self._item_index}]")
+        self._item_index += 1
+        events.append({"event": _STREAMED_ARRAYS[self._key], "data": value})
+
+    @staticmethod
+    def _check(schema, value: Any, path: str):
+        if schema is None:
+            return
+        errors = schema.errors(value, path)
+        if errors:
+            raise RecipeStreamError("; ".join(errors))
+
+
+def recipe_events(recipe: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    The event sequence RecipeStreamParser would emit for a complete recipe,
+    used to replay cached results over the same stream format.
+    """
+    events = []
+    for key, value in recipe.items():
+        if key in _STREAMED_ARRAYS:
+            events.extend({"event": _STREAMED_ARRAYS[key], "data": item} for item in value)
+        else:
+            events.append({"event": key, "data": value})
+    return events
@@ -0,0 +1,53 @@
+from typing import Any, Callable, Dict, List, Optional
+
+# JSON Schema type name -> isinstance check. bool is excluded from the
+# numeric types because it subclasses int in Python.
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class CompiledSchema:
+    """
+    A JSON Schema subset (type, properties, required, items) compiled once
+    into nested checkers. Sub-schemas stay reachable through `properties`
+    and `items` so partial documents can be validated piece by piece.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.type = schema.get("type")
+        self._check_type = _TYPE_CHECKS[self.type] if self.type else None
+        self.required = tuple(schema.get("required", ()))
+        self.properties: Dict[str, "CompiledSchema"] = {
+            name: CompiledSchema(sub) for name, sub in schema.get("properties", {}).items()
+        }
+        self.items: Optional["CompiledSchema"] = CompiledSchema(schema["items"]) if "items" in schema else None
+
+    def errors(self, value: Any, path: str = "$") -> List[str]:
+        if self._check_type is not None and not self._check_type(value):
+            return [f"{path}: expected {self.type}"]
+        errors = []
+        if isinstance(value, dict):
+            for name in self.required:
+                if name not in value:
+                    errors.append(f"{path}.{name}: required")
+            for name, sub in self.properties.items():
+                if name in value:
+                    errors.extend(sub.errors(value[name], f"{path}.{name}"))
+        elif isinstance(value, list) and self.items is not None:
+            for i, item in enumerate(value):
+                errors.extend(self.items.errors(item, f"{path}[{i}]"))
+        return errors
+
+    def is_valid(self, value: Any) -> bool:
+        return not self.errors(value)
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    return CompiledSchema(schema)
@@ -0,0 +1,248 @@
+"""
+Query-plan and latency benchmark for the SQLite schema.
+
+Builds two throwaway databases from prisma/migrations -- one without the
+index/FTS migration ("before") and one with every migration ("after") --
+seeds both with the same synthetic data, then reports EXPLAIN QUERY PLAN
+and latency for the queries each endpoint issues.
+
+    python benchmarks/query_plans.py --recipes 50000 --json plans.json
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prisma", "migrations")
+# Migrations left out of the "before" database
+INDEX_MIGRATION_SUFFIXES = ("_indexes_and_fts", "_recipe_search", "_ingredient_fts_docid", "_fts_doc_models")
+CATEGORIES = ["Protein", "Vegetable", "Fruit", "Grain", "Dairy", "Seasoning", "Oils", "Nuts"]
+WORDS = ["chicken", "beef", "tomato", "basil", "garlic", "lemon", "rice", "bean", "cheese", "pepper",
+         "onion", "salmon", "tofu", "mushroom", "spinach", "honey", "ginger", "lime", "oat", "almond"]
+
+
+def apply_migrations(conn: sqlite3.Connection, with_indexes: bool):
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        path = os.path.join(MIGRATIONS_DIR, name, "migration.sql")
+        if not os.path.isfile(path):
+            continue
+        if not with_indexes and name.endswith(INDEX_MIGRATION_SUFFIXES):
+            continue
+        with open(path) as f:
+            conn.executescript(f.read())
+
+
+def seed(conn: sqlite3.Connection, args: argparse.Namespace, rng: random.Random) -> Dict[str, List[str]]:
+    now = "2026-01-01 00:00:00"
+    ingredients = []
+    for i in range(args.ingredients):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}"
+        ingredients.append((str(uuid.uuid4()), name, rng.uniform(10, 900), rng.uniform(0, 40),
+                            rng.uniform(0, 80), rng.uniform(0, 60), "g", rng.choice(CATEGORIES)))
+    conn.executemany(
+        'INSERT INTO "Ingredient" (id, name, calories, protein, carbohydrates, fats, unit, category) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', ingredients)
+    ingredient_ids = [row[0] for row in ingredients]
+
+    users = [(str(uuid.uuid4()), f"user{i}@example.com") for i in range(args.users)]
+    conn.executemany('INSERT INTO "User" (id, email) VALUES (?, ?)', users)
+    user_ids = [row[0] for row in users]
+
+    recipes, steps, lines = [], [], []
+    for i in range(args.recipes):
+        recipe_id = str(uuid.uuid4())
+        title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}"
+        description = " ".join(rng.choice(WORDS) for _ in range(12))
+        recipes.append((recipe_id, title, description, rng.randint(1, 6), rng.uniform(100, 1500),
+                        rng.random() < 0.2, now))
+        for order in range(1, args.steps_per_recipe + 1):
+            steps.append((str(uuid.uuid4()), order, " ".join(rng.choice(WORDS) for _ in range(10)), recipe_id))
+        for ingredient_id in rng.sample(ingredient_ids, min(args.lines_per_recipe, len(ingredient_ids))):
+            lines.append((str(uuid.uuid4()), rng.uniform(5, 400), "g", recipe_id, ingredient_id))
+    conn.executemany(
+        'INSERT INTO "Recipe" (id, title, description, servings, totalCalories, isAiGenerated, updatedAt) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)', recipes)
+    conn.executemany('INSERT INTO "RecipeStep" (id, "order", instruction, recipeId) VALUES (?, ?, ?, ?)', steps)
+    conn.executemany(
+        'INSERT INTO "RecipeIngredient" (id, quantity, unit, recipeId, ingredientId) VALUES (?, ?, ?, ?, ?)', lines)
+    recipe_ids = [row[0] for row in recipes]
+
+    lists, links = [], []
+    for i in range(args.lists):
+        list_id = str(uuid.uuid4())
+        lists.append((list_id, f"List {i}", rng.choice(user_ids)))
+        links.extend((recipe_id, list_id) for recipe_id in rng.sample(recipe_ids, min(10, len(recipe_ids))))
+    conn.executemany('INSERT INTO "RecipeList" (id, name, userId) VALUES (?, ?, ?)', lists)
+    conn.executemany('INSERT INTO "_RecipeToRecipeList" (A, B) VALUES (?, ?)', links)
+    if table_exists(conn, "RecipeSearchDoc"):
+        # The app writes search documents on create; rows inserted here need the backfill
+        conn.execute('INSERT INTO "RecipeSearchDoc" (recipeId) SELECT id FROM "Recipe"')
+        conn.execute(
+            'INSERT INTO "RecipeSearch" (rowid, title, description, steps, ingredients) '
+            'SELECT d.docid, r.title, COALESCE(r.description, \'\'), '
+            'COALESCE((SELECT group_concat(s.instruction, \' \') FROM "RecipeStep" s WHERE s.recipeId = r.id), \'\'), '
+            'COALESCE((SELECT group_concat(i.name, \' \') FROM "RecipeIngredient" ri '
+            'JOIN "Ingredient" i ON i.id = ri.ingredientId WHERE ri.recipeId = r.id), \'\') '
+            'FROM "Recipe" r JOIN "RecipeSearchDoc" d ON d.recipeId = r.id')
+    conn.commit()
+    conn.execute("ANALYZE")
+    return {
+        "ingredients": ingredient_ids,
+        "recipes": recipe_ids,
+        "titles": [row[1] for row in recipes],
+        "users": user_ids,
+        "lists": [row[0] for row in lists],
+    }
+
+
+def placeholders(n: int) -> str:
+    return ", ".join("?" * n)
+
+
+# (endpoint, query label, SQL builder, required table) -- builders get the
+# seeded ids and a RNG, and return (sql, params). Mirrors the queries Prisma
+# issues: includes are separate "WHERE fk IN (...)" queries and relation
+# "some" filters are "id IN (subquery)".
+QueryBuilder = Callable[[Dict[str, List[str]], random.Random], Tuple[str, List[Any]]]
+QUERIES: List[Tuple[str, str, QueryBuilder, Optional[str]]] = [
+    ("GET /ingredients", "all ingredients",
+     lambda ids, rng: ('SELECT * FROM "Ingredient"', []), None),
+    ("GET /ingredients/search", "name LIKE scan",
+     lambda ids, rng: ('SELECT * FROM "Ingredient" WHERE name LIKE ? LIMIT 50', [f"%{rng.choice(WORDS)}%"]), None),
+    ("GET /ingredients/search", "IngredientFts MATCH",
+     lambda ids, rng: ('SELECT i.* FROM "IngredientFts" f JOIN "Ingredient" i ON i.id = f.id '
+                       'WHERE "IngredientFts" MATCH ? ORDER BY f.rank LIMIT 50', [f'"{rng.choice(WORDS)[:4]}"*']),
+     "IngredientFts"),
+    ("GET /recipes", "page",
+     lambda ids, rng: ('SELECT * FROM "Recipe" ORDER BY id LIMIT 51', []), None),
+    ("GET /recipes", "include steps",
+     lambda ids, rng: (f'SELECT * FROM "RecipeStep" WHERE recipeId IN ({placeholders(50)})',
+                       rng.sample(ids["recipes"], 50)), None),
+    ("GET /recipes", "include ingredients",
+     lambda ids, rng: (f'SELECT * FROM "RecipeIngredient" WHERE recipeId IN ({placeholders(50)})',
+                       rng.sample(ids["recipes"], 50)), None),
+    ("GET /recipes", "include ingredients.ingredient",
+     lambda ids, rng: (f'SELECT * FROM "Ingredient" WHERE id IN ({placeholders(200)})',
+                       rng.sample(ids["ingredients"], 200)), None),
+    ("GET /recipes", "calories range filter",
+     lambda ids, rng: ('SELECT * FROM "Recipe" WHERE totalCalories BETWEEN ? AND ? ORDER BY id LIMIT 51',
+                       [400, 450]), None),
+    ("GET /recipes", "category filter",
+     lambda ids, rng: ('SELECT * FROM "Recipe" WHERE id IN (SELECT ri.recipeId FROM "RecipeIngredient" ri '
+                       'JOIN "Ingredient" i ON i.id = ri.ingredientId WHERE i.category = ?) '
+                       'ORDER BY id LIMIT 51', [rng.choice(CATEGORIES)]), None),
+    ("GET /recipes/search", "RecipeSearch MATCH top 20",
+     lambda ids, rng: ('SELECT r.* FROM (SELECT rowid, rank FROM "RecipeSearch" WHERE "RecipeSearch" MATCH ? '
+                       'ORDER BY rank LIMIT 20) s JOIN "RecipeSearchDoc" d ON d.docid = s.rowid '
+                       'JOIN "Recipe" r ON r.id = d.recipeId ORDER BY s.rank',
+                       [" ".join(f'"{word}"*' for word in rng.sample(WORDS, 2))]),
+     "RecipeSearch"),
+    ("GET /recipes/search", "MATCH with include/exclude ingredients",
+     lambda ids, rng: ('SELECT r.* FROM (SELECT rowid, rank FROM "RecipeSearch" WHERE "RecipeSearch" MATCH ? '
+                       'AND +rowid IN (SELECT d.docid FROM "RecipeIngredient" ri JOIN "RecipeSearchDoc" d '
+                       'ON d.recipeId = ri.recipeId WHERE ri.ingredientId IN (?) GROUP BY d.docid '
+                       'HAVING COUNT(DISTINCT ri.ingredientId) = 1) '
+                       'AND +rowid NOT IN (SELECT d.docid FROM "RecipeIngredient" ri JOIN "RecipeSearchDoc" d '
+                       'ON d.recipeId = ri.recipeId WHERE ri.ingredientId IN (?)) '
+                       'ORDER BY rank LIMIT 20) s JOIN "RecipeSearchDoc" d ON d.docid = s.rowid '
+                       'JOIN "Recipe" r ON r.id = d.recipeId ORDER BY s.rank',
+                       [f'"{rng.choice(WORDS)}"*', *rng.sample(ids["ingredients"], 2)]),
+     "RecipeSearch"),
+    ("POST /recipes/manual", "duplicate title check",
+     lambda ids, rng: ('SELECT * FROM "Recipe" WHERE title = ? LIMIT 1', [rng.choice(ids["titles"])]), None),
+    ("POST /recipes/calculate-nutrition", "ingredient id IN",
+     lambda ids, rng: (f'SELECT * FROM "Ingredient" WHERE id IN ({placeholders(30)})',
+                       rng.sample(ids["ingredients"], 30)), None),
+    ("PATCH /ingredients/{id}", "recipes using ingredient",
+     lambda ids, rng: ('SELECT * FROM "Recipe" WHERE id IN (SELECT recipeId FROM "RecipeIngredient" '
+                       'WHERE ingredientId = ?)', [rng.choice(ids["ingredients"])]), None),
+    ("GET /lists", "all lists",
+     lambda ids, rng: ('SELECT * FROM "RecipeList"', []), None),
+    ("GET /lists", "include recipes",
+     lambda ids, rng: (f'SELECT * FROM "_RecipeToRecipeList" WHERE B IN ({placeholders(50)})',
+                       rng.sample(ids["lists"], min(50, len(ids["lists"])))), None),
+    ("GET /lists", "lists of a user",
+     lambda ids, rng: ('SELECT * FROM "RecipeList" WHERE userId = ?', [rng.choice(ids["users"])]), None),
+]
+
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def measure(conn: sqlite3.Connection, ids: Dict[str, List[str]], runs: int, seed_value: int) -> Dict[str, Any]:
+    results = {}
+    for endpoint, label, build, requires in QUERIES:
+        key = f"{endpoint} :: {label}"
+        if requires and not table_exists(conn, requires):
+            results[key] = None
+            continue
+        rng = random.Random(seed_value)
+        sql, params = build(ids, rng)
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        timings = []
+        for _ in range(runs):
+            sql, params = build(ids, rng)
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        results[key] = {
+            "plan": plan,
+            "p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        }
+    return results
+
+
+def run(with_indexes: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        apply_migrations(conn, with_indexes)
+        start = time.perf_counter()
+        ids = seed(conn, args, random.Random(args.seed))
+        seed_seconds = time.perf_counter() - start
+        results = measure(conn, ids, args.runs, args.seed)
+        conn.close()
+    return {"seed_seconds": round(seed_seconds, 2), "queries": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ingredients", type=int, default=20000)
+    parser.add_argument("--recipes", type=int, default=20000)
+    parser.add_argument("--steps-per-recipe", type=int, default=6)
+    parser.add_argument("--lines-per-recipe", type=int, default=8)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--lists", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+
+    report = {"params": vars(args), "before": run(False, args), "after": run(True, args)}
+
+    for key in report["after"]["queries"]:
+        before = report["before"]["queries"][key]
+        after = report["after"]["queries"][key]
+        print(key)
+        for label, result in (("before", before), ("after", after)):
+            if result is None:
+                print(f"  {label:6}  (table not present)")
+                continue
+            print(f"  {label:6}  p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms  | "
+                  + "; ".join(result["plan"]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
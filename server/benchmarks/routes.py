@@ -0,0 +1,281 @@
+"""
+End-to-end route benchmark for the FastAPI app.
+
+Creates a throwaway SQLite database from prisma/migrations, fills it with
+seed.py (N ingredients, M recipes, K lists), starts main:app under uvicorn
+against it, then drives each route with `--concurrency` concurrent clients
+and reports p50/p95/p99 latency, throughput and peak RSS of the server and
+its Prisma query-engine processes. The response cache is disabled unless
+--cache is given, so repeated GETs measure the routes, not cache hits.
+Write the report with --json and diff it between commits.
+
+    python benchmarks/routes.py --ingredients 2000 --recipes 5000 --lists 50 \\
+        --concurrency 16 --requests 500 --json routes.json
+
+Requires uvicorn and httpx in addition to the server dependencies.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from query_plans import apply_migrations
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_TERMS = ["chick", "beef", "tom", "rice", "chees", "pep", "oil", "salm", "bean", "milk", "garlc", "spinach"]
+AI_PROMPTS = ["spicy chicken bowl", "vegan curry", "salmon with rice", "protein pancakes", "lentil soup",
+              "beef stir fry", "greek salad", "mushroom risotto", "tofu tacos", "overnight oats"]
+
+# A scenario builds one request from the shared fixture data and a per-request counter
+Scenario = Callable[[httpx.AsyncClient, Dict[str, Any], int, random.Random], Awaitable[httpx.Response]]
+
+
+def scenario_search(client, fixtures, i, rng):
+    return client.get("/ingredients/search", params={"q": rng.choice(SEARCH_TERMS)})
+
+
+def scenario_recipes(client, fixtures, i, rng):
+    return client.get("/recipes", params={"limit": 50})
+
+
+def scenario_manual(client, fixtures, i, rng):
+    picked = rng.sample(fixtures["ingredients"], min(5, len(fixtures["ingredients"])))
+    return client.post("/recipes/manual", json={
+        "title": f"Benchmark recipe {fixtures['run']} {i}",
+        "description": "Created by benchmarks/routes.py",
+        "servings": 2,
+        "steps": [{"order": n, "instruction": "Stir."} for n in range(1, 5)],
+        "ingredients": [{"ingredientId": ing["id"], "quantity": 100, "unit": ing["unit"]} for ing in picked],
+    })
+
+
+def scenario_calculate(client, fixtures, i, rng):
+    picked = rng.sample(fixtures["ingredients"], min(8, len(fixtures["ingredients"])))
+    return client.post("/recipes/calculate-nutrition", json={
+        "ingredients": [{"ingredientId": ing["id"], "quantity": 150, "unit": ing["unit"]} for ing in picked],
+    })
+
+
+def scenario_lists(client, fixtures, i, rng):
+    return client.get("/lists")
+
+
+def scenario_ai(client, fixtures, i, rng):
+    return client.post("/recipes/ai-generate", json={"prompt": rng.choice(AI_PROMPTS)})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "GET /ingredients/search": scenario_search,
+    "GET /recipes": scenario_recipes,
+    "POST /recipes/manual": scenario_manual,
+    "POST /recipes/calculate-nutrition": scenario_calculate,
+    "GET /lists": scenario_lists,
+    "POST /recipes/ai-generate": scenario_ai,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_kb(pid: int) -> Optional[int]:
+    # VmHWM is the resident set high-water mark; Linux only
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def descendant_pids(pid: int) -> List[int]:
+    # Prisma runs its query engine as a child process of the server; Linux only
+    parents: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, the parent pid follows its closing paren
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+    found, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def memory_kb(pid: int) -> Dict[str, Optional[int]]:
+    """
+    Peak RSS of the server and of its child processes (query engines). The
+    total adds the per-process peaks, an upper bound on the combined peak.
+    """
+    server = peak_rss_kb(pid)
+    engines = [rss for rss in (peak_rss_kb(child) for child in descendant_pids(pid)) if rss is not None]
+    total = None if server is None else server + sum(engines)
+    return {"server": server, "engines": sum(engines) if engines else None, "total": total}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            if (await client.get("/cache/stats")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def drive(client, scenario: Scenario, fixtures, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    counter = iter(range(requests))
+    timings: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                status = str((await scenario(client, fixtures, i, rng)).status_code)
+            except httpx.TransportError as e:
+                status = type(e).__name__
+            timings.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return {
+        "requests": requests,
+        "statuses": statuses,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+    }
+
+
+async def benchmark(args: argparse.Namespace, base_url: str, server: subprocess.Popen) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        await wait_ready(client, server)
+        fixtures = {
+            "run": int(time.time()),
+            "ingredients": [
+                {"id": ing["id"], "unit": "pcs" if ing["unit"] == "piece" else ing["unit"]}
+                for ing in (await client.get("/ingredients")).json()
+            ],
+        }
+        results = {}
+        for name in args.routes:
+            results[name] = await drive(client, SCENARIOS[name], fixtures, args.requests, args.concurrency, args.seed)
+            results[name]["peak_rss_kb"] = memory_kb(server.pid)
+            print(f"{name:36} {results[name]['throughput_rps']:9.1f} req/s  p50 {results[name]['p50_ms']:8.2f} ms  "
+                  f"p95 {results[name]['p95_ms']:8.2f} ms  p99 {results[name]['p99_ms']:8.2f} ms  "
+                  f"{results[name]['statuses']}")
+        return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=SERVER_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ingredients", type=int, default=2000)
+    parser.add_argument("--recipes", type=int, default=5000)
+    parser.add_argument("--lists", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--routes", default=",".join(SCENARIOS),
+                        help="comma separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+    args.routes = [name.strip() for name in args.routes.split(",") if name.strip()]
+    unknown = [name for name in args.routes if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        conn = sqlite3.connect(db_path)
+        apply_migrations(conn, with_indexes=True)
+        conn.close()
+        env = {**os.environ, "DATABASE_URL": f"file:{db_path}"}
+        server_env = env if args.cache else {**env, "CACHE_TTL_SECONDS": "0"}
+
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "seed.py", "--ingredients", str(args.ingredients), "--recipes", str(args.recipes),
+             "--lists", str(args.lists), "--seed", str(args.seed)],
+            cwd=SERVER_DIR, env=env, check=True,
+        )
+        seed_seconds = time.perf_counter() - start
+
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning"],
+            cwd=SERVER_DIR, env=server_env,
+        )
+        try:
+            results = asyncio.run(benchmark(args, f"http://127.0.0.1:{port}", server))
+            server_peak = memory_kb(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+        if server_peak["total"] is None:
+            # Outside Linux, fall back to the largest child (seed or server) seen by getrusage
+            server_peak = {"server": None, "engines": None,
+                           "total": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss}
+
+    report = {
+        "revision": git_revision(),
+        "params": vars(args),
+        "seed_seconds": round(seed_seconds, 2),
+        "peak_rss_kb": server_peak,
+        "routes": results,
+    }
+    print(f"peak RSS {server_peak['total']} KiB (server {server_peak['server']}, engines {server_peak['engines']})")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
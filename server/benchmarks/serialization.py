@@ -0,0 +1,150 @@
+"""
+Serialization micro-benchmark for large recipe payloads.
+
+Builds N Prisma Recipe records with their steps and ingredient lines (each
+line including its Ingredient), then compares the previous response path,
+jsonable_encoder + json.dumps over the Prisma models, with the slots models
+plus services.serialization.dumps (orjson when installed). Reports time per
+payload and peak traced memory for each path, and the retained size of the
+converted objects.
+
+    python benchmarks/serialization.py --recipes 500 --steps 8 --lines 12 --json serialization.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from prisma.models import Ingredient, Recipe, RecipeIngredient, RecipeStep
+from services.models import RecipeModel
+from services.serialization import dumps, orjson
+
+
+def build_records(args: argparse.Namespace, rng: random.Random) -> List[Any]:
+    now = datetime.now(timezone.utc)
+    ingredients = [
+        Ingredient(
+            id=f"ing-{i}", name=f"Ingredient {i}", calories=rng.uniform(10, 900), protein=rng.uniform(0, 30),
+            carbohydrates=rng.uniform(0, 80), fats=rng.uniform(0, 100), unit="g", category="Other",
+        )
+        for i in range(max(args.lines * 4, 50))
+    ]
+    recipes = []
+    for r in range(args.recipes):
+        recipe_id = f"recipe-{r}"
+        recipes.append(Recipe(
+            id=recipe_id, title=f"Recipe {r}", description="A synthetic recipe " * 4, servings=rng.randint(1, 6),
+            totalCalories=rng.uniform(100, 3000), totalProtein=rng.uniform(0, 200), totalCarbs=rng.uniform(0, 300),
+            totalFat=rng.uniform(0, 150), caloriesPerServing=rng.uniform(100, 900), proteinPerServing=rng.uniform(0, 60),
+            carbsPerServing=rng.uniform(0, 100), fatPerServing=rng.uniform(0, 50), isAiGenerated=False,
+            createdAt=now, updatedAt=now,
+            steps=[
+                RecipeStep(id=f"{recipe_id}-s{s}", order=s + 1, instruction=f"Step {s + 1}: stir and simmer " * 3,
+                           recipeId=recipe_id)
+                for s in range(args.steps)
+            ],
+            ingredients=[
+                RecipeIngredient(id=f"{recipe_id}-l{l}", quantity=rng.uniform(1, 500), unit="g", recipeId=recipe_id,
+                                 ingredientId=ingredient.id, ingredient=ingredient)
+                for l, ingredient in enumerate(rng.sample(ingredients, args.lines))
+            ],
+        ))
+    return recipes
+
+
+def project(value: Any, model: type) -> Any:
+    # The previous output restricted to the fields the slots models keep
+    if isinstance(value, list):
+        return [project(v, model) for v in value]
+    if value is None:
+        return None
+    return {
+        name: project(value[name], model.RELATIONS[name]) if name in model.RELATIONS else value[name]
+        for name in model.__slots__
+    }
+
+
+def encode_prisma(records: List[Any]) -> bytes:
+    return json.dumps(jsonable_encoder(records)).encode()
+
+
+def encode_models(records: List[Any]) -> bytes:
+    return dumps([RecipeModel.from_record(record).to_dict() for record in records])
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mean_ms": round(statistics.mean(timings), 2),
+        "p50_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def retained_kib(build: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return round(current / 1024, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=8, help="steps per recipe")
+    parser.add_argument("--lines", type=int, default=12, help="ingredient lines per recipe")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    records = build_records(args, random.Random(args.seed))
+    baseline, optimized = encode_prisma(records), encode_models(records)
+    # Same document apart from the relations Prisma emits as null and internal columns
+    assert project(json.loads(baseline), RecipeModel) == json.loads(optimized), "serializers disagree"
+
+    report = {
+        "recipes": args.recipes,
+        "steps": args.steps,
+        "lines": args.lines,
+        "orjson": orjson is not None,
+        "payload_kib": {"prisma": round(len(baseline) / 1024, 1), "models": round(len(optimized) / 1024, 1)},
+        "prisma": measure(lambda: encode_prisma(records), args.repeat),
+        "models": measure(lambda: encode_models(records), args.repeat),
+        "retained_kib": {
+            "jsonable_encoder": retained_kib(lambda: jsonable_encoder(records)),
+            "models": retained_kib(lambda: [RecipeModel.from_record(record) for record in records]),
+        },
+    }
+    report["speedup"] = round(report["prisma"]["mean_ms"] / report["models"]["mean_ms"], 2)
+    for name in ("prisma", "models"):
+        row = report[name]
+        print(f"{name:8} mean {row['mean_ms']:9.2f} ms  p50 {row['p50_ms']:9.2f} ms  peak {row['peak_kib']:10.1f} KiB")
+    print(f"speedup x{report['speedup']}  retained {report['retained_kib']}  orjson={report['orjson']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Read throughput under concurrent writes, default SQLite settings vs the
+tuned settings services/storage.py applies.
+
+Seeds a throwaway database from prisma/migrations, then runs reader threads
+issuing the GET /recipes page + include queries while writer threads keep
+inserting recipes the way POST /recipes/manual does (one transaction per
+recipe with its steps and ingredient lines). Each thread has its own
+connection, like the Prisma reader pool and the single writer.
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 1 --seconds 10 --json concurrency.json
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+from query_plans import apply_migrations, placeholders, seed
+
+# Mirrors the StorageSettings defaults
+TUNED_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": "-65536",
+    "mmap_size": "268435456",
+    "temp_store": "MEMORY",
+}
+MODES = {
+    "before": {"journal_mode": "DELETE", "pragmas": {}},
+    "after": {"journal_mode": "WAL", "pragmas": TUNED_PRAGMAS},
+}
+
+
+def connect(path: str, mode: Dict[str, Any], busy_timeout: float) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+    for name, value in mode["pragmas"].items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def reader(path, mode, args, recipe_ids, stop, out):
+    conn = connect(path, mode, args.busy_timeout)
+    rng = random.Random()
+    timings, errors = [], 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            cursor = rng.choice(recipe_ids)
+            page = [row[0] for row in conn.execute(
+                'SELECT id FROM "Recipe" WHERE id > ? ORDER BY id LIMIT 51', (cursor,))]
+            if page:
+                conn.execute(f'SELECT * FROM "RecipeStep" WHERE recipeId IN ({placeholders(len(page))})',
+                             page).fetchall()
+                conn.execute(f'SELECT * FROM "RecipeIngredient" WHERE recipeId IN ({placeholders(len(page))})',
+                             page).fetchall()
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    out.append({"timings": timings, "errors": errors})
+
+
+def writer(path, mode, args, ingredient_ids, stop, out):
+    conn = connect(path, mode, args.busy_timeout)
+    rng = random.Random()
+    timings, errors = [], 0
+    while not stop.is_set():
+        recipe_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                'INSERT INTO "Recipe" (id, title, servings, totalCalories, updatedAt) VALUES (?, ?, ?, ?, ?)',
+                (recipe_id, f"Load test {recipe_id}", 2, rng.uniform(100, 1500), "2026-01-01 00:00:00"))
+            conn.executemany(
+                'INSERT INTO "RecipeStep" (id, "order", instruction, recipeId) VALUES (?, ?, ?, ?)',
+                [(str(uuid.uuid4()), order, "stir", recipe_id) for order in range(1, 7)])
+            conn.executemany(
+                'INSERT INTO "RecipeIngredient" (id, quantity, unit, recipeId, ingredientId) VALUES (?, ?, ?, ?, ?)',
+                [(str(uuid.uuid4()), 100.0, "g", recipe_id, ingredient_id)
+                 for ingredient_id in rng.sample(ingredient_ids, 8)])
+            conn.execute("COMMIT")
+        except sqlite3.OperationalError:
+            errors += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    out.append({"timings": timings, "errors": errors})
+
+
+def summarize(results: List[Dict[str, Any]], seconds: float) -> Dict[str, Any]:
+    timings = sorted(t for result in results for t in result["timings"])
+    return {
+        "ops": len(timings),
+        "ops_per_sec": round(len(timings) / seconds, 1),
+        "errors": sum(result["errors"] for result in results),
+        "p50_ms": round(statistics.median(timings), 3) if timings else None,
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+    }
+
+
+def run(mode_name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    mode = MODES[mode_name]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        conn = sqlite3.connect(path)
+        conn.execute(f"PRAGMA journal_mode = {mode['journal_mode']}")
+        apply_migrations(conn, with_indexes=True)
+        ids = seed(conn, args, random.Random(args.seed))
+        conn.close()
+
+        stop = threading.Event()
+        reads, writes = [], []
+        threads = [threading.Thread(target=reader, args=(path, mode, args, ids["recipes"], stop, reads))
+                   for _ in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(path, mode, args, ids["ingredients"], stop, writes))
+                    for _ in range(args.writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return {"reads": summarize(reads, args.seconds), "writes": summarize(writes, args.seconds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ingredients", type=int, default=2000)
+    parser.add_argument("--recipes", type=int, default=5000)
+    parser.add_argument("--steps-per-recipe", type=int, default=6)
+    parser.add_argument("--lines-per-recipe", type=int, default=8)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--lists", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--busy-timeout", type=float, default=5.0, help="seconds to wait on a locked database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+
+    report = {"params": vars(args)}
+    for mode_name in MODES:
+        report[mode_name] = run(mode_name, args)
+
+    for kind in ("reads", "writes"):
+        print(kind)
+        for mode_name in MODES:
+            result = report[mode_name][kind]
+            print(f"  {mode_name:6}  {result['ops_per_sec']:9.1f} ops/s  p50 {result['p50_ms']} ms  "
+                  f"p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  errors {result['errors']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Imports an ingredient catalog (CSV with a header row, or JSON Lines) into
+the Ingredient table. Rows are deduplicated by normalized name and only new
+or changed rows are written, so nightly refreshes of an unchanged catalog
+are cheap.
+
+    python import_catalog.py usda.csv --batch-size 5000
+
+A running server keeps its search index in memory; import through
+POST /ingredients/import instead to keep it in sync, or restart it.
+"""
+import argparse
+import asyncio
+import json
+import os
+from prisma import Prisma
+from services.catalog_import import CatalogImporter, iter_catalog_rows, iter_file_chunks
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows written per transaction")
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+
+    url = os.getenv("DATABASE_URL")
+    db = Prisma(datasource={"url": url}) if url else Prisma()
+    await db.connect()
+    try:
+        importer = CatalogImporter(db, batch_size=args.batch_size)
+        summary = await importer.run(iter_catalog_rows(iter_file_chunks(args.path), fmt))
+    finally:
+        await db.disconnect()
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,15 +1,48 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from prisma import Prisma
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from services.nutrition_service import NutritionService
 from services.ai_service import AIService
+from services.generation_service import RecipeGenerationService, GenerationOverloadedError
+from agents.cooking_expert import CookingExpertAgent
+from agents.recipe_stream import RecipeStreamError
 from services.ingredient_service import IngredientService
+from services.ingredient_index import IngredientSearchIndex
+from services.catalog_import import CatalogImporter, iter_catalog_rows, iter_file_chunks
+from services.recipe_service import RecipeService, DuplicateRecipeError, RecipeNotFoundError, UnknownIngredientError
+from services.recipe_search import RecipeSearchService, reindex_recipes_using
+from services.purchase_info import PROVIDERS, InvalidLocationError, PurchaseInfoService, normalize_location
+from services.shopping_service import ShoppingListService, RecipesNotFoundError
+from services.macro_targets import MacroTargetService, NutritionMatrix
+from services.substitution_index import SubstitutionIndex, SubstitutionService
+from services.jobs import JobContext, JobQueue, JobWorker, PermanentJobError, UnknownJobTypeError
+from services.models import IngredientModel, RecipeModel
+from services.schemas import (
+    FitMacrosRequest, GenerateRequest, IngredientCreate, IngredientLine, IngredientLineUpdate, IngredientUpdate,
+    JobCreate, MacroTargets, MealPlanRequest, NutrientsBatchRequest, NutritionBulkRequest, NutritionRequest,
+    RecipeCreate, RecipeListCreate, RecipeUpdate, RecommendRequest, StepsBatchRequest,
+)
+from services.serialization import FastJSONResponse, dumps
+from services.unit_conversion import UnitConversionError, parse_unit, unit_converter
+from services.fts import ensure_fts_tables
+from services.storage import Storage, StorageSettings
+from services import metrics as observability
+from services.profiler import SamplingProfiler
+from services.response_cache import ResponseCache, InMemoryCacheBackend, RedisCacheBackend
 import os
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="RecipeMaker API")
+# Responses render through orjson when it is installed. FastAPI still runs
+# jsonable_encoder over whatever a route returns before rendering it, so hot
+# routes build their FastJSONResponse themselves to skip that pass.
+app = FastAPI(title="RecipeMaker API", default_response_class=FastJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -18,102 +51,455 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
-db = Prisma()
+@app.exception_handler(UnitConversionError)
+async def unit_conversion_error(request: Request, exc: UnitConversionError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(InvalidLocationError)
+async def invalid_location_error(request: Request, exc: InvalidLocationError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(UnknownIngredientError)
+async def unknown_ingredient_error(request: Request, exc: UnknownIngredientError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+# Writes go through the single writer client, reads through storage.reader()
+storage = Storage(StorageSettings.from_env(), wrap=observability.InstrumentedClient)
+db = storage.writer
+# Ingredient fields that stored recipe totals depend on
+MACRO_FIELDS = {"calories", "protein", "carbohydrates", "fats", "unit", "density", "pieceWeight"}
+ingredient_index = IngredientSearchIndex()
+# Nearest substitutes by macro profile, category and name; kept in sync like the search index
+substitution_index = SubstitutionIndex()
+# Per-serving macros of every recipe for target matching, rebuilt lazily after writes
+recipe_matrix = NutritionMatrix()
+
+def build_response_cache() -> ResponseCache:
+    ttl = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    redis_url = os.getenv("CACHE_REDIS_URL")
+    if redis_url:
+        # Optional dependency, only needed when sharing the cache between workers
+        import redis.asyncio as redis
+        return ResponseCache(RedisCacheBackend(redis.from_url(redis_url)), ttl)
+    return ResponseCache(InMemoryCacheBackend(int(os.getenv("CACHE_MAX_ENTRIES", "1024"))), ttl)
+
+response_cache = build_response_cache()
+
+async def invalidate_recipes(*namespaces: str):
+    # Stored recipes or their totals changed
+    recipe_matrix.mark_stale()
+    await response_cache.invalidate("recipes", *namespaces)
+
+async def purchase_info_stored(ingredient_ids: List[str]):
+    # Ingredient payloads and search results include purchaseInfo
+    for i in range(0, len(ingredient_ids), 1000):
+        for ingredient in await db.ingredient.find_many(where={"id": {"in": ingredient_ids[i:i + 1000]}}):
+            ingredient_index.add(ingredient)
+    await response_cache.invalidate("ingredients")
+
+def build_purchase_service() -> PurchaseInfoService:
+    names = [name.strip() for name in os.getenv("PURCHASE_PROVIDERS", "local").split(",") if name.strip()]
+    unknown = [name for name in names if name not in PROVIDERS]
+    if unknown:
+        raise RuntimeError(f"Unknown PURCHASE_PROVIDERS: {', '.join(unknown)}")
+    return PurchaseInfoService(
+        db,
+        [PROVIDERS[name]() for name in names],
+        timeout=float(os.getenv("PURCHASE_PROVIDER_TIMEOUT_SECONDS", "3")),
+        ttl=float(os.getenv("PURCHASE_INFO_TTL_HOURS", "24")) * 3600,
+        max_concurrency=int(os.getenv("PURCHASE_MAX_CONCURRENCY", "8")),
+        on_stored=purchase_info_stored,
+    )
+
+# Shared so concurrent lookups of the same ingredient and location are coalesced
+purchase_service = build_purchase_service()
+
+def build_ai_service() -> AIService:
+    agent = CookingExpertAgent(
+        simulated_delay=float(os.getenv("AI_SIMULATED_DELAY", "0")),
+        nutrient_cache_size=int(os.getenv("AI_NUTRIENT_CACHE_SIZE", "4096")),
+    )
+    generator = RecipeGenerationService(
+        agent,
+        max_concurrency=int(os.getenv("AI_MAX_CONCURRENCY", "4")),
+        max_queue=int(os.getenv("AI_MAX_QUEUE", "32")),
+        cache_size=int(os.getenv("AI_CACHE_SIZE", "256")),
+        cache_ttl=float(os.getenv("AI_CACHE_TTL_SECONDS", "3600")),
+    )
+    return AIService(agent, generator, batch_concurrency=int(os.getenv("AI_BATCH_CONCURRENCY", "4")))
+
+# Shared so the generation cache and concurrency limits span all requests
+ai_service = build_ai_service()
+
+def build_profiler() -> Optional[SamplingProfiler]:
+    # Opt-in: only sample when a slow-request threshold is configured
+    if not os.getenv("PROFILE_SLOW_REQUEST_MS"):
+        return None
+    return SamplingProfiler(interval=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000)
+
+profiler = build_profiler()
+PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+observability.N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", str(observability.N_PLUS_ONE_THRESHOLD)))
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    stats, token = observability.begin_request()
+    started_at = time.monotonic()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        # Streaming bodies are still being sent at this point; this times up to the headers
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        observability.end_request(token, stats, request.method, path, status, elapsed)
+    response.headers["Server-Timing"] = stats.server_timing(elapsed)
+    if profiler is not None and elapsed * 1000 >= PROFILE_SLOW_REQUEST_MS:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        name = f"{stamp}-{request.method}-{path.strip('/').replace('/', '_') or 'root'}.folded"
+        profiler.dump(os.path.join(PROFILE_DIR, name), started_at, time.monotonic())
+    return response
 
 @app.on_event("startup")
 async def startup():
-    await db.connect()
+    await storage.connect()
+    if profiler is not None:
+        profiler.start()
+    await ensure_fts_tables(db)
+    # Build the resident search index once; writes keep it in sync
+    ingredients = await db.ingredient.find_many()
+    ingredient_index.build(ingredients)
+    substitution_index.build(ingredients)
+    # Recipes stored before totals were maintained on write are not marked computed yet
+    if await RecipeService(db, ingredient_index).recompute_missing_totals():
+        await invalidate_recipes()
+
+    if JOB_WORKER_CONCURRENCY > 0:
+        job_worker.start()
 
 @app.on_event("shutdown")
 async def shutdown():
-    await db.disconnect()
+    await job_worker.stop()
+    if profiler is not None:
+        profiler.stop()
+    await storage.disconnect()
 
 @app.get("/")
 async def root():
     return {"message": "RecipeMaker API is running"}
 
+@app.get("/metrics")
+async def get_metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(observability.metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return response_cache.stats
+
 @app.get("/ingredients")
-async def get_ingredients():
-    ingredients = await db.ingredient.find_many()
-    return ingredients
+async def get_ingredients(request: Request):
+    async def load():
+        return [IngredientModel.from_record(ingredient) for ingredient in await storage.reader().ingredient.find_many()]
+
+    return await response_cache.respond(request, ("ingredients",), load)
 
 @app.get("/ingredients/search")
 async def search_ingredients(q: str):
-    service = IngredientService()
+    service = IngredientService(storage.reader(), ingredient_index)
     results = await service.search_public_ingredients(q)
-    return results
+    return FastJSONResponse([IngredientModel.from_record(ingredient) for ingredient in results])
 
 @app.get("/ingredients/{ingredient_id}/purchase")
-async def get_ingredient_purchase(ingredient_id: str, name: str):
-    service = IngredientService()
-    info = await service.get_purchase_info(name)
+async def get_ingredient_purchase(ingredient_id: str, location: str = "US", name: Optional[str] = None):
+    # Served from Ingredient.purchaseInfo while fresh, providers are called otherwise;
+    # name looks offers up under another name, uncached
+    info = await purchase_service.for_ingredient(ingredient_id, location, name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
     return info
 
 @app.post("/ingredients")
-async def create_ingredient(data: dict):
-    ingredient = await db.ingredient.create(data=data)
+async def create_ingredient(payload: IngredientCreate):
+    parse_unit(payload.unit)
+    ingredient = await db.ingredient.create(data=payload.dict(exclude_none=True))
+    ingredient_index.add(ingredient)
+    substitution_index.add(ingredient)
+    await response_cache.invalidate("ingredients")
+    return ingredient
+
+async def run_catalog_import(importer: CatalogImporter, rows: AsyncIterator[Tuple[int, Any]]) -> Dict[str, Any]:
+    try:
+        summary = await importer.run(rows)
+    finally:
+        # Batches commit independently, so sync whatever was written even if a later one failed
+        changed = importer.created_ids + importer.updated_ids
+        for ingredient_id in importer.updated_ids:
+            unit_converter.invalidate(ingredient_id)
+        for i in range(0, len(changed), 1000):
+            for ingredient in await db.ingredient.find_many(where={"id": {"in": changed[i:i + 1000]}}):
+                ingredient_index.add(ingredient)
+                substitution_index.add(ingredient)
+        if changed:
+            await response_cache.invalidate("ingredients")
+        # Each batch recomputed the totals of recipes using its changed ingredients
+        if importer.recipes_recomputed:
+            await invalidate_recipes()
+    return summary
+
+@app.post("/ingredients/import")
+async def import_ingredient_catalog(request: Request, format: str = "jsonl", batch_size: int = Query(1000, ge=1)):
+    # Body is a CSV catalog with a header row, or JSON Lines; only new or changed rows are written
+    if format not in ("csv", "jsonl"):
+        raise HTTPException(status_code=400, detail="format must be csv or jsonl")
+    importer = CatalogImporter(db, batch_size=batch_size)
+    return await run_catalog_import(importer, iter_catalog_rows(request.stream(), format))
+
+@app.post("/ingredients/import/jobs", status_code=202)
+async def enqueue_ingredient_catalog_import(
+    request: Request, format: str = "jsonl", batch_size: int = Query(1000, ge=1), max_attempts: int = Query(3, ge=1)
+):
+    # Same body as /ingredients/import, spooled to disk and imported by a worker
+    if format not in ("csv", "jsonl"):
+        raise HTTPException(status_code=400, detail="format must be csv or jsonl")
+    os.makedirs(JOB_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(JOB_SPOOL_DIR, f"catalog-{uuid.uuid4().hex}.{format}")
+    with open(path, "wb") as f:
+        async for chunk in request.stream():
+            f.write(chunk)
+    job = await job_queue.enqueue(
+        "catalog.import", {"path": path, "format": format, "batchSize": batch_size}, max_attempts
+    )
+    job_worker.notify()
+    return JobQueue.describe(job)
+
+@app.patch("/ingredients/{ingredient_id}")
+async def update_ingredient(ingredient_id: str, payload: IngredientUpdate):
+    data = payload.dict(exclude_unset=True)
+    if data.get('unit') is not None:
+        parse_unit(data['unit'])
+    # The ingredient and the recipe totals and search documents derived from it commit together
+    async with db.tx() as tx:
+        ingredient = await tx.ingredient.update(where={"id": ingredient_id}, data=data)
+        if ingredient is None:
+            raise HTTPException(status_code=404, detail="Ingredient not found")
+        if MACRO_FIELDS.intersection(data):
+            await RecipeService(db, ingredient_index).recompute_for_ingredient(ingredient_id, tx)
+        if 'name' in data:
+            # Recipe search documents include ingredient names
+            await reindex_recipes_using(tx, ingredient_id)
+    # No await from here on: requests during the transaction may have cached
+    # factors from the old row, and none can see the new one half-applied
+    unit_converter.invalidate(ingredient_id)
+    ingredient_index.add(ingredient)
+    substitution_index.add(ingredient)
+    await invalidate_recipes("ingredients")
     return ingredient
 
 @app.get("/recipes")
-async def get_recipes():
-    recipes = await db.recipe.find_many(include={"steps": True, "ingredients": {"include": {"ingredient": True}}})
-    return recipes
+async def get_recipes(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    min_calories: Optional[float] = None,
+    max_calories: Optional[float] = None,
+    category: Optional[str] = None,
+    ai_generated: Optional[bool] = None,
+    format: str = "json",
+):
+    # include: comma separated relations (steps, ingredients), all by default
+    # fields: comma separated recipe fields to return, all by default
+    # format=ndjson streams every matching recipe instead of a single page
+    service = RecipeService(storage.reader(), ingredient_index)
+    try:
+        include_clause = service.build_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    where = service.build_filter(min_calories, max_calories, category, ai_generated)
+
+    selected = None
+    if fields:
+        selected = {f.strip() for f in fields.split(",") if f.strip()} | set(include_clause)
+
+    def encode(recipe):
+        return RecipeModel.from_record(recipe).to_dict(selected)
+
+    if format == "ndjson":
+        async def stream():
+            async for recipe in service.iter_recipes(where, include_clause, page_size=limit):
+                yield dumps(encode(recipe)) + b"\n"
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    headers = {}
+
+    async def load_page():
+        recipes, next_cursor = await service.list_recipes(where, include_clause, limit, cursor)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return [encode(recipe) for recipe in recipes]
+
+    return await response_cache.respond(request, ("recipes", "ingredients"), load_page, headers)
+
+@app.get("/recipes/search")
+async def search_recipes(
+    q: Optional[str] = None,
+    include_ingredients: Optional[str] = None,
+    exclude_ingredients: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    # q matches titles, descriptions, steps and ingredient names, ranked by bm25;
+    # include/exclude_ingredients are comma separated ingredient ids
+    include = [i.strip() for i in (include_ingredients or "").split(",") if i.strip()]
+    exclude = [i.strip() for i in (exclude_ingredients or "").split(",") if i.strip()]
+    if not (q or "").strip() and not include and not exclude:
+        raise HTTPException(status_code=400, detail="q or an ingredient filter is required")
+    service = RecipeSearchService(storage.reader())
+    return FastJSONResponse(await service.search(q, include, exclude, limit, offset))
 
 @app.post("/recipes/manual")
-async def create_recipe_manual(data: dict):
-    # Check for duplicates
-    existing = await db.recipe.find_first(where={"title": data['title']})
-    if existing:
+async def create_recipe_manual(payload: RecipeCreate):
+    service = RecipeService(db, ingredient_index)
+    try:
+        recipe = await service.create_recipe(payload.dict())
+    except DuplicateRecipeError:
+        raise HTTPException(status_code=409, detail="Recipe with this title already exists")
+    await invalidate_recipes()
+    return recipe
+
+@app.post("/recipes/bulk")
+async def import_recipes_bulk(request: Request, chunk_size: int = 500):
+    # Body is JSON Lines, one recipe per line in the /recipes/manual format
+    service = RecipeService(db, ingredient_index)
+    try:
+        return await service.import_recipes(request.stream(), chunk_size=chunk_size)
+    finally:
+        # Chunks commit independently, so invalidate even if a later one failed
+        await invalidate_recipes()
+
+@app.put("/recipes/{recipe_id}")
+async def update_recipe(recipe_id: str, payload: RecipeUpdate):
+    service = RecipeService(db, ingredient_index)
+    try:
+        recipe = await service.update_recipe(recipe_id, payload.dict(exclude_unset=True))
+    except RecipeNotFoundError:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    except DuplicateRecipeError:
         raise HTTPException(status_code=409, detail="Recipe with this title already exists")
+    await invalidate_recipes()
+    return recipe
+
+@app.get("/recipes/{recipe_id}/nutrition")
+async def get_recipe_nutrition(recipe_id: str):
+    # Totals are maintained on write, so this is a plain column read
+    recipe = await storage.reader().recipe.find_unique(where={"id": recipe_id})
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return FastJSONResponse({
+        "total": {macro: getattr(recipe, total) for macro, (total, _) in NutritionService.RECIPE_COLUMNS.items()},
+        "perServing": {macro: getattr(recipe, per) for macro, (_, per) in NutritionService.RECIPE_COLUMNS.items()},
+        "servings": recipe.servings,
+    })
+
+@app.post("/recipes/{recipe_id}/ingredients")
+async def add_recipe_ingredient(recipe_id: str, payload: IngredientLine):
+    service = RecipeService(db, ingredient_index)
+    try:
+        line = await service.add_ingredient(recipe_id, payload.dict())
+    except RecipeNotFoundError:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    await invalidate_recipes()
+    return line
+
+@app.patch("/recipes/{recipe_id}/ingredients/{line_id}")
+async def update_recipe_ingredient(recipe_id: str, line_id: str, payload: IngredientLineUpdate):
+    service = RecipeService(db, ingredient_index)
+    try:
+        line = await service.update_ingredient(recipe_id, line_id, payload.dict(exclude_unset=True))
+    except RecipeNotFoundError:
+        raise HTTPException(status_code=404, detail="Recipe ingredient not found")
+    await invalidate_recipes()
+    return line
 
-    # data includes title, description, servings, steps (list), ingredients (list of {id, qty, unit})
-    recipe_data = {
-        "title": data['title'],
-        "description": data.get('description'),
-        "servings": data.get('servings', 1),
-    }
-    
-    # Calculate nutrition (this would be more robust in reality)
-    # For now, just create the recipe
-    recipe = await db.recipe.create(data=recipe_data)
-    
-    # Create steps
-    for step in data.get('steps', []):
-        await db.recipestep.create(data={
-            "order": step['order'],
-            "instruction": step['instruction'],
-            "recipeId": recipe.id
-        })
-        
-    # Link ingredients
-    for item in data.get('ingredients', []):
-        await db.recipeingredient.create(data={
-            "quantity": item['quantity'],
-            "unit": item['unit'],
-            "recipeId": recipe.id,
-            "ingredientId": item['ingredientId']
-        })
-        
-    return await db.recipe.find_unique(where={"id": recipe.id}, include={"steps": True, "ingredients": True})
+@app.delete("/recipes/{recipe_id}/ingredients/{line_id}")
+async def remove_recipe_ingredient(recipe_id: str, line_id: str):
+    service = RecipeService(db, ingredient_index)
+    try:
+        await service.remove_ingredient(recipe_id, line_id)
+    except RecipeNotFoundError:
+        raise HTTPException(status_code=404, detail="Recipe ingredient not found")
+    await invalidate_recipes()
+    return {"deleted": line_id}
+
+@app.get("/recipes/{recipe_id}/purchase")
+async def get_recipe_purchase(recipe_id: str, location: str = "US"):
+    # Purchase info for every ingredient of the recipe in one request
+    location = normalize_location(location)
+    if await storage.reader().recipe.find_unique(where={"id": recipe_id}) is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return {"location": location, "items": await purchase_service.for_recipe(recipe_id, location)}
+
+@app.get("/recipes/{recipe_id}/ingredients/{line_id}/substitutes")
+async def get_ingredient_substitutes(recipe_id: str, line_id: str, limit: int = Query(5, ge=1, le=20)):
+    # Ranked from the resident index, no LLM call
+    service = SubstitutionService(storage.reader(), substitution_index, ingredient_index)
+    result = await service.for_line(recipe_id, line_id, limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Recipe ingredient not found")
+    return FastJSONResponse(result)
 
 @app.post("/recipes/ai-generate")
-async def generate_recipe(data: dict):
-    ai = AIService()
-    prompt = data.get('prompt')
-    recipe = await ai.generate_recipe_from_prompt(prompt)
+async def generate_recipe(payload: GenerateRequest):
+    try:
+        recipe = await ai_service.generate_recipe_from_prompt(payload.prompt, payload.mode)
+    except GenerationOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     return recipe
 
+@app.post("/recipes/ai-generate/stream")
+async def generate_recipe_stream(payload: GenerateRequest):
+    # Server-Sent Events: one event per parsed field, ingredient and step, then "done"
+    async def events():
+        try:
+            async for event in ai_service.stream_recipe_from_prompt(payload.prompt, payload.mode):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except (RecipeStreamError, GenerationOverloadedError) as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/ai/optimize-steps/batch")
+async def optimize_steps_batch(payload: StepsBatchRequest):
+    # recipes: [[raw step, ...], ...]
+    return await ai_service.optimize_steps_batch(payload.recipes, payload.batchSize)
+
+@app.post("/ai/extract-nutrients/batch")
+async def extract_nutrients_batch(payload: NutrientsBatchRequest):
+    return await ai_service.extract_nutrients_batch(payload.names, payload.batchSize)
+
+@app.get("/recipes/ai-generate/stats")
+async def get_generation_stats():
+    return ai_service.generator.stats
+
 @app.get("/lists")
-async def get_lists():
-    lists = await db.recipelist.find_many(include={"recipes": True})
-    return lists
+async def get_lists(request: Request):
+    async def load_lists():
+        return await storage.reader().recipelist.find_many(include={"recipes": True})
+    return await response_cache.respond(request, ("lists", "recipes"), load_lists)
 
 @app.post("/lists")
-async def create_list(data: dict):
-    # data: { name, userId }
-    res = await db.recipelist.create(data=data)
+async def create_list(payload: RecipeListCreate):
+    res = await db.recipelist.create(data=payload.dict())
+    await response_cache.invalidate("lists")
     return res
 
 @app.post("/lists/{list_id}/recipes/{recipe_id}")
@@ -122,22 +508,156 @@ async def add_recipe_to_list(list_id: str, recipe_id: str):
         where={"id": list_id},
         data={"recipes": {"connect": [{"id": recipe_id}]}}
     )
+    await response_cache.invalidate("lists")
     return res
 
+@app.get("/lists/{list_id}/shopping-list")
+async def get_list_shopping_list(request: Request, list_id: str, servings: Optional[int] = Query(None, ge=1)):
+    # servings: scale every recipe to this many servings, each recipe's own servings by default
+    reader = storage.reader()
+    if await reader.recipelist.find_unique(where={"id": list_id}) is None:
+        raise HTTPException(status_code=404, detail="List not found")
+    async def load_shopping_list():
+        return await ShoppingListService(reader).for_list(list_id, servings)
+    return await response_cache.respond(request, ("lists", "recipes", "ingredients"), load_shopping_list)
+
+@app.get("/lists/{list_id}/purchase")
+async def get_list_purchase(list_id: str, location: str = "US"):
+    # Purchase info for every ingredient on the list's shopping list
+    location = normalize_location(location)
+    if await storage.reader().recipelist.find_unique(where={"id": list_id}) is None:
+        raise HTTPException(status_code=404, detail="List not found")
+    return {"location": location, "items": await purchase_service.for_list(list_id, location)}
+
+@app.post("/meal-plan/shopping-list")
+async def get_meal_plan_shopping_list(payload: MealPlanRequest):
+    slots = [slot.dict() for slot in payload.slots]
+    try:
+        return await ShoppingListService(storage.reader()).for_meal_plan(slots)
+    except RecipesNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+def macro_targets(targets: MacroTargets) -> dict:
+    return {macro: value for macro, value in targets.dict().items() if value is not None}
+
+@app.post("/recipes/recommend")
+async def recommend_recipes(payload: RecommendRequest):
+    service = MacroTargetService(storage.reader(), recipe_matrix)
+    return FastJSONResponse(await service.recommend(macro_targets(payload.targets), payload.limit))
+
+@app.post("/recipes/{recipe_id}/fit-macros")
+async def fit_recipe_macros(recipe_id: str, payload: FitMacrosRequest):
+    # Suggested quantities only, nothing is saved
+    service = MacroTargetService(storage.reader(), recipe_matrix)
+    result = await service.fit_recipe(recipe_id, macro_targets(payload.targets), payload.minScale, payload.maxScale)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return result
+
 @app.post("/recipes/calculate-nutrition")
-async def calculate_nutrition(data: dict):
-    # data: { ingredients: [{ ingredientId, quantity, unit }] }
-    ingredients_with_data = []
-    for item in data['ingredients']:
-        ing = await db.ingredient.find_unique(where={"id": item['ingredientId']})
-        if ing:
-            ingredients_with_data.append({
-                "ingredient": ing,
-                "quantity": item['quantity'],
-                "unit": item['unit']
-            })
-    
-    totals = NutritionService.calculate_recipe_totals(ingredients_with_data)
-    return totals
+async def calculate_nutrition(payload: NutritionRequest):
+    service = RecipeService(storage.reader(), ingredient_index)
+    lines = [line.dict() for line in payload.ingredients]
+    ingredients = await service.resolve_ingredients([line['ingredientId'] for line in lines])
+    return FastJSONResponse(NutritionService.calculate_recipe_totals(service.with_ingredient_data(lines, ingredients)))
+
+@app.post("/recipes/calculate-nutrition/bulk")
+async def calculate_nutrition_bulk(payload: NutritionBulkRequest):
+    service = RecipeService(storage.reader(), ingredient_index)
+    recipes = [{"ingredients": [line.dict() for line in recipe.ingredients]} for recipe in payload.recipes]
+    ingredients = await service.resolve_ingredients(
+        [item['ingredientId'] for recipe in recipes for item in recipe['ingredients']]
+    )
+    return FastJSONResponse(NutritionService.calculate_batch_totals(
+        [service.with_ingredient_data(recipe['ingredients'], ingredients) for recipe in recipes]
+    ))
+
+async def run_generate_job(job: JobContext):
+    prompt = job.payload.get('prompt')
+    if not prompt:
+        raise PermanentJobError("prompt is required")
+    return await ai_service.generate_recipe_from_prompt(prompt, job.payload.get('mode', 'freestyle'))
+
+async def run_recompute_job(job: JobContext):
+    ingredient_ids = job.payload.get('ingredientIds')
+    if not isinstance(ingredient_ids, list) or not all(isinstance(i, str) for i in ingredient_ids):
+        raise PermanentJobError("ingredientIds must be a list of ids")
+    # Each recipe once, however many of the listed ingredients it uses
+    service = RecipeService(db, ingredient_index)
+    recomputed = await service.recompute_for_ingredients(ingredient_ids, progress=job.progress)
+    if recomputed:
+        await invalidate_recipes()
+    return {"recipesRecomputed": recomputed}
+
+async def run_catalog_import_job(job: JobContext):
+    path = job.payload['path']
+    if not os.path.exists(path):
+        raise PermanentJobError(f"Spooled catalog is missing: {path}")
+    size = os.path.getsize(path)
+    read = 0
+
+    async def chunks():
+        nonlocal read
+        async for chunk in iter_file_chunks(path):
+            read += len(chunk)
+            await job.progress(read, size)
+            yield chunk
+
+    importer = CatalogImporter(db, batch_size=job.payload.get('batchSize', 1000))
+    summary = await run_catalog_import(importer, iter_catalog_rows(chunks(), job.payload.get('format', 'jsonl')))
+    # Kept until the import succeeds so a retry can read it again
+    os.remove(path)
+    return summary
+
+# Job types and their handlers. Catalog imports and recomputation update this
+# process's resident indexes, so run those in the API's own pool.
+job_handlers = {
+    "recipe.generate": run_generate_job,
+    "nutrition.recompute": run_recompute_job,
+    "catalog.import": run_catalog_import_job,
+}
+
+def build_job_worker(handlers: Dict[str, Any]) -> JobWorker:
+    return JobWorker(
+        db,
+        handlers,
+        concurrency=JOB_WORKER_CONCURRENCY,
+        poll_interval=float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1")),
+        lease=float(os.getenv("JOB_LEASE_SECONDS", "60")),
+        backoff_base=float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "2")),
+        backoff_max=float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "300")),
+    )
+
+# JOB_WORKER_CONCURRENCY=0 leaves jobs to standalone workers (worker.py)
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+JOB_SPOOL_DIR = os.getenv("JOB_SPOOL_DIR", "job-spool")
+job_queue = JobQueue(db, job_handlers)
+job_worker = build_job_worker(job_handlers)
+
+@app.post("/jobs", status_code=202)
+async def enqueue_job(payload: JobCreate):
+    # Returns the queued job; poll /jobs/{id} for progress
+    try:
+        job = await job_queue.enqueue(payload.type, payload.payload, payload.maxAttempts)
+    except UnknownJobTypeError as e:
+        raise HTTPException(status_code=400, detail=f"{e}; expected one of {', '.join(job_handlers)}")
+    job_worker.notify()
+    return JobQueue.describe(job)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobQueue.describe(job)
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}" + (f": {job.error}" if job.error else ""))
+    return json.loads(job.result)
 
 # More routes will be added here
@@ -0,0 +1,13 @@
+-- AlterTable
+ALTER TABLE "Recipe" ADD COLUMN "caloriesPerServing" REAL NOT NULL DEFAULT 0;
+ALTER TABLE "Recipe" ADD COLUMN "proteinPerServing" REAL NOT NULL DEFAULT 0;
+ALTER TABLE "Recipe" ADD COLUMN "carbsPerServing" REAL NOT NULL DEFAULT 0;
+ALTER TABLE "Recipe" ADD COLUMN "fatPerServing" REAL NOT NULL DEFAULT 0;
+
+-- Backfill per-serving values from the stored totals
+UPDATE "Recipe" SET
+    "caloriesPerServing" = "totalCalories" / MAX("servings", 1),
+    "proteinPerServing" = "totalProtein" / MAX("servings", 1),
+    "carbsPerServing" = "totalCarbs" / MAX("servings", 1),
+    "fatPerServing" = "totalFat" / MAX("servings", 1);
+
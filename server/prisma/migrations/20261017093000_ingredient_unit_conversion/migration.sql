@@ -0,0 +1,3 @@
+-- AlterTable
+ALTER TABLE "Ingredient" ADD COLUMN "density" REAL;
+ALTER TABLE "Ingredient" ADD COLUMN "pieceWeight" REAL;
@@ -0,0 +1,70 @@
+-- Recipe titles become unique. The oldest recipe keeps each duplicated
+-- title; later ones get the start of their id appended, e.g. "Soup (1a2b3c4d)".
+UPDATE "Recipe" SET "title" = "title" || ' (' || substr("id", 1, 8) || ')'
+WHERE EXISTS (
+    SELECT 1 FROM "Recipe" r
+    WHERE r."title" = "Recipe"."title"
+    AND (r."createdAt" < "Recipe"."createdAt" OR (r."createdAt" = "Recipe"."createdAt" AND r."id" < "Recipe"."id"))
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "Recipe_title_key" ON "Recipe"("title");
+
+-- CreateIndex
+CREATE INDEX "Recipe_totalCalories_idx" ON "Recipe"("totalCalories");
+
+-- CreateIndex
+CREATE INDEX "Recipe_creatorId_idx" ON "Recipe"("creatorId");
+
+-- CreateIndex
+CREATE INDEX "Ingredient_name_idx" ON "Ingredient"("name");
+
+-- CreateIndex
+CREATE INDEX "Ingredient_category_idx" ON "Ingredient"("category");
+
+-- CreateIndex
+CREATE INDEX "RecipeStep_recipeId_order_idx" ON "RecipeStep"("recipeId", "order");
+
+-- CreateIndex
+CREATE INDEX "RecipeIngredient_recipeId_idx" ON "RecipeIngredient"("recipeId");
+
+-- CreateIndex
+CREATE INDEX "RecipeIngredient_ingredientId_idx" ON "RecipeIngredient"("ingredientId");
+
+-- CreateIndex
+CREATE INDEX "RecipeList_userId_idx" ON "RecipeList"("userId");
+
+-- Full-text search tables. Prisma cannot model virtual tables, so these are
+-- maintained by triggers; services/fts.py creates the same objects for
+-- databases set up with `prisma db push`.
+CREATE VIRTUAL TABLE IF NOT EXISTS "IngredientFts" USING fts5(id UNINDEXED, name, category, tokenize = 'unicode61 remove_diacritics 2');
+
+CREATE TRIGGER IF NOT EXISTS "Ingredient_fts_insert" AFTER INSERT ON "Ingredient" BEGIN
+    INSERT INTO "IngredientFts"(id, name, category) VALUES (new.id, new.name, new.category);
+END;
+
+CREATE TRIGGER IF NOT EXISTS "Ingredient_fts_update" AFTER UPDATE OF name, category ON "Ingredient" BEGIN
+    UPDATE "IngredientFts" SET name = new.name, category = new.category WHERE id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "Ingredient_fts_delete" AFTER DELETE ON "Ingredient" BEGIN
+    DELETE FROM "IngredientFts" WHERE id = old.id;
+END;
+
+INSERT INTO "IngredientFts"(id, name, category) SELECT id, name, category FROM "Ingredient";
+
+CREATE VIRTUAL TABLE IF NOT EXISTS "RecipeFts" USING fts5(id UNINDEXED, title, description, tokenize = 'unicode61 remove_diacritics 2');
+
+CREATE TRIGGER IF NOT EXISTS "Recipe_fts_insert" AFTER INSERT ON "Recipe" BEGIN
+    INSERT INTO "RecipeFts"(id, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS "Recipe_fts_update" AFTER UPDATE OF title, description ON "Recipe" BEGIN
+    UPDATE "RecipeFts" SET title = new.title, description = new.description WHERE id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "Recipe_fts_delete" AFTER DELETE ON "Recipe" BEGIN
+    DELETE FROM "RecipeFts" WHERE id = old.id;
+END;
+
+INSERT INTO "RecipeFts"(id, title, description) SELECT id, title, description FROM "Recipe";
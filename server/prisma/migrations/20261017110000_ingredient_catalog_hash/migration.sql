@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "Ingredient" ADD COLUMN "catalogHash" TEXT;
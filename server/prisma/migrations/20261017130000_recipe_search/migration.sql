@@ -0,0 +1,31 @@
+-- Recipe search over titles, descriptions, step instructions and ingredient
+-- names, replacing RecipeFts. services/recipe_search.py keeps documents
+-- current on write; services/fts.py mirrors these objects for databases
+-- created with `prisma db push`.
+
+DROP TRIGGER IF EXISTS "Recipe_fts_insert";
+
+DROP TRIGGER IF EXISTS "Recipe_fts_update";
+
+DROP TRIGGER IF EXISTS "Recipe_fts_delete";
+
+DROP TABLE IF EXISTS "RecipeFts";
+
+CREATE TABLE IF NOT EXISTS "RecipeSearchDoc" ("docid" INTEGER NOT NULL PRIMARY KEY, "recipeId" TEXT NOT NULL UNIQUE);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS "RecipeSearch" USING fts5(title, description, steps, ingredients, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3');
+
+INSERT INTO "RecipeSearch"("RecipeSearch", rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0, 2.0)');
+
+CREATE TRIGGER IF NOT EXISTS "Recipe_search_delete" AFTER DELETE ON "Recipe" BEGIN
+    DELETE FROM "RecipeSearch" WHERE rowid = (SELECT docid FROM "RecipeSearchDoc" WHERE recipeId = old.id);
+    DELETE FROM "RecipeSearchDoc" WHERE recipeId = old.id;
+END;
+
+INSERT INTO "RecipeSearchDoc"(recipeId) SELECT id FROM "Recipe";
+
+INSERT INTO "RecipeSearch"(rowid, title, description, steps, ingredients)
+SELECT d.docid, r.title, COALESCE(r.description, ''),
+    COALESCE((SELECT group_concat(s.instruction, ' ') FROM "RecipeStep" s WHERE s.recipeId = r.id), ''),
+    COALESCE((SELECT group_concat(i.name, ' ') FROM "RecipeIngredient" ri JOIN "Ingredient" i ON i.id = ri.ingredientId WHERE ri.recipeId = r.id), '')
+FROM "Recipe" r JOIN "RecipeSearchDoc" d ON d.recipeId = r.id;
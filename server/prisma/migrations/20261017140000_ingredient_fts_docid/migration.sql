@@ -0,0 +1,32 @@
+-- Keys IngredientFts rows by rowid through IngredientFtsDoc, so the update
+-- and delete triggers look rows up by rowid instead of scanning the table
+-- for the UNINDEXED id column. services/fts.py mirrors these statements.
+DROP TRIGGER IF EXISTS "Ingredient_fts_insert";
+DROP TRIGGER IF EXISTS "Ingredient_fts_update";
+DROP TRIGGER IF EXISTS "Ingredient_fts_delete";
+DROP TABLE IF EXISTS "IngredientFts";
+
+CREATE TABLE IF NOT EXISTS "IngredientFtsDoc" ("docid" INTEGER NOT NULL PRIMARY KEY, "ingredientId" TEXT NOT NULL UNIQUE);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS "IngredientFts" USING fts5(id UNINDEXED, name, category, tokenize = 'unicode61 remove_diacritics 2');
+
+CREATE TRIGGER IF NOT EXISTS "Ingredient_fts_insert" AFTER INSERT ON "Ingredient" BEGIN
+    INSERT INTO "IngredientFtsDoc"(ingredientId) VALUES (new.id);
+    INSERT INTO "IngredientFts"(rowid, id, name, category)
+    VALUES ((SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = new.id), new.id, new.name, new.category);
+END;
+
+CREATE TRIGGER IF NOT EXISTS "Ingredient_fts_update" AFTER UPDATE OF name, category ON "Ingredient" BEGIN
+    UPDATE "IngredientFts" SET name = new.name, category = new.category
+    WHERE rowid = (SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = old.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS "Ingredient_fts_delete" AFTER DELETE ON "Ingredient" BEGIN
+    DELETE FROM "IngredientFts" WHERE rowid = (SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = old.id);
+    DELETE FROM "IngredientFtsDoc" WHERE ingredientId = old.id;
+END;
+
+INSERT INTO "IngredientFtsDoc"(ingredientId) SELECT id FROM "Ingredient";
+
+INSERT INTO "IngredientFts"(rowid, id, name, category)
+SELECT d.docid, i.id, i.name, i.category FROM "Ingredient" i JOIN "IngredientFtsDoc" d ON d.ingredientId = i.id;
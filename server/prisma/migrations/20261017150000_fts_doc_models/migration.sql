@@ -0,0 +1,53 @@
+-- RecipeSearchDoc and IngredientFtsDoc are modeled in schema.prisma (as
+-- @@ignore models), so `prisma migrate dev` and `prisma db push` keep them
+-- instead of dropping them as drift. Rebuilds both in the layout Prisma
+-- generates, keeping every docid since those are the FTS rowids, and renames
+-- the ingredient triggers so services/fts.py can tell this layout apart.
+PRAGMA foreign_keys=OFF;
+
+DROP TRIGGER IF EXISTS "Recipe_search_delete";
+DROP TRIGGER IF EXISTS "Ingredient_fts_insert";
+DROP TRIGGER IF EXISTS "Ingredient_fts_update";
+DROP TRIGGER IF EXISTS "Ingredient_fts_delete";
+
+-- RedefineTables
+CREATE TABLE "new_RecipeSearchDoc" (
+    "docid" INTEGER NOT NULL PRIMARY KEY,
+    "recipeId" TEXT NOT NULL
+);
+INSERT INTO "new_RecipeSearchDoc" ("docid", "recipeId") SELECT "docid", "recipeId" FROM "RecipeSearchDoc";
+DROP TABLE "RecipeSearchDoc";
+ALTER TABLE "new_RecipeSearchDoc" RENAME TO "RecipeSearchDoc";
+CREATE UNIQUE INDEX "RecipeSearchDoc_recipeId_key" ON "RecipeSearchDoc"("recipeId");
+
+CREATE TABLE "new_IngredientFtsDoc" (
+    "docid" INTEGER NOT NULL PRIMARY KEY,
+    "ingredientId" TEXT NOT NULL
+);
+INSERT INTO "new_IngredientFtsDoc" ("docid", "ingredientId") SELECT "docid", "ingredientId" FROM "IngredientFtsDoc";
+DROP TABLE "IngredientFtsDoc";
+ALTER TABLE "new_IngredientFtsDoc" RENAME TO "IngredientFtsDoc";
+CREATE UNIQUE INDEX "IngredientFtsDoc_ingredientId_key" ON "IngredientFtsDoc"("ingredientId");
+
+PRAGMA foreign_keys=ON;
+
+CREATE TRIGGER "Recipe_search_delete" AFTER DELETE ON "Recipe" BEGIN
+    DELETE FROM "RecipeSearch" WHERE rowid = (SELECT docid FROM "RecipeSearchDoc" WHERE recipeId = old.id);
+    DELETE FROM "RecipeSearchDoc" WHERE recipeId = old.id;
+END;
+
+CREATE TRIGGER "Ingredient_search_insert" AFTER INSERT ON "Ingredient" BEGIN
+    INSERT INTO "IngredientFtsDoc"(ingredientId) VALUES (new.id);
+    INSERT INTO "IngredientFts"(rowid, id, name, category)
+    VALUES ((SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = new.id), new.id, new.name, new.category);
+END;
+
+CREATE TRIGGER "Ingredient_search_update" AFTER UPDATE OF name, category ON "Ingredient" BEGIN
+    UPDATE "IngredientFts" SET name = new.name, category = new.category
+    WHERE rowid = (SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = old.id);
+END;
+
+CREATE TRIGGER "Ingredient_search_delete" AFTER DELETE ON "Ingredient" BEGIN
+    DELETE FROM "IngredientFts" WHERE rowid = (SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = old.id);
+    DELETE FROM "IngredientFtsDoc" WHERE ingredientId = old.id;
+END;
@@ -0,0 +1,9 @@
+-- AlterTable
+ALTER TABLE "Recipe" ADD COLUMN "totalsComputed" BOOLEAN NOT NULL DEFAULT false;
+
+-- Non-zero totals were computed on write, and a recipe without ingredient
+-- lines has nothing to compute. The rest are recomputed once at startup,
+-- after which a recipe whose totals really are 0 is not selected again.
+UPDATE "Recipe" SET "totalsComputed" = true
+WHERE "totalCalories" != 0 OR "totalProtein" != 0 OR "totalCarbs" != 0 OR "totalFat" != 0
+   OR NOT EXISTS (SELECT 1 FROM "RecipeIngredient" ri WHERE ri."recipeId" = "Recipe"."id");
@@ -1,18 +1,45 @@
 from agents.cooking_expert import CookingExpertAgent
-from typing import List, Dict, Any
+from services.generation_service import RecipeGenerationService
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 class AIService:
-    def __init__(self):
-        self.agent = CookingExpertAgent()
+    def __init__(
+        self,
+        agent: Optional[CookingExpertAgent] = None,
+        generator: Optional[RecipeGenerationService] = None,
+        batch_concurrency: int = 4,
+    ):
+        self.agent = agent or CookingExpertAgent()
+        self.generator = generator or RecipeGenerationService(self.agent)
+        self.batch_concurrency = batch_concurrency
         
-    async def generate_recipe_from_prompt(self, prompt: str) -> Dict[str, Any]:
+    async def generate_recipe_from_prompt(self, prompt: str, mode: str = "freestyle") -> Dict[str, Any]:
         """
         Generates a full recipe from a natural language prompt.
+        Goes through the generation layer, so repeated prompts are served from cache.
         """
-        return await self.agent.generate_recipe(prompt)
+        return await self.generator.generate(prompt, mode)
+
+    def stream_recipe_from_prompt(self, prompt: str, mode: str = "freestyle") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams a recipe as validated events so clients can render it while it is generated.
+        """
+        return self.generator.stream(prompt, mode)
 
     async def optimize_steps(self, raw_steps: List[str]) -> List[Dict[str, Any]]:
         """
         Takes a list of raw step strings or bullet points and optimizes them.
         """
         return await self.agent.optimize_steps(raw_steps)
+
+    async def optimize_steps_batch(self, recipes: List[List[str]], batch_size: int = 8) -> List[List[Dict[str, Any]]]:
+        """
+        Optimizes the steps of many recipes, chunked into concurrent model calls.
+        """
+        return await self.agent.optimize_steps_batch(recipes, batch_size, self.batch_concurrency)
+
+    async def extract_nutrients_batch(self, ingredient_names: List[str], batch_size: int = 50) -> List[Dict[str, float]]:
+        """
+        Extracts nutrients for many ingredient names, memoized by normalized name.
+        """
+        return await self.agent.extract_nutrients_batch(ingredient_names, batch_size, self.batch_concurrency)
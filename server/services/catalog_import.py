@@ -0,0 +1,224 @@
+import csv
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from prisma import Prisma
+from services.ingredient_index import tokenize
+from services.recipe_service import RecipeService, iter_json_lines
+from services.unit_conversion import parse_unit
+
+MACRO_COLUMNS = ("calories", "protein", "carbohydrates", "fats")
+OPTIONAL_FLOAT_COLUMNS = ("density", "pieceWeight")
+# Columns written by an import, in UPDATE ... FROM (VALUES ...) order after the id
+CATALOG_COLUMNS = ("name", *MACRO_COLUMNS, "unit", "category", *OPTIONAL_FLOAT_COLUMNS, "image", "catalogHash")
+# Columns stored recipe totals depend on; updates touching only the others skip recomputation
+NUTRITION_COLUMNS = (*MACRO_COLUMNS, "unit", *OPTIONAL_FLOAT_COLUMNS)
+# Values for columns a row leaves out, applied to new ingredients only
+CREATE_DEFAULTS = {"unit": "g", "category": "Other"}
+# Keeps each UPDATE under SQLite's bound-parameter limit
+UPDATE_ROWS_PER_STATEMENT = 1000
+
+
+class CatalogRowError(ValueError):
+    pass
+
+
+def catalog_key(name: str) -> str:
+    """
+    Dedupe key for ingredient names: case, accents, punctuation and spacing are ignored.
+    """
+    return " ".join(tokenize(name))
+
+
+def parse_catalog_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates one catalog row (from CSV or JSON) into Ingredient fields.
+    CSV values arrive as strings, so numbers are coerced here. Optional
+    columns that are missing or empty are left out of the result, so an
+    update keeps the stored value; see CREATE_DEFAULTS for new ingredients.
+    """
+    name = " ".join(str(raw.get("name") or "").split())
+    if not name:
+        raise CatalogRowError("name is required")
+    row: Dict[str, Any] = {"name": name}
+    for column in MACRO_COLUMNS:
+        value = _number(raw.get(column), column)
+        if value is None or value < 0:
+            raise CatalogRowError(f"{column} must be a non-negative number")
+        row[column] = value
+    for column in ("unit", "category"):
+        value = str(raw.get(column) or "").strip()
+        if value:
+            row[column] = value
+    if "unit" in row:
+        parse_unit(row["unit"])  # raises UnitConversionError (a ValueError) for unknown units
+    for column in OPTIONAL_FLOAT_COLUMNS:
+        value = _number(raw.get(column), column)
+        if value is not None and value <= 0:
+            raise CatalogRowError(f"{column} must be positive")
+        if value is not None:
+            row[column] = value
+    if raw.get("image"):
+        row["image"] = raw["image"]
+    row["catalogHash"] = hashlib.blake2b(json.dumps(row, sort_keys=True).encode(), digest_size=16).hexdigest()
+    return row
+
+
+def _number(value: Any, column: str) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise CatalogRowError(f"{column} must be a number")
+
+
+async def iter_catalog_rows(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yields (line_number, raw row dict) from a CSV (with header) or JSON Lines
+    byte stream. Rows that fail to decode are yielded as the exception so the
+    caller can report them; CSV records must not span lines.
+    """
+    header: Optional[List[str]] = None
+    async for line_number, line in iter_json_lines(chunks):
+        try:
+            text = line.decode("utf-8-sig").rstrip("\r")
+            if fmt == "csv":
+                values = next(csv.reader([text]))
+                if header is None:
+                    header = [column.strip() for column in values]
+                    continue
+                yield line_number, dict(zip(header, values))
+            else:
+                yield line_number, json.loads(text)
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            yield line_number, e
+
+
+async def iter_file_chunks(path: str, chunk_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class CatalogImporter:
+    """
+    Streams a catalog into the Ingredient table in batched transactions.
+
+    Rows are matched to existing ingredients by catalog_key(name). A row is
+    only written when its content hash differs from the stored catalogHash,
+    so re-importing an unchanged catalog touches nothing. Updates only assign
+    the columns present in the row. Recipes using an ingredient whose
+    NUTRITION_COLUMNS changed get their totals recomputed in the same
+    transaction as the batch, so a failed import retried later never
+    leaves totals behind rows it finds unchanged.
+    """
+
+    def __init__(self, db: Prisma, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+        self.created_ids: List[str] = []
+        self.updated_ids: List[str] = []
+        self.recipes_recomputed = 0
+
+    async def run(self, rows: AsyncIterator[Tuple[int, Any]]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        summary = {
+            "rows": 0, "created": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "batches": 0,
+            "recipesRecomputed": 0, "errors": [],
+        }
+        existing = await self._existing()
+        seen = set()
+        creates: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        nutrition_changed: List[str] = []
+
+        async for line_number, raw in rows:
+            summary["rows"] += 1
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                if not isinstance(raw, dict):
+                    raise CatalogRowError("row must be an object")
+                row = parse_catalog_row(raw)
+            except ValueError as e:
+                summary["errors"].append({"line": line_number, "error": str(e)})
+                continue
+            key = catalog_key(row["name"])
+            if key in seen:
+                summary["duplicates"] += 1
+                continue
+            seen.add(key)
+
+            current = existing.get(key)
+            if current is None:
+                creates.append({"id": str(uuid.uuid4()), **CREATE_DEFAULTS, **row})
+            elif current[1] == row["catalogHash"]:
+                summary["unchanged"] += 1
+            else:
+                updates.append({"id": current[0], **row})
+                stored = current[2]
+                if stored != tuple(row.get(column, old) for column, old in zip(NUTRITION_COLUMNS, stored)):
+                    nutrition_changed.append(current[0])
+
+            if len(creates) + len(updates) >= self.batch_size:
+                await self._write_batch(creates, updates, nutrition_changed, summary)
+                creates, updates, nutrition_changed = [], [], []
+
+        if creates or updates:
+            await self._write_batch(creates, updates, nutrition_changed, summary)
+        seconds = time.perf_counter() - start
+        summary["seconds"] = round(seconds, 3)
+        summary["rows_per_sec"] = round(summary["rows"] / seconds, 1) if seconds else None
+        return summary
+
+    async def _existing(self) -> Dict[str, Tuple[str, Optional[str], Tuple[Any, ...]]]:
+        # Only the columns needed for matching and change detection, so large catalogs stay cheap to load
+        columns = ", ".join(f'"{column}"' for column in NUTRITION_COLUMNS)
+        rows = await self.db.query_raw(f'SELECT id, name, catalogHash, {columns} FROM "Ingredient"')
+        existing: Dict[str, Tuple[str, Optional[str], Tuple[Any, ...]]] = {}
+        for row in rows:
+            existing.setdefault(
+                catalog_key(row["name"]),
+                (row["id"], row["catalogHash"], tuple(row[column] for column in NUTRITION_COLUMNS)),
+            )
+        return existing
+
+    async def _write_batch(
+        self,
+        creates: List[Dict[str, Any]],
+        updates: List[Dict[str, Any]],
+        nutrition_changed: List[str],
+        summary: Dict[str, Any],
+    ):
+        async with self.db.tx() as tx:
+            if creates:
+                await tx.ingredient.create_many(data=creates)
+            # One statement per UPDATE_ROWS_PER_STATEMENT rows instead of a round trip per row.
+            # Columns a row left out arrive as NULL and keep the stored value.
+            assignments = ", ".join(
+                f'"{column}" = COALESCE(v.column{i + 2}, "Ingredient"."{column}")'
+                for i, column in enumerate(CATALOG_COLUMNS)
+            )
+            for i in range(0, len(updates), UPDATE_ROWS_PER_STATEMENT):
+                chunk = updates[i:i + UPDATE_ROWS_PER_STATEMENT]
+                values = ", ".join(["(" + ", ".join("?" * (len(CATALOG_COLUMNS) + 1)) + ")"] * len(chunk))
+                params = [value for row in chunk for value in (row["id"], *(row.get(c) for c in CATALOG_COLUMNS))]
+                await tx.execute_raw(
+                    f'UPDATE "Ingredient" SET {assignments} FROM (VALUES {values}) AS v '
+                    f'WHERE "Ingredient".id = v.column1',
+                    *params,
+                )
+            recomputed = await RecipeService(tx).recompute_for_ingredients(nutrition_changed, client=tx)
+        self.created_ids.extend(row["id"] for row in creates)
+        self.updated_ids.extend(row["id"] for row in updates)
+        self.recipes_recomputed += recomputed
+        summary["created"] += len(creates)
+        summary["updated"] += len(updates)
+        summary["recipesRecomputed"] += recomputed
+        summary["batches"] += 1
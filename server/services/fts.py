@@ -0,0 +1,83 @@
+from typing import Dict, List, Optional
+from prisma import Prisma
+from services.ingredient_index import tokenize
+
+# Mirrors the FTS objects of the recipe_search, ingredient_fts_docid and
+# fts_doc_models migrations, for databases created with `prisma db push`,
+# which skips migration SQL. Keyed by the table or trigger whose absence
+# triggers creation. The doc map tables are modeled in schema.prisma, so
+# both paths create those and only their contents are rebuilt here.
+FTS_TABLES: Dict[str, List[str]] = {
+    # Keyed by a trigger only the rowid-keyed layout has, so databases with the
+    # earlier id-keyed IngredientFts are rebuilt.
+    "Ingredient_search_insert": [
+        'DROP TRIGGER IF EXISTS "Ingredient_fts_insert"',
+        'DROP TRIGGER IF EXISTS "Ingredient_fts_update"',
+        'DROP TRIGGER IF EXISTS "Ingredient_fts_delete"',
+        'DROP TRIGGER IF EXISTS "Ingredient_search_update"',
+        'DROP TRIGGER IF EXISTS "Ingredient_search_delete"',
+        'DROP TABLE IF EXISTS "IngredientFts"',
+        'DELETE FROM "IngredientFtsDoc"',
+        """CREATE VIRTUAL TABLE IF NOT EXISTS "IngredientFts" USING fts5(id UNINDEXED, name, category, tokenize = 'unicode61 remove_diacritics 2')""",
+        """CREATE TRIGGER IF NOT EXISTS "Ingredient_search_insert" AFTER INSERT ON "Ingredient" BEGIN
+    INSERT INTO "IngredientFtsDoc"(ingredientId) VALUES (new.id);
+    INSERT INTO "IngredientFts"(rowid, id, name, category)
+    VALUES ((SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = new.id), new.id, new.name, new.category);
+END""",
+        """CREATE TRIGGER IF NOT EXISTS "Ingredient_search_update" AFTER UPDATE OF name, category ON "Ingredient" BEGIN
+    UPDATE "IngredientFts" SET name = new.name, category = new.category
+    WHERE rowid = (SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = old.id);
+END""",
+        """CREATE TRIGGER IF NOT EXISTS "Ingredient_search_delete" AFTER DELETE ON "Ingredient" BEGIN
+    DELETE FROM "IngredientFts" WHERE rowid = (SELECT docid FROM "IngredientFtsDoc" WHERE ingredientId = old.id);
+    DELETE FROM "IngredientFtsDoc" WHERE ingredientId = old.id;
+END""",
+        'INSERT INTO "IngredientFtsDoc"(ingredientId) SELECT id FROM "Ingredient"',
+        """INSERT INTO "IngredientFts"(rowid, id, name, category)
+SELECT d.docid, i.id, i.name, i.category FROM "Ingredient" i JOIN "IngredientFtsDoc" d ON d.ingredientId = i.id""",
+    ],
+    # Replaces the title/description-only RecipeFts from the same migration.
+    # Documents are written by services/recipe_search.py; only deletes are triggered.
+    "RecipeSearch": [
+        'DROP TRIGGER IF EXISTS "Recipe_fts_insert"',
+        'DROP TRIGGER IF EXISTS "Recipe_fts_update"',
+        'DROP TRIGGER IF EXISTS "Recipe_fts_delete"',
+        'DROP TABLE IF EXISTS "RecipeFts"',
+        'DELETE FROM "RecipeSearchDoc"',
+        """CREATE VIRTUAL TABLE IF NOT EXISTS "RecipeSearch" USING fts5(title, description, steps, ingredients, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')""",
+        """INSERT INTO "RecipeSearch"("RecipeSearch", rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0, 2.0)')""",
+        """CREATE TRIGGER IF NOT EXISTS "Recipe_search_delete" AFTER DELETE ON "Recipe" BEGIN
+    DELETE FROM "RecipeSearch" WHERE rowid = (SELECT docid FROM "RecipeSearchDoc" WHERE recipeId = old.id);
+    DELETE FROM "RecipeSearchDoc" WHERE recipeId = old.id;
+END""",
+        'INSERT INTO "RecipeSearchDoc"(recipeId) SELECT id FROM "Recipe"',
+        """INSERT INTO "RecipeSearch"(rowid, title, description, steps, ingredients)
+SELECT d.docid, r.title, COALESCE(r.description, ''),
+    COALESCE((SELECT group_concat(s.instruction, ' ') FROM "RecipeStep" s WHERE s.recipeId = r.id), ''),
+    COALESCE((SELECT group_concat(i.name, ' ') FROM "RecipeIngredient" ri JOIN "Ingredient" i ON i.id = ri.ingredientId WHERE ri.recipeId = r.id), '')
+FROM "Recipe" r JOIN "RecipeSearchDoc" d ON d.recipeId = r.id""",
+    ],
+}
+
+
+async def ensure_fts_tables(db: Prisma):
+    """
+    Creates and backfills any missing full-text search table.
+    """
+    for table, statements in FTS_TABLES.items():
+        existing = await db.query_raw("SELECT name FROM sqlite_master WHERE name = ?", table)
+        if existing:
+            continue
+        for statement in statements:
+            await db.execute_raw(statement)
+
+
+def match_query(text: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 MATCH expression requiring every token as a
+    prefix. Tokens are quoted so user input can't inject FTS syntax.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,168 @@
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from agents.cooking_expert import CookingExpertAgent
+from agents.recipe_stream import RecipeStreamParser, recipe_events
+
+
+class GenerationOverloadedError(Exception):
+    pass
+
+
+class RecipeGenerationService:
+    """
+    Front door for LLM recipe generation.
+
+    Results are cached by (normalized prompt, mode, model), identical
+    requests that arrive while a generation is running share that single
+    upstream call, and upstream concurrency is bounded by a semaphore with
+    a bounded wait queue; requests beyond it are rejected immediately.
+    """
+
+    def __init__(
+        self,
+        agent: CookingExpertAgent,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        cache_size: int = 256,
+        cache_ttl: float = 3600.0,
+    ):
+        self.agent = agent
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._pending = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "rejected": 0, "upstream_calls": 0}
+
+    def _upstream_slots(self) -> asyncio.Semaphore:
+        # Made on first use, inside the serving loop; this service is built at
+        # import time, and on Python 3.9 a semaphore binds to the loop current then
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        return " ".join((prompt or "").split()).casefold()
+
+    def _key(self, prompt: str, mode: str) -> Tuple[str, str, str]:
+        return (self.normalize_prompt(prompt), mode, self.agent.model_name)
+
+    def _cached(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        self.stats["hits"] += 1
+        return copy.deepcopy(cached[1])
+
+    def _store(self, key: Tuple[str, str, str], result: Dict[str, Any]):
+        self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+        self._cache.move_to_end(key)
+        now = time.monotonic()
+        # Least recently used first; drop expired ones there as well as overflow
+        while self._cache and (len(self._cache) > self.cache_size or next(iter(self._cache.values()))[0] <= now):
+            self._cache.popitem(last=False)
+
+    def _admit(self):
+        if self._pending >= self.max_concurrency + self.max_queue:
+            self.stats["rejected"] += 1
+            raise GenerationOverloadedError("Too many recipe generations in progress, try again shortly")
+        self.stats["misses"] += 1
+
+    async def generate(self, prompt: str, mode: str = "freestyle") -> Dict[str, Any]:
+        key = self._key(prompt, mode)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self._admit()
+            self._pending += 1
+            task = asyncio.ensure_future(self._call_upstream(" ".join(prompt.split()), mode))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+
+        # Shielded so one client disconnecting doesn't cancel the call others are waiting on
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    async def _call_upstream(self, prompt: str, mode: str) -> Dict[str, Any]:
+        async with self._upstream_slots():
+            self.stats["upstream_calls"] += 1
+            return await self.agent.generate_recipe(prompt, mode=mode)
+
+    def _finish(self, key: Tuple[str, str, str], task: asyncio.Task):
+        self._pending -= 1
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            # Failures are not cached; exception() also marks it retrieved
+            return
+        self._store(key, task.result())
+
+    async def stream(self, prompt: str, mode: str = "freestyle") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields recipe events (title, description, servings, ingredient, step,
+        macros) as they are parsed and validated from the model's token
+        stream, then a final "done" event with the full recipe. Cached
+        recipes are replayed immediately. Raises RecipeStreamError if the
+        output doesn't match RECIPE_SCHEMA.
+        """
+        key = self._key(prompt, mode)
+        cached = self._cached(key)
+        if cached is None:
+            self._admit()
+            self._pending += 1
+            # The upstream is read by its own task into a queue, so the slot is
+            # released as soon as the model finishes, not when a slow client does
+            events: "asyncio.Queue[Any]" = asyncio.Queue()
+            pump = asyncio.ensure_future(self._pump_stream(key, " ".join(prompt.split()), mode, events))
+            pump.add_done_callback(self._release_pending)
+            try:
+                while True:
+                    event = await events.get()
+                    if event is None:
+                        return
+                    if isinstance(event, Exception):
+                        raise event
+                    yield event
+            finally:
+                # Client went away mid-stream: stop reading the model too
+                pump.cancel()
+
+        for event in recipe_events(cached):
+            yield event
+        yield {"event": "done", "data": cached}
+
+    async def _pump_stream(self, key: Tuple[str, str, str], prompt: str, mode: str, events: asyncio.Queue):
+        # Puts events, then an exception if one was raised, then None
+        try:
+            async with self._upstream_slots():
+                self.stats["upstream_calls"] += 1
+                parser = RecipeStreamParser()
+                async for token in self.agent.stream_recipe(prompt, mode=mode):
+                    for event in parser.feed(token):
+                        events.put_nowait(event)
+                recipe = parser.finish()
+            self._store(key, recipe)
+            events.put_nowait({"event": "done", "data": copy.deepcopy(recipe)})
+        except Exception as exc:
+            events.put_nowait(exc)
+        finally:
+            events.put_nowait(None)
+
+    def _release_pending(self, task: asyncio.Task):
+        # A done callback, so it also runs for a task cancelled before it started
+        self._pending -= 1
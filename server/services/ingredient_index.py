@@ -0,0 +1,195 @@
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercases and strips accents so "Jalapeño" and "jalapeno" index the same.
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _deletions(token: str) -> Set[str]:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """
+    True if a and b differ by at most one insertion, deletion, substitution
+    or adjacent transposition.
+    """
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    # b is one character longer than a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class IngredientSearchIndex:
+    """
+    Resident search index over the Ingredient table.
+
+    Supports prefix matching (for typeahead), whole-token matching and
+    one-edit fuzzy matching, all served from memory. Fuzzy lookups use a
+    symmetric-delete table so they never scan the vocabulary.
+    """
+
+    EXACT_SCORE = 3.0
+    PREFIX_SCORE = 2.0
+    FUZZY_SCORE = 1.0
+    MIN_FUZZY_LENGTH = 4
+
+    def __init__(self, max_expansions: int = 64):
+        # Cap on how many vocabulary tokens a single prefix may expand to
+        self.max_expansions = max_expansions
+        self._ingredients: Dict[str, Any] = {}
+        self._names: Dict[str, str] = {}
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._vocabulary: List[str] = []
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._ingredients)
+
+    def build(self, ingredients: Iterable[Any]):
+        """
+        Replaces the index contents with the given ingredients.
+        """
+        self._ingredients.clear()
+        self._names.clear()
+        self._doc_tokens.clear()
+        self._postings.clear()
+        self._deletes.clear()
+        for ingredient in ingredients:
+            self._insert(ingredient)
+        self._vocabulary = sorted(self._postings)
+        for token in self._vocabulary:
+            self._register_deletions(token)
+
+    def add(self, ingredient: Any):
+        """
+        Adds or replaces a single ingredient, keeping the index in sync with writes.
+        """
+        if ingredient.id in self._ingredients:
+            self.remove(ingredient.id)
+        for token in self._insert(ingredient):
+            if len(self._postings[token]) == 1:
+                bisect.insort(self._vocabulary, token)
+                self._register_deletions(token)
+
+    def remove(self, ingredient_id: str):
+        self._ingredients.pop(ingredient_id, None)
+        self._names.pop(ingredient_id, None)
+        for token in self._doc_tokens.pop(ingredient_id, set()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(ingredient_id)
+            if not postings:
+                del self._postings[token]
+                pos = bisect.bisect_left(self._vocabulary, token)
+                if pos < len(self._vocabulary) and self._vocabulary[pos] == token:
+                    self._vocabulary.pop(pos)
+                for variant in _deletions(token) | {token}:
+                    bucket = self._deletes.get(variant)
+                    if bucket is not None:
+                        bucket.discard(token)
+
+    def get(self, ingredient_id: str) -> Optional[Any]:
+        return self._ingredients.get(ingredient_id)
+
+    def search(self, query: str, limit: int = 50) -> List[Any]:
+        """
+        Returns ingredients matching every query token, best matches first.
+        The last token is also matched as a prefix since it may still be typed.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        scores: Optional[Dict[str, float]] = None
+        for position, token in enumerate(tokens):
+            token_scores = self._match_token(token, prefix=position == len(tokens) - 1)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {i: s + token_scores[i] for i, s in scores.items() if i in token_scores}
+            if not scores:
+                return []
+
+        phrase = normalize(query)
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (
+                -item[1],
+                not self._names[item[0]].startswith(phrase),
+                len(self._names[item[0]]),
+                self._names[item[0]],
+            ),
+        )
+        return [self._ingredients[i] for i, _ in ranked[:limit]]
+
+    def _insert(self, ingredient: Any) -> Set[str]:
+        tokens = set(tokenize(ingredient.name))
+        self._ingredients[ingredient.id] = ingredient
+        self._names[ingredient.id] = normalize(ingredient.name)
+        self._doc_tokens[ingredient.id] = tokens
+        for token in tokens:
+            self._postings[token].add(ingredient.id)
+        return tokens
+
+    def _register_deletions(self, token: str):
+        self._deletes[token].add(token)
+        if len(token) >= self.MIN_FUZZY_LENGTH:
+            for variant in _deletions(token):
+                self._deletes[variant].add(token)
+
+    def _match_token(self, token: str, prefix: bool) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+
+        def credit(vocab_token: str, score: float):
+            for ingredient_id in self._postings.get(vocab_token, ()):
+                if scores.get(ingredient_id, 0.0) < score:
+                    scores[ingredient_id] = score
+
+        if len(token) >= self.MIN_FUZZY_LENGTH:
+            candidates = set(self._deletes.get(token, ()))
+            for variant in _deletions(token):
+                candidates.update(self._deletes.get(variant, ()))
+            for candidate in candidates:
+                if candidate != token and _within_one_edit(token, candidate):
+                    credit(candidate, self.FUZZY_SCORE)
+
+        if prefix:
+            start = bisect.bisect_left(self._vocabulary, token)
+            for vocab_token in self._vocabulary[start:start + self.max_expansions]:
+                if not vocab_token.startswith(token):
+                    break
+                if vocab_token != token:
+                    credit(vocab_token, self.PREFIX_SCORE)
+
+        credit(token, self.EXACT_SCORE)
+        return scores
@@ -1,38 +1,31 @@
 from typing import List, Dict, Any, Optional
 from prisma import Prisma
+from prisma.models import Ingredient
+from services.fts import match_query
+from services.ingredient_index import IngredientSearchIndex
 
 class IngredientService:
-    def __init__(self):
+    def __init__(self, db: Prisma, index: Optional[IngredientSearchIndex] = None):
         # In a real app, this would be an API key for Edamam or Spoonacular
         self.api_key = "MOCK_API_KEY"
+        self.db = db
+        self.index = index
 
     async def search_public_ingredients(self, query: str) -> List[Dict[str, Any]]:
         """
-        Searches the local database for ingredients.
+        Searches ingredients, served from the resident index when one is provided.
+        Falls back to the IngredientFts full-text table, through the given client, otherwise.
         """
-        db = Prisma()
-        await db.connect()
-        
-        try:
-            results = await db.ingredient.find_many(
-                where={
-                    "name": {
-                        "contains": query,
-                        "mode": "insensitive"
-                    }
-                },
-                take=50
-            )
-            return results
-        finally:
-            await db.disconnect()
+        if self.index is not None:
+            return self.index.search(query, limit=50)
 
-    async def get_purchase_info(self, ingredient_name: str, location: str = "US") -> List[Dict[str, str]]:
-        """
-        Simulates getting purchase info based on location.
-        """
-        return [
-            {"store": "Whole Foods", "link": f"https://wholefoods.com/search?q={ingredient_name}"},
-            {"store": "Amazon Fresh", "link": f"https://amazon.com/s?k={ingredient_name}"},
-            {"store": "Local Farmers Market", "info": "Check Saturdays 8am-12pm"}
-        ]
+        match = match_query(query)
+        if match is None:
+            return []
+
+        return await self.db.query_raw(
+            'SELECT i.* FROM "IngredientFts" f JOIN "Ingredient" i ON i.id = f.id '
+            'WHERE "IngredientFts" MATCH ? ORDER BY f.rank LIMIT 50',
+            match,
+            model=Ingredient
+        )
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from prisma import Prisma
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class UnknownJobTypeError(ValueError):
+    pass
+
+
+class PermanentJobError(Exception):
+    """
+    Raised by a handler for failures a retry can't fix, e.g. an invalid payload.
+    """
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with jitter: up to base * 2^(attempt - 1) seconds,
+    capped, and never less than half of that so retries still spread out.
+    """
+    delay = min(base * 2 ** (attempt - 1), cap)
+    return random.uniform(delay / 2, delay)
+
+
+class JobContext:
+    """
+    Handed to a job handler: the decoded payload and a way to report progress.
+    """
+
+    def __init__(self, db: Prisma, job: Any, progress_interval: float = 0.5):
+        self.db = db
+        self.id = job.id
+        self.attempt = job.attempts
+        self.payload = json.loads(job.payload)
+        self.progress_interval = progress_interval
+        self._reported_at = 0.0
+
+    async def progress(self, done: float, total: float = 1.0):
+        # Throttled so a tight loop doesn't turn into a write per item
+        now = time.monotonic()
+        if done < total and now - self._reported_at < self.progress_interval:
+            return
+        self._reported_at = now
+        fraction = min(max(done / total, 0.0), 1.0) if total else 1.0
+        await self.db.job.update_many(where={"id": self.id, "status": RUNNING}, data={"progress": fraction})
+
+
+JobHandler = Callable[[JobContext], Awaitable[Any]]
+
+
+class JobQueue:
+    """
+    Persistent job table access: enqueueing and status lookups.
+    """
+
+    def __init__(self, db: Prisma, types: Optional[Sequence[str]] = None):
+        self.db = db
+        self.types = set(types) if types is not None else None
+
+    async def enqueue(self, job_type: str, payload: Dict[str, Any], max_attempts: int = 3, delay: float = 0.0):
+        if self.types is not None and job_type not in self.types:
+            raise UnknownJobTypeError(f"Unknown job type: {job_type}")
+        return await self.db.job.create(data={
+            "type": job_type,
+            "payload": json.dumps(payload),
+            "maxAttempts": max(max_attempts, 1),
+            "runAt": _now() + timedelta(seconds=delay),
+        })
+
+    async def get(self, job_id: str):
+        return await self.db.job.find_unique(where={"id": job_id})
+
+    @staticmethod
+    def describe(job: Any) -> Dict[str, Any]:
+        """
+        Status view of a job, without its payload or result.
+        """
+        return {
+            "id": job.id,
+            "type": job.type,
+            "status": job.status,
+            "progress": job.progress,
+            "attempts": job.attempts,
+            "maxAttempts": job.maxAttempts,
+            "error": job.error,
+            "createdAt": job.createdAt,
+            "runAt": job.runAt,
+            "finishedAt": job.finishedAt,
+        }
+
+
+class JobWorker:
+    """
+    Pool of asyncio workers that claim jobs from the Job table and run them.
+
+    A job is claimed with a conditional UPDATE on (id, status, attempts), so
+    any number of pools, in any number of processes, can poll the same table
+    without running a job twice. Running jobs refresh lockedAt; a job whose
+    lock is older than `lease` seconds belonged to a worker that died and is
+    claimed again, or failed if it already used maxAttempts. Failures are
+    retried with exponential backoff until maxAttempts is reached.
+    """
+
+    def __init__(
+        self,
+        db: Prisma,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+        worker_id: Optional[str] = None,
+    ):
+        self.db = db
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # Made in start(), on the loop the workers run on
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {"claimed": 0, "succeeded": 0, "retried": 0, "failed": 0}
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run(), name=f"job-worker-{i}") for i in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """
+        Wakes idle workers right away, e.g. after enqueueing from the same process.
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                job = await self.claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Claiming a job failed")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. the final status write failed; the lease expiry hands the job on
+                logger.exception("Running job %s failed", job.id)
+
+    async def claim(self):
+        """
+        Claims the next due job, or returns None when there is nothing to do.
+        """
+        now = _now()
+        candidates = await self.db.job.find_many(
+            where={
+                "type": {"in": list(self.handlers)},
+                "OR": [
+                    {"status": QUEUED, "runAt": {"lte": now}},
+                    {"status": RUNNING, "lockedAt": {"lt": now - timedelta(seconds=self.lease)}},
+                ],
+            },
+            order={"runAt": "asc"},
+            take=self.concurrency,
+        )
+        for job in candidates:
+            if job.status == RUNNING and job.attempts >= job.maxAttempts:
+                # Its worker died on the last attempt, e.g. the job crashes the process
+                failed = await self.db.job.update_many(
+                    where={"id": job.id, "status": RUNNING, "attempts": job.attempts},
+                    data={
+                        "status": FAILED, "error": f"Lease expired after {job.attempts} attempts",
+                        "lockedBy": None, "lockedAt": None, "finishedAt": now,
+                    },
+                )
+                if failed:
+                    self.stats["failed"] += 1
+                    logger.warning("Job %s (%s) failed: lease expired on its last attempt", job.id, job.type)
+                continue
+            claimed = await self.db.job.update_many(
+                where={"id": job.id, "status": job.status, "attempts": job.attempts},
+                data={"status": RUNNING, "lockedBy": self.worker_id, "lockedAt": now, "attempts": job.attempts + 1},
+            )
+            if claimed:
+                self.stats["claimed"] += 1
+                return await self.db.job.find_unique(where={"id": job.id})
+        return None
+
+    async def execute(self, job: Any):
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            result = await self.handlers[job.type](JobContext(self.db, job))
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without spending an attempt
+            await self._finish(job, {"status": QUEUED, "attempts": job.attempts - 1, "runAt": _now()})
+            raise
+        except Exception as e:
+            logger.warning("Job %s (%s) attempt %d failed: %s", job.id, job.type, job.attempts, e)
+            if job.attempts < job.maxAttempts and not isinstance(e, PermanentJobError):
+                self.stats["retried"] += 1
+                delay = retry_delay(job.attempts, self.backoff_base, self.backoff_max)
+                await self._finish(job, {"status": QUEUED, "error": str(e), "runAt": _now() + timedelta(seconds=delay)})
+            else:
+                self.stats["failed"] += 1
+                await self._finish(job, {"status": FAILED, "error": str(e), "finishedAt": _now()})
+        else:
+            self.stats["succeeded"] += 1
+            await self._finish(job, {
+                "status": SUCCEEDED, "result": json.dumps(result, default=str), "error": None,
+                "progress": 1.0, "finishedAt": _now(),
+            })
+        finally:
+            heartbeat.cancel()
+
+    async def _finish(self, job: Any, data: Dict[str, Any]):
+        # Only while we still hold the lock; a job reclaimed after a lost lease belongs to its new owner
+        await self.db.job.update_many(
+            where={"id": job.id, "status": RUNNING, "lockedBy": self.worker_id, "attempts": job.attempts},
+            data={**data, "lockedBy": None, "lockedAt": None},
+        )
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await self.db.job.update_many(
+                    where={"id": job_id, "status": RUNNING, "lockedBy": self.worker_id}, data={"lockedAt": _now()}
+                )
+            except Exception:
+                logger.exception("Job heartbeat failed")
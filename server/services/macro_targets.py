@@ -0,0 +1,306 @@
+import asyncio
+import bisect
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from prisma import Prisma
+from services.unit_conversion import unit_converter
+
+MACROS = ("calories", "protein", "carbs", "fat")
+# Recipe columns holding each macro per serving, in MACROS order
+_PER_SERVING_COLUMNS = ("caloriesPerServing", "proteinPerServing", "carbsPerServing", "fatPerServing")
+# Ingredient columns behind each macro, in MACROS order
+_INGREDIENT_COLUMNS = ("calories", "protein", "carbohydrates", "fats")
+
+_LEAF_SIZE = 16
+
+
+def target_weights(targets: Dict[str, Optional[float]]) -> Tuple[List[float], List[float]]:
+    """
+    Target vector and per-macro weights. Each macro is weighted by 1/target so
+    errors are relative ("10 g off 30 g protein" outweighs "10 kcal off 600");
+    macros without a target get weight 0.
+    """
+    point, weights = [], []
+    for macro in MACROS:
+        value = targets.get(macro)
+        if value is None:
+            point.append(0.0)
+            weights.append(0.0)
+        else:
+            point.append(float(value))
+            weights.append(1.0 / max(float(value), 1.0))
+    return point, weights
+
+
+class _Node:
+    __slots__ = ("axis", "split", "left", "right", "items")
+
+    def __init__(self, axis=0, split=0.0, left=None, right=None, items=None):
+        self.axis = axis
+        self.split = split
+        self.left = left
+        self.right = right
+        self.items = items
+
+
+class NutritionMatrix:
+    """
+    Per-serving macros of every recipe, held in memory with a k-d tree for
+    nearest-neighbour lookups.
+
+    Distances are weighted Euclidean with per-query diagonal weights, which a
+    k-d tree supports directly: the distance to a splitting plane is just the
+    weighted gap along its axis, so pruning stays exact.
+    """
+
+    def __init__(self):
+        # (ids, titles, vectors, k-d tree root, rows sorted per macro, sorted values per macro),
+        # replaced as one tuple so a rebuild never exposes a half-built corpus
+        self._corpus: Tuple[Any, ...] = ([], [], [], None, [], [])
+        self._stale = True
+        self._version = 0
+        # Created by the first rebuild; recipe_matrix is a module global, and on
+        # Python 3.9 a lock made at import would belong to another event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    def mark_stale(self):
+        self._stale = True
+        self._version += 1
+
+    async def ensure_fresh(self, db: Prisma):
+        if not self._stale:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._lock.locked() and self._corpus[0]:
+            # A rebuild is already running; answer from the previous corpus meanwhile
+            return
+        async with self._lock:
+            if not self._stale:
+                return
+            version = self._version
+            rows = await db.query_raw(f'SELECT id, title, {", ".join(_PER_SERVING_COLUMNS)} FROM "Recipe"')
+            # Large corpora take seconds to index; keep the event loop responsive meanwhile
+            await asyncio.to_thread(self.build, rows)
+            # Writes that landed during the rebuild leave it stale for the next lookup
+            self._stale = self._version != version
+
+    def build(self, rows: Sequence[Dict[str, Any]]):
+        """
+        Indexes the rows, then swaps them in at once so concurrent lookups see
+        either the old or the new corpus.
+        """
+        vectors = [tuple(float(row[column] or 0.0) for column in _PER_SERVING_COLUMNS) for row in rows]
+        axes = range(len(MACROS))
+        # Axis ranges over the whole corpus, so splits alternate between macros
+        # instead of always cutting calories, whose raw numbers are largest
+        scale = [
+            1.0 / ((max(v[axis] for v in vectors) - min(v[axis] for v in vectors)) or 1.0) for axis in axes
+        ] if vectors else []
+        root = self._build(vectors, scale, list(range(len(vectors)))) if vectors else None
+        # Rows sorted by each macro, for targets on a single macro
+        order = [sorted(range(len(vectors)), key=lambda i: vectors[i][axis]) for axis in axes]
+        sorted_values = [[vectors[i][axis] for i in order[axis]] for axis in axes]
+
+        ids = [row["id"] for row in rows]
+        titles = [row["title"] for row in rows]
+        self._corpus = (ids, titles, vectors, root, order, sorted_values)
+
+    def __len__(self):
+        return len(self._corpus[0])
+
+    def _build(self, vectors: List[Tuple[float, ...]], scale: List[float], items: List[int]) -> _Node:
+        if len(items) <= _LEAF_SIZE:
+            return _Node(items=items)
+        # Split on the widest axis relative to the corpus range
+        spans = [
+            (max(vectors[i][axis] for i in items) - min(vectors[i][axis] for i in items)) * scale[axis]
+            for axis in range(len(MACROS))
+        ]
+        axis = spans.index(max(spans))
+        items.sort(key=lambda i: vectors[i][axis])
+        middle = len(items) // 2
+        return _Node(
+            axis=axis,
+            split=vectors[items[middle]][axis],
+            left=self._build(vectors, scale, items[:middle]),
+            right=self._build(vectors, scale, items[middle:]),
+        )
+
+    def nearest(
+        self, point: List[float], weights: List[float], k: int = 10
+    ) -> List[Tuple[float, str, str, Tuple[float, ...]]]:
+        """
+        The k recipes closest to `point` as (distance, id, title, per-serving macros), closest first.
+        """
+        ids, titles, vectors, root, order, sorted_values = self._corpus
+        if root is None or k <= 0:
+            return []
+        active = [axis for axis, weight in enumerate(weights) if weight]
+        if len(active) == 1:
+            # The tree can't prune on the other macros' splits; walk outwards from a bisect instead
+            axis = active[0]
+            rows = self._nearest_on_axis(sorted_values[axis], order[axis], point[axis], weights[axis], k)
+        else:
+            rows = self._nearest_in_tree(root, vectors, point, weights, k)
+        return [(distance, ids[i], titles[i], vectors[i]) for distance, i in rows]
+
+    @staticmethod
+    def _nearest_in_tree(
+        root: _Node, vectors: List[Tuple[float, ...]], point: List[float], weights: List[float], k: int
+    ) -> List[Tuple[float, int]]:
+        # Max-heap of the best k so far, stored as (-squared distance, row)
+        best: List[Tuple[float, int]] = []
+        stack = [(0.0, root)]
+        while stack:
+            bound, node = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            if node.items is not None:
+                for i in node.items:
+                    vector = vectors[i]
+                    distance = 0.0
+                    for axis in range(len(MACROS)):
+                        d = (vector[axis] - point[axis]) * weights[axis]
+                        distance += d * d
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, i))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, i))
+                continue
+            gap = (point[node.axis] - node.split) * weights[node.axis]
+            near, far = (node.left, node.right) if gap < 0 else (node.right, node.left)
+            # Push the far side first so the near side is searched first
+            stack.append((max(bound, gap * gap), far))
+            stack.append((bound, near))
+        return sorted(((-negative) ** 0.5, i) for negative, i in best)
+
+    @staticmethod
+    def _nearest_on_axis(
+        values: List[float], order: List[int], value: float, weight: float, k: int
+    ) -> List[Tuple[float, int]]:
+        right = bisect.bisect_left(values, value)
+        left = right - 1
+        result = []
+        while len(result) < k and (left >= 0 or right < len(values)):
+            if right >= len(values) or (left >= 0 and value - values[left] <= values[right] - value):
+                result.append((abs(value - values[left]) * weight, order[left]))
+                left -= 1
+            else:
+                result.append((abs(values[right] - value) * weight, order[right]))
+                right += 1
+        return result
+
+
+class MacroTargetService:
+    def __init__(self, db: Prisma, matrix: NutritionMatrix):
+        self.db = db
+        self.matrix = matrix
+
+    async def recommend(self, targets: Dict[str, Optional[float]], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Recipes whose per-serving macros are closest to the targets.
+        """
+        await self.matrix.ensure_fresh(self.db)
+        point, weights = target_weights(targets)
+        return [
+            {
+                "recipeId": recipe_id,
+                "title": title,
+                "perServing": {macro: round(value, 2) for macro, value in zip(MACROS, vector)},
+                "distance": round(distance, 4),
+            }
+            for distance, recipe_id, title, vector in self.matrix.nearest(point, weights, k)
+        ]
+
+    async def fit_recipe(
+        self, recipe_id: str, targets: Dict[str, Optional[float]], min_scale: float = 0.25, max_scale: float = 3.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Suggests ingredient quantities that bring a recipe's per-serving macros
+        as close as possible to the targets, keeping each quantity within
+        [min_scale, max_scale] times its current value. Nothing is saved.
+        """
+        recipe = await self.db.recipe.find_unique(
+            where={"id": recipe_id}, include={"ingredients": {"include": {"ingredient": True}}}
+        )
+        if recipe is None:
+            return None
+        servings = max(recipe.servings or 1, 1)
+        lines = recipe.ingredients
+        # Per-serving macros contributed by one unit of each line's quantity
+        columns = [
+            [getattr(line.ingredient, column) * unit_converter.factor(line.ingredient, line.unit) / servings
+             for column in _INGREDIENT_COLUMNS]
+            for line in lines
+        ]
+        initial = [line.quantity for line in lines]
+        point, weights = target_weights(targets)
+        quantities = solve_quantities(columns, initial, point, weights, min_scale, max_scale)
+        achieved = [sum(columns[j][m] * quantities[j] for j in range(len(lines))) for m in range(len(MACROS))]
+        return {
+            "recipeId": recipe.id,
+            "servings": servings,
+            "ingredients": [
+                {
+                    "lineId": line.id,
+                    "ingredientId": line.ingredientId,
+                    "name": line.ingredient.name,
+                    "unit": line.unit,
+                    "quantity": line.quantity,
+                    "suggestedQuantity": round(quantity, 1),
+                }
+                for line, quantity in zip(lines, quantities)
+            ],
+            "perServing": {macro: round(value, 2) for macro, value in zip(MACROS, achieved)},
+            "targets": {macro: targets.get(macro) for macro in MACROS},
+        }
+
+
+def solve_quantities(
+    columns: List[List[float]],
+    initial: List[float],
+    point: List[float],
+    weights: List[float],
+    min_scale: float,
+    max_scale: float,
+    regularization: float = 0.01,
+    sweeps: int = 200,
+    tolerance: float = 1e-6,
+) -> List[float]:
+    """
+    Bounded least squares by projected coordinate descent:
+
+        minimize  sum_m (w_m * (sum_j A[j][m] q_j - t_m))^2
+                + regularization * sum_j ((q_j - q0_j) / q0_j)^2
+        subject to min_scale * q0_j <= q_j <= max_scale * q0_j
+
+    The objective is a convex quadratic, so each coordinate step is exact and
+    the iteration converges. The regularization term keeps lines that don't
+    affect any targeted macro at their original quantity.
+    """
+    n = len(initial)
+    q = list(initial)
+    macros = range(len(point))
+    residual = [sum(columns[j][m] * q[j] for j in range(n)) - point[m] for m in macros]
+    squared_weights = [w * w for w in weights]
+    for _ in range(sweeps):
+        largest_step = 0.0
+        for j in range(n):
+            q0 = initial[j]
+            if q0 <= 0:
+                continue
+            column = columns[j]
+            reg = regularization / (q0 * q0)
+            gradient = sum(squared_weights[m] * column[m] * residual[m] for m in macros) + reg * (q[j] - q0)
+            curvature = sum(squared_weights[m] * column[m] * column[m] for m in macros) + reg
+            updated = min(max(q[j] - gradient / curvature, min_scale * q0), max_scale * q0)
+            step = updated - q[j]
+            if step:
+                for m in macros:
+                    residual[m] += column[m] * step
+                q[j] = updated
+                largest_step = max(largest_step, abs(step) / q0)
+        if largest_step < tolerance:
+            break
+    return q
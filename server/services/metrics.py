@@ -0,0 +1,259 @@
+import functools
+import inspect
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms keyed by label set, rendered in the Prometheus
+    text exposition format.
+    """
+
+    def __init__(self):
+        self._meta: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def counter(self, name: str, help_text: str) -> str:
+        self._meta[name] = ("counter", help_text, ())
+        self._counters[name] = {}
+        return name
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> str:
+        self._meta[name] = ("histogram", help_text, buckets)
+        self._histograms[name] = {}
+        return name
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0):
+        series = self._counters[name]
+        key = self._key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        series = self._histograms[name]
+        key = self._key(labels)
+        if key not in series:
+            series[key] = Histogram(self._meta[name][2])
+        series[key].observe(value)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, (kind, help_text, buckets) in self._meta.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for key, value in self._counters[name].items():
+                    lines.append(f"{name}{self._labels(key)} {value}")
+                continue
+            for key, histogram in self._histograms[name].items():
+                cumulative = 0
+                for bound, count in zip(buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{name}_bucket{self._labels(key, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(key)} {histogram.sum}")
+                lines.append(f"{name}_count{self._labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _key(labels: Optional[Dict[str, str]]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+    @staticmethod
+    def _labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = key + (extra,) if extra else key
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+REQUEST_DURATION = metrics.histogram(
+    "recipemaker_http_request_duration_seconds", "HTTP request latency by route")
+REQUEST_QUERIES = metrics.histogram(
+    "recipemaker_db_queries_per_request", "Database queries issued per HTTP request", COUNT_BUCKETS)
+QUERY_DURATION = metrics.histogram(
+    "recipemaker_db_query_duration_seconds", "Database query latency by model and action")
+N_PLUS_ONE = metrics.counter(
+    "recipemaker_n_plus_one_total", "Requests that repeated the same query at least N_PLUS_ONE_THRESHOLD times")
+SPAN_DURATION = metrics.histogram(
+    "recipemaker_span_duration_seconds", "Duration of named code spans")
+AGENT_DURATION = metrics.histogram(
+    "recipemaker_agent_call_duration_seconds", "Latency of CookingExpertAgent model calls")
+
+# The same model.action this many times in one request is flagged as an N+1 pattern
+N_PLUS_ONE_THRESHOLD = 10
+
+
+class RequestStats:
+    """
+    Per-request breakdown: database queries and time spent in named spans.
+    """
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.queries: Dict[str, int] = {}
+        self.spans: Dict[str, float] = {}
+
+    def server_timing(self, total_seconds: float) -> str:
+        parts = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"']
+        parts.extend(f"{name.replace('.', '-')};dur={seconds * 1000:.2f}" for name, seconds in self.spans.items())
+        parts.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def begin_request() -> Tuple[RequestStats, Any]:
+    stats = RequestStats()
+    return stats, _current_request.set(stats)
+
+
+def end_request(token: Any, stats: RequestStats, method: str, route: str, status: int, seconds: float):
+    _current_request.reset(token)
+    metrics.observe(REQUEST_DURATION, seconds, {"method": method, "route": route, "status": str(status)})
+    metrics.observe(REQUEST_QUERIES, stats.db_queries, {"method": method, "route": route})
+    for query, count in stats.queries.items():
+        if count >= N_PLUS_ONE_THRESHOLD:
+            metrics.inc(N_PLUS_ONE, {"method": method, "route": route, "query": query})
+            logger.warning("Possible N+1: %s %s ran %s %d times", method, route, query, count)
+
+
+def record_query(model: str, action: str, seconds: float):
+    metrics.observe(QUERY_DURATION, seconds, {"model": model, "action": action})
+    stats = _current_request.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += seconds
+        query = f"{model}.{action}"
+        stats.queries[query] = stats.queries.get(query, 0) + 1
+
+
+@contextmanager
+def span(name: str, metric: str = SPAN_DURATION, label: str = "span") -> Iterator[None]:
+    """
+    Times the enclosed block into `metric` and the current request's breakdown.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe(metric, elapsed, {label: name})
+        stats = _current_request.get()
+        if stats is not None:
+            stats.spans[name] = stats.spans.get(name, 0.0) + elapsed
+
+
+def traced(name: str, metric: str = SPAN_DURATION, label: str = "span"):
+    """
+    Decorator form of span() for functions, coroutines and async generators.
+    """
+    def decorate(func):
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with span(name, metric, label):
+                    async for item in func(*args, **kwargs):
+                        yield item
+        elif inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with span(name, metric, label):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with span(name, metric, label):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Client methods that run SQL directly rather than through a model
+_RAW_METHODS = {"query_raw", "query_first", "execute_raw"}
+
+
+class _InstrumentedActions:
+    def __init__(self, actions: Any, model: str):
+        self._actions = actions
+        self._model = model
+
+    def __getattr__(self, action: str):
+        return _timed_call(getattr(self._actions, action), self._model, action)
+
+
+class _InstrumentedTransaction:
+    def __init__(self, manager: Any):
+        self._manager = manager
+
+    async def __aenter__(self):
+        return InstrumentedClient(await self._manager.__aenter__())
+
+    async def __aexit__(self, *exc_info):
+        return await self._manager.__aexit__(*exc_info)
+
+
+class InstrumentedClient:
+    """
+    Wraps a Prisma client so every model action and raw query is timed and
+    counted against the current request. Everything else passes through.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if name in _RAW_METHODS:
+            return _timed_call(attr, "raw", name)
+        if name == "tx":
+            return lambda *args, **kwargs: _InstrumentedTransaction(attr(*args, **kwargs))
+        if hasattr(attr, "find_many"):
+            return _InstrumentedActions(attr, name)
+        return attr
+
+
+def _timed_call(method: Any, model: str, action: str):
+    if not inspect.iscoroutinefunction(method):
+        return method
+
+    async def call(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            record_query(model, action, time.perf_counter() - start)
+    return call
@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+
+class _Model:
+    """
+    Compact response model: fields live in __slots__, so instances carry no
+    per-object __dict__ and serialize with a plain loop over the slots.
+    """
+
+    __slots__ = ()
+    # Nested relations: slot name -> model class, for lists or single objects
+    RELATIONS: Dict[str, type] = {}
+
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_record(cls, record: Any) -> "_Model":
+        """
+        Copies a Prisma record (or any object with matching attributes).
+        Relations that weren't included stay None.
+        """
+        model = cls.__new__(cls)
+        for name in cls.__slots__:
+            value = getattr(record, name, None)
+            related = cls.RELATIONS.get(name)
+            if related is not None and value is not None:
+                value = [related.from_record(v) for v in value] if isinstance(value, list) else related.from_record(value)
+            setattr(model, name, value)
+        return model
+
+    def to_dict(self, include: Optional[Set[str]] = None) -> Dict[str, Any]:
+        result = {}
+        for name in self.__slots__:
+            if include is not None and name not in include:
+                continue
+            value = getattr(self, name)
+            if value is not None and name in self.RELATIONS:
+                value = [v.to_dict() for v in value] if isinstance(value, list) else value.to_dict()
+            result[name] = value
+        return result
+
+
+class IngredientModel(_Model):
+    __slots__ = (
+        "id", "name", "calories", "protein", "carbohydrates", "fats", "vitamins", "minerals",
+        "unit", "density", "pieceWeight", "category", "image", "purchaseInfo",
+    )
+    id: str
+    name: str
+    calories: float
+    protein: float
+    carbohydrates: float
+    fats: float
+    vitamins: Optional[str]
+    minerals: Optional[str]
+    unit: str
+    density: Optional[float]
+    pieceWeight: Optional[float]
+    category: str
+    image: Optional[str]
+    purchaseInfo: Optional[str]
+
+
+class RecipeStepModel(_Model):
+    __slots__ = ("id", "order", "instruction", "photoUrl", "recipeId")
+    id: str
+    order: int
+    instruction: str
+    photoUrl: Optional[str]
+    recipeId: str
+
+
+class RecipeIngredientModel(_Model):
+    __slots__ = ("id", "quantity", "unit", "recipeId", "ingredientId", "ingredient")
+    RELATIONS = {"ingredient": IngredientModel}
+    id: str
+    quantity: float
+    unit: str
+    recipeId: str
+    ingredientId: str
+    ingredient: Optional[IngredientModel]
+
+
+class RecipeModel(_Model):
+    __slots__ = (
+        "id", "title", "description", "servings",
+        "totalCalories", "totalProtein", "totalCarbs", "totalFat",
+        "caloriesPerServing", "proteinPerServing", "carbsPerServing", "fatPerServing",
+        "isAiGenerated", "creatorId", "createdAt", "updatedAt", "steps", "ingredients",
+    )
+    RELATIONS = {"steps": RecipeStepModel, "ingredients": RecipeIngredientModel}
+    id: str
+    title: str
+    description: Optional[str]
+    servings: int
+    totalCalories: float
+    totalProtein: float
+    totalCarbs: float
+    totalFat: float
+    caloriesPerServing: float
+    proteinPerServing: float
+    carbsPerServing: float
+    fatPerServing: float
+    isAiGenerated: bool
+    creatorId: Optional[str]
+    createdAt: datetime
+    updatedAt: datetime
+    steps: Optional[List[RecipeStepModel]]
+    ingredients: Optional[List[RecipeIngredientModel]]
@@ -1,4 +1,6 @@
-from typing import List, Dict
+from typing import List, Dict, Any, Optional
+from services.unit_conversion import UnitConverter, unit_converter
+from services.metrics import traced
 
 class NutritionService:
     @staticmethod
@@ -6,25 +8,74 @@ class NutritionService:
         """
         recipe_ingredients: List of dicts with {ingredient: Ingredient, quantity: float, unit: str}
         """
-        totals = {
-            "calories": 0.0,
-            "protein": 0.0,
-            "carbs": 0.0,
-            "fat": 0.0
+        return NutritionService.calculate_batch_totals([recipe_ingredients])[0]
+
+    @staticmethod
+    @traced("nutrition.batch_totals")
+    def calculate_batch_totals(
+        recipes: List[List[Dict]], converter: Optional[UnitConverter] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Computes totals for many recipes in a single pass.
+        recipes: one list of {ingredient, quantity, unit} dicts per recipe, results keep the same order.
+        converter: defaults to the shared unit_converter, whose factors are cached by ingredient id.
+        """
+        factor_for = (converter or unit_converter).factor
+        results = []
+        for recipe_ingredients in recipes:
+            calories = protein = carbs = fat = 0.0
+            for item in recipe_ingredients:
+                ing = item['ingredient']
+                factor = item['quantity'] * factor_for(ing, item['unit'])
+                calories += ing.calories * factor
+                protein += ing.protein * factor
+                carbs += ing.carbohydrates * factor
+                fat += ing.fats * factor
+            results.append({
+                "calories": calories,
+                "protein": protein,
+                "carbs": carbs,
+                "fat": fat
+            })
+        return results
+
+    # Persisted Recipe columns for each macro: (overall total, per serving)
+    RECIPE_COLUMNS = {
+        "calories": ("totalCalories", "caloriesPerServing"),
+        "protein": ("totalProtein", "proteinPerServing"),
+        "carbs": ("totalCarbs", "carbsPerServing"),
+        "fat": ("totalFat", "fatPerServing"),
+    }
+
+    @staticmethod
+    def subtract_totals(new: Dict[str, float], old: Dict[str, float]) -> Dict[str, float]:
+        return {macro: new[macro] - old[macro] for macro in new}
+
+    @staticmethod
+    def recipe_columns(totals: Dict[str, float], servings: int) -> Dict[str, float]:
+        """
+        Maps totals onto the persisted Recipe columns, overall and per serving.
+        """
+        servings = max(servings or 1, 1)
+        columns = {}
+        for macro, (total_column, serving_column) in NutritionService.RECIPE_COLUMNS.items():
+            columns[total_column] = totals[macro]
+            columns[serving_column] = totals[macro] / servings
+        return columns
+
+    @staticmethod
+    def computed_recipe_columns(totals: Dict[str, float], servings: int) -> Dict[str, Any]:
+        """
+        recipe_columns for totals computed from all of a recipe's lines, marking them computed.
+        """
+        return {**NutritionService.recipe_columns(totals, servings), "totalsComputed": True}
+
+    @staticmethod
+    def recipe_increments(delta: Dict[str, float], servings: int) -> Dict[str, Dict[str, float]]:
+        """
+        Same as recipe_columns, but as atomic increments for adjusting stored totals.
+        """
+        return {
+            column: {"increment": value}
+            for column, value in NutritionService.recipe_columns(delta, servings).items()
         }
-        
-        for item in recipe_ingredients:
-            ing = item['ingredient']
-            qty = item['quantity']
-            unit = item['unit']
-            
-            # Simplified calculation based on 100g/ml or per unit
-            # In a real app, unit conversion would be handled here
-            factor = qty / 100.0 if unit in ['g', 'ml'] else qty
-            
-            totals['calories'] += ing.calories * factor
-            totals['protein'] += ing.protein * factor
-            totals['carbs'] += ing.carbohydrates * factor
-            totals['fat'] += ing.fats * factor
-            
-        return totals
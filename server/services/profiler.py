@@ -0,0 +1,74 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class SamplingProfiler:
+    """
+    Samples the event loop thread's Python stack every `interval` seconds
+    into a ring buffer covering the last `window` seconds.
+
+    dump() writes the samples taken during a request in collapsed-stack
+    format ("frame;frame;frame count"), which flamegraph.pl and speedscope
+    read directly. Requests share the loop thread, so a dump also contains
+    whatever concurrent requests were doing in that time.
+    """
+
+    def __init__(self, interval: float = 0.005, window: float = 60.0):
+        self.interval = interval
+        self._samples: Deque[Tuple[float, str]] = deque(maxlen=max(int(window / interval), 1))
+        self._thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self, thread_id: Optional[int] = None):
+        """
+        Starts sampling `thread_id`, the calling thread by default.
+        """
+        self._thread_id = thread_id or threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def collapsed(self, start: float, end: float) -> Dict[str, int]:
+        """
+        Stack -> sample count for samples taken between two time.monotonic() values.
+        """
+        counts: Dict[str, int] = {}
+        for taken_at, stack in list(self._samples):
+            if start <= taken_at <= end:
+                counts[stack] = counts.get(stack, 0) + 1
+        return counts
+
+    def dump(self, path: str, start: float, end: float) -> int:
+        counts = self.collapsed(start, end)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in sorted(counts.items()):
+                f.write(f"{stack} {count}\n")
+        return sum(counts.values())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._samples.append((time.monotonic(), self._collapse(frame)))
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+            frame = frame.f_back
+        # Collapsed stacks are root first
+        return ";".join(reversed(frames))
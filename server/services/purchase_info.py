@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote_plus
+from prisma import Prisma
+
+logger = logging.getLogger(__name__)
+
+# Locations key the cached entries inside Ingredient.purchaseInfo, e.g. "US", "PT-LIS"
+_LOCATION = re.compile(r"^[A-Z0-9][A-Z0-9-]{0,15}$")
+
+# Writes one location's entry without touching the others. Values that are
+# not a JSON object (purchaseInfo entered by hand) are never overwritten.
+_STORE_ENTRY = (
+    'UPDATE "Ingredient" SET purchaseInfo = json_set(COALESCE(purchaseInfo, \'{}\'), \'$."\' || ? || \'"\', json(?)) '
+    'WHERE id = ? AND (purchaseInfo IS NULL OR (json_valid(purchaseInfo) AND json_type(purchaseInfo) = \'object\'))'
+)
+
+
+class InvalidLocationError(ValueError):
+    pass
+
+
+class PurchaseProvider(ABC):
+    """
+    A source of store offers for an ingredient. Subclasses implement lookup()
+    and return offers such as {"store", "link"} or {"store", "info"}.
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    async def lookup(self, ingredient_name: str, location: str) -> List[Dict[str, Any]]:
+        ...
+
+
+class LocalStoreProvider(PurchaseProvider):
+    """
+    Offline provider building search links for a few stores. Used by default
+    and in development, where no store API is configured.
+    """
+
+    name = "local"
+
+    async def lookup(self, ingredient_name: str, location: str) -> List[Dict[str, Any]]:
+        query = quote_plus(ingredient_name)
+        return [
+            {"store": "Whole Foods", "link": f"https://wholefoods.com/search?q={query}"},
+            {"store": "Amazon Fresh", "link": f"https://amazon.com/s?k={query}"},
+            {"store": "Local Farmers Market", "info": "Check Saturdays 8am-12pm"},
+        ]
+
+
+# Provider names accepted by PURCHASE_PROVIDERS
+PROVIDERS = {
+    LocalStoreProvider.name: LocalStoreProvider,
+}
+
+
+def normalize_location(location: str) -> str:
+    normalized = (location or "").strip().upper()
+    if not _LOCATION.match(normalized):
+        raise InvalidLocationError(f"Invalid location: {location!r}")
+    return normalized
+
+
+class PurchaseInfoService:
+    """
+    Store offers per (ingredient, location), cached in Ingredient.purchaseInfo.
+
+    The column holds a JSON object keyed by location; each entry keeps the
+    offers, the ingredient name they were fetched for and when. Entries older
+    than `ttl` or fetched under another name are refreshed by calling every
+    provider concurrently, each bounded by `timeout`. Results missing a
+    provider are returned but not stored, so the next request retries it.
+    Concurrent misses for the same key share one lookup. Hand-entered
+    purchaseInfo that isn't a JSON object is left alone and never cached.
+    on_stored(ingredient_ids) is awaited once per call that stored entries,
+    so copies of Ingredient rows elsewhere can be refreshed.
+
+    A `name` passed to for_ingredient replaces the ingredient's own name for
+    the lookup; those offers are returned but not stored.
+    """
+
+    def __init__(
+        self,
+        db: Prisma,
+        providers: Sequence[PurchaseProvider],
+        timeout: float = 3.0,
+        ttl: float = 86400.0,
+        max_concurrency: int = 8,
+        on_stored: Optional[Callable[[List[str]], Awaitable[Any]]] = None,
+    ):
+        self.db = db
+        self.on_stored = on_stored
+        self.providers = list(providers)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_concurrency = max_concurrency
+        # Created lazily by _provider_slots()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "provider_errors": 0}
+
+    async def for_ingredient(
+        self, ingredient_id: str, location: str, name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        name = " ".join((name or "").split())
+        if not name:
+            items = await self.for_ingredients([ingredient_id], location)
+            return items[0] if items else None
+        location = normalize_location(location)
+        rows = await self.db.query_raw('SELECT id, name FROM "Ingredient" WHERE id = ?', ingredient_id)
+        if not rows:
+            return None
+        if name == rows[0]["name"]:
+            return await self.for_ingredient(ingredient_id, location)
+        self.stats["misses"] += 1
+        entry = await self._refresh(ingredient_id, name, location, store=False)
+        return self._item({**rows[0], "name": name}, location, entry, cached=False)
+
+    async def for_recipe(self, recipe_id: str, location: str) -> List[Dict[str, Any]]:
+        rows = await self.db.query_raw(
+            'SELECT DISTINCT ingredientId FROM "RecipeIngredient" WHERE recipeId = ?', recipe_id
+        )
+        return await self.for_ingredients([row["ingredientId"] for row in rows], location)
+
+    async def for_list(self, list_id: str, location: str) -> List[Dict[str, Any]]:
+        rows = await self.db.query_raw(
+            'SELECT DISTINCT ingredientId FROM "RecipeIngredient" '
+            'WHERE recipeId IN (SELECT A FROM "_RecipeToRecipeList" WHERE B = ?)',
+            list_id,
+        )
+        return await self.for_ingredients([row["ingredientId"] for row in rows], location)
+
+    async def for_ingredients(self, ingredient_ids: Sequence[str], location: str) -> List[Dict[str, Any]]:
+        """
+        Offers for every ingredient in one query plus one concurrent round of
+        provider calls for the stale ones, ordered by ingredient name.
+        """
+        location = normalize_location(location)
+        ingredient_ids = list(dict.fromkeys(ingredient_ids))
+        if not ingredient_ids:
+            return []
+        rows = await self.db.query_raw(
+            f'SELECT id, name, purchaseInfo FROM "Ingredient" WHERE id IN ({", ".join("?" * len(ingredient_ids))}) '
+            'ORDER BY name',
+            *ingredient_ids,
+        )
+
+        items: List[Optional[Dict[str, Any]]] = []
+        pending = []
+        for row in rows:
+            entry = self._cached(row, location)
+            if entry is not None:
+                self.stats["hits"] += 1
+                items.append(self._item(row, location, entry, cached=True))
+            else:
+                items.append(None)
+                pending.append((len(items) - 1, row))
+
+        fetched = await asyncio.gather(*(self._fetch(row, location) for _, row in pending))
+        for (i, row), entry in zip(pending, fetched):
+            items[i] = self._item(row, location, entry, cached=False)
+        stored = [row["id"] for (_, row), entry in zip(pending, fetched) if not entry["failedProviders"]]
+        if stored and self.on_stored is not None:
+            await self.on_stored(stored)
+        return items
+
+    def _cached(self, row: Dict[str, Any], location: str) -> Optional[Dict[str, Any]]:
+        try:
+            stored = json.loads(row["purchaseInfo"]) if row["purchaseInfo"] else None
+        except ValueError:
+            return None
+        entry = stored.get(location) if isinstance(stored, dict) else None
+        if not isinstance(entry, dict) or entry.get("name") != row["name"]:
+            return None
+        if entry.get("fetchedAt", 0) + self.ttl <= time.time():
+            return None
+        return entry
+
+    async def _fetch(self, row: Dict[str, Any], location: str) -> Dict[str, Any]:
+        key = (row["id"], location)
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._refresh(row["id"], row["name"], location))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _, key=key: self._in_flight.pop(key, None))
+        # Shielded so one client disconnecting doesn't cancel a lookup others share
+        return await asyncio.shield(task)
+
+    async def _refresh(self, ingredient_id: str, name: str, location: str, store: bool = True) -> Dict[str, Any]:
+        results = await asyncio.gather(
+            *(self._lookup(provider, name, location) for provider in self.providers), return_exceptions=True
+        )
+        offers, failed = [], []
+        for provider, result in zip(self.providers, results):
+            if isinstance(result, BaseException):
+                self.stats["provider_errors"] += 1
+                logger.warning("Purchase provider %s failed for %r: %r", provider.name, name, result)
+                failed.append(provider.name)
+                continue
+            offers.extend({**offer, "provider": provider.name} for offer in result)
+
+        entry = {"name": name, "fetchedAt": time.time(), "offers": offers, "failedProviders": failed}
+        if store and not failed:
+            await self.db.execute_raw(
+                _STORE_ENTRY, location, json.dumps({k: v for k, v in entry.items() if k != "failedProviders"}),
+                ingredient_id,
+            )
+        return entry
+
+    def _provider_slots(self) -> asyncio.Semaphore:
+        # Not in __init__: main builds this service at import, before uvicorn's
+        # loop runs, and Python 3.9 primitives keep the loop they were made on
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _lookup(self, provider: PurchaseProvider, name: str, location: str) -> List[Dict[str, Any]]:
+        async with self._provider_slots():
+            return await asyncio.wait_for(provider.lookup(name, location), self.timeout)
+
+    @staticmethod
+    def _item(row: Dict[str, Any], location: str, entry: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            "ingredientId": row["id"],
+            "name": row["name"],
+            "location": location,
+            "offers": entry.get("offers", []),
+            "fetchedAt": datetime.fromtimestamp(entry.get("fetchedAt", 0), timezone.utc).isoformat(),
+            "cached": cached,
+            "failedProviders": entry.get("failedProviders", []),
+        }
@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional, Sequence
+from prisma import Prisma
+from services.fts import match_query
+
+# RecipeSearch columns; their bm25() weights are the table's rank config,
+# set in the recipe_search migration and services/fts.py
+SEARCH_COLUMNS = ("title", "description", "steps", "ingredients")
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+REINDEX_CHUNK = 500
+
+# One document per recipe. RecipeSearchDoc maps recipe ids to integer FTS
+# rowids, so documents are replaced by rowid instead of scanning the table.
+_DOCUMENT_SELECT = (
+    'SELECT d.docid, r.title, COALESCE(r.description, \'\'), '
+    'COALESCE((SELECT group_concat(s.instruction, \' \') FROM "RecipeStep" s WHERE s.recipeId = r.id), \'\'), '
+    'COALESCE((SELECT group_concat(i.name, \' \') FROM "RecipeIngredient" ri '
+    'JOIN "Ingredient" i ON i.id = ri.ingredientId WHERE ri.recipeId = r.id), \'\') '
+    'FROM "Recipe" r JOIN "RecipeSearchDoc" d ON d.recipeId = r.id'
+)
+_INSERT_DOCUMENTS = f'INSERT INTO "RecipeSearch"(rowid, {", ".join(SEARCH_COLUMNS)}) ' + _DOCUMENT_SELECT
+
+_RESULT_COLUMNS = (
+    'r.id AS id, r.title AS title, r.description AS description, r.servings AS servings, '
+    'r.caloriesPerServing AS caloriesPerServing, r.proteinPerServing AS proteinPerServing, '
+    'r.carbsPerServing AS carbsPerServing, r.fatPerServing AS fatPerServing, r.isAiGenerated AS isAiGenerated'
+)
+
+
+async def reindex_recipes(client: Prisma, recipe_ids: Sequence[str]):
+    """
+    Rebuilds the search documents of the given recipes; ids that no longer
+    exist are dropped from the index. Call inside the transaction that wrote them.
+    """
+    recipe_ids = list(dict.fromkeys(recipe_ids))
+    for i in range(0, len(recipe_ids), REINDEX_CHUNK):
+        chunk = recipe_ids[i:i + REINDEX_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        await client.execute_raw(
+            f'DELETE FROM "RecipeSearch" WHERE rowid IN '
+            f'(SELECT docid FROM "RecipeSearchDoc" WHERE recipeId IN ({placeholders}))',
+            *chunk,
+        )
+        await client.execute_raw(
+            f'INSERT OR IGNORE INTO "RecipeSearchDoc"(recipeId) SELECT id FROM "Recipe" WHERE id IN ({placeholders})',
+            *chunk,
+        )
+        await client.execute_raw(_INSERT_DOCUMENTS + f' WHERE r.id IN ({placeholders})', *chunk)
+
+
+async def reindex_recipes_using(client: Prisma, ingredient_id: str) -> int:
+    """
+    Rebuilds the documents of every recipe that uses the ingredient, e.g. after a rename.
+    """
+    rows = await client.query_raw(
+        'SELECT DISTINCT recipeId FROM "RecipeIngredient" WHERE ingredientId = ?', ingredient_id
+    )
+    await reindex_recipes(client, [row["recipeId"] for row in rows])
+    return len(rows)
+
+
+class RecipeSearchService:
+    """
+    Ranked recipe search over titles, descriptions, step instructions and
+    ingredient names, backed by the RecipeSearch FTS5 table.
+    """
+
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def search(
+        self,
+        query: Optional[str],
+        include_ingredients: Sequence[str] = (),
+        exclude_ingredients: Sequence[str] = (),
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Recipes matching every query token (as a prefix), best bm25 score
+        first, that use all of include_ingredients and none of
+        exclude_ingredients. Without a query, filtered recipes come back by title.
+        """
+        include_ingredients = list(dict.fromkeys(include_ingredients))
+        exclude_ingredients = list(dict.fromkeys(exclude_ingredients))
+        match = match_query(query or "")
+        if match is None:
+            return await self._filter_only(include_ingredients, exclude_ingredients, limit, offset)
+
+        # Filters are applied to FTS rowids inside the ranked subquery, so
+        # LIMIT is taken after filtering and only the final page is joined.
+        # The unary + keeps SQLite from pushing the rowid set into the FTS
+        # cursor, which would re-run the MATCH once per candidate rowid.
+        conditions, params = ['"RecipeSearch" MATCH ?'], [match]
+        if include_ingredients:
+            conditions.append(
+                '+rowid IN (SELECT d.docid FROM "RecipeIngredient" ri JOIN "RecipeSearchDoc" d ON d.recipeId = ri.recipeId '
+                f'WHERE ri.ingredientId IN ({", ".join("?" * len(include_ingredients))}) '
+                'GROUP BY d.docid HAVING COUNT(DISTINCT ri.ingredientId) = ?)'
+            )
+            params += [*include_ingredients, len(include_ingredients)]
+        if exclude_ingredients:
+            conditions.append(
+                '+rowid NOT IN (SELECT d.docid FROM "RecipeIngredient" ri JOIN "RecipeSearchDoc" d ON d.recipeId = ri.recipeId '
+                f'WHERE ri.ingredientId IN ({", ".join("?" * len(exclude_ingredients))}))'
+            )
+            params += exclude_ingredients
+        rows = await self.db.query_raw(
+            f'SELECT {_RESULT_COLUMNS}, -s.rank AS score FROM '
+            f'(SELECT rowid, rank FROM "RecipeSearch" WHERE {" AND ".join(conditions)} ORDER BY rank LIMIT ? OFFSET ?) s '
+            'JOIN "RecipeSearchDoc" d ON d.docid = s.rowid JOIN "Recipe" r ON r.id = d.recipeId '
+            'ORDER BY s.rank',
+            *params, limit, offset,
+        )
+        return [self._result(row) for row in rows]
+
+    async def _filter_only(
+        self, include_ingredients: List[str], exclude_ingredients: List[str], limit: int, offset: int
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if include_ingredients:
+            conditions.append(
+                'r.id IN (SELECT recipeId FROM "RecipeIngredient" '
+                f'WHERE ingredientId IN ({", ".join("?" * len(include_ingredients))}) '
+                'GROUP BY recipeId HAVING COUNT(DISTINCT ingredientId) = ?)'
+            )
+            params += [*include_ingredients, len(include_ingredients)]
+        if exclude_ingredients:
+            conditions.append(
+                'r.id NOT IN (SELECT recipeId FROM "RecipeIngredient" '
+                f'WHERE ingredientId IN ({", ".join("?" * len(exclude_ingredients))}))'
+            )
+            params += exclude_ingredients
+        if not conditions:
+            return []
+        rows = await self.db.query_raw(
+            f'SELECT {_RESULT_COLUMNS}, NULL AS score FROM "Recipe" r WHERE {" AND ".join(conditions)} '
+            'ORDER BY r.title LIMIT ? OFFSET ?',
+            *params, limit, offset,
+        )
+        return [self._result(row) for row in rows]
+
+    @staticmethod
+    def _result(row: Dict[str, Any]) -> Dict[str, Any]:
+        row["isAiGenerated"] = bool(row["isAiGenerated"])
+        if row["score"] is not None:
+            row["score"] = round(row["score"], 4)
+        return row
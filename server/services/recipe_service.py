@@ -0,0 +1,542 @@
+import json
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from prisma import Prisma
+from prisma.errors import UniqueViolationError
+from services.ingredient_index import IngredientSearchIndex
+from services.nutrition_service import NutritionService
+from services.recipe_search import REINDEX_CHUNK, reindex_recipes
+from services.unit_conversion import UnitConverter, parse_unit
+
+
+class DuplicateRecipeError(Exception):
+    def __init__(self, title: str):
+        super().__init__(f"Recipe with title '{title}' already exists")
+        self.title = title
+
+
+class RecipeNotFoundError(Exception):
+    pass
+
+
+class UnknownIngredientError(Exception):
+    def __init__(self, ingredient_ids: List[str]):
+        super().__init__(f"Unknown ingredientId: {', '.join(ingredient_ids)}")
+        self.ingredient_ids = ingredient_ids
+
+# Chunk attempts in import_recipes when a concurrent writer takes a title mid-chunk
+IMPORT_CHUNK_ATTEMPTS = 3
+
+
+async def iter_json_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Incrementally splits a JSON Lines byte stream, yielding (line_number, line).
+    Blank lines are skipped; decoding is left to the caller so one bad line
+    doesn't abort the stream.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+class RecipeService:
+    # Relations that recipe listings can include, mapped to Prisma include clauses
+    LIST_INCLUDES = {
+        "steps": {"steps": True},
+        "ingredients": {"ingredients": {"include": {"ingredient": True}}},
+    }
+
+    def __init__(self, db: Prisma, index: Optional[IngredientSearchIndex] = None):
+        self.db = db
+        self.index = index
+
+    @staticmethod
+    def build_filter(
+        min_calories: Optional[float] = None,
+        max_calories: Optional[float] = None,
+        category: Optional[str] = None,
+        is_ai_generated: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Builds a recipe where clause. Calories filter on the stored total,
+        category matches recipes using at least one ingredient of that category.
+        """
+        where: Dict[str, Any] = {}
+        calories = {}
+        if min_calories is not None:
+            calories["gte"] = min_calories
+        if max_calories is not None:
+            calories["lte"] = max_calories
+        if calories:
+            where["totalCalories"] = calories
+        if category:
+            where["ingredients"] = {"some": {"ingredient": {"category": category}}}
+        if is_ai_generated is not None:
+            where["isAiGenerated"] = is_ai_generated
+        return where
+
+    @classmethod
+    def build_include(cls, include: Optional[str]) -> Dict[str, Any]:
+        """
+        Parses a comma separated include list; None means every relation.
+        Raises ValueError for unknown names.
+        """
+        names = list(cls.LIST_INCLUDES) if include is None else [n.strip() for n in include.split(",") if n.strip()]
+        clause: Dict[str, Any] = {}
+        for name in names:
+            if name not in cls.LIST_INCLUDES:
+                raise ValueError(f"Unknown include '{name}'")
+            clause.update(cls.LIST_INCLUDES[name])
+        return clause
+
+    async def list_recipes(
+        self, where: Dict[str, Any], include: Dict[str, Any], limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Returns one page of recipes ordered by id, plus the cursor for the next page (None on the last page).
+        """
+        pagination = {"cursor": {"id": cursor}, "skip": 1} if cursor else {}
+        page = await self.db.recipe.find_many(
+            where=where,
+            include=include or None,
+            order={"id": "asc"},
+            take=limit + 1,
+            **pagination
+        )
+        if len(page) > limit:
+            return page[:limit], page[limit - 1].id
+        return page, None
+
+    async def iter_recipes(self, where: Dict[str, Any], include: Dict[str, Any], page_size: int) -> AsyncIterator[Any]:
+        """
+        Yields every matching recipe, fetching page_size rows at a time.
+        """
+        cursor = None
+        while True:
+            page, cursor = await self.list_recipes(where, include, page_size, cursor)
+            for recipe in page:
+                yield recipe
+            if cursor is None:
+                return
+
+    @staticmethod
+    def _recipe_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+        # data includes title, description, servings, steps (list), ingredients (list of {ingredientId, quantity, unit})
+        if not isinstance(data['title'], str) or not data['title'].strip():
+            raise ValueError("title must be a non-empty string")
+        if not isinstance(data.get('servings', 1), int) or data.get('servings', 1) < 1:
+            raise ValueError("servings must be a positive integer")
+        return {
+            "title": data['title'],
+            "description": data.get('description'),
+            "servings": data.get('servings', 1),
+        }
+
+    @staticmethod
+    def _step_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{"order": step['order'], "instruction": step['instruction']} for step in data.get('steps', [])]
+
+    @staticmethod
+    def _ingredient_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rows = []
+        for item in data.get('ingredients', []):
+            if not isinstance(item['ingredientId'], str) or not isinstance(item['unit'], str):
+                raise ValueError("ingredientId and unit must be strings")
+            parse_unit(item['unit'])  # reject unknown units before anything is written
+            rows.append({"quantity": item['quantity'], "unit": item['unit'], "ingredientId": item['ingredientId']})
+        return rows
+
+    async def resolve_ingredients(self, ingredient_ids: List[str], client=None) -> Dict[str, Any]:
+        """
+        Looks ingredients up in the resident index, fetching any misses in one query.
+        """
+        client = client or self.db
+        found = {}
+        missing = []
+        for ingredient_id in set(ingredient_ids):
+            ing = self.index.get(ingredient_id) if self.index is not None else None
+            if ing:
+                found[ingredient_id] = ing
+            else:
+                missing.append(ingredient_id)
+        if missing:
+            for ing in await client.ingredient.find_many(where={"id": {"in": missing}}):
+                found[ing.id] = ing
+        return found
+
+    @staticmethod
+    def with_ingredient_data(items: List[Dict], ingredients: Dict[str, Any]) -> List[Dict]:
+        """
+        Pairs {ingredientId, quantity, unit} lines with their Ingredient, dropping unknown ids.
+        """
+        return [
+            {"ingredient": ingredients[item['ingredientId']], "quantity": item['quantity'], "unit": item['unit']}
+            for item in items
+            if item['ingredientId'] in ingredients
+        ]
+
+    async def _require_ingredients(self, lines: List[Dict], client=None) -> Dict[str, Any]:
+        # Checked before writing, since the nested create would otherwise fail on the foreign key
+        ingredients = await self.resolve_ingredients([line['ingredientId'] for line in lines], client)
+        unknown = sorted({line['ingredientId'] for line in lines} - ingredients.keys())
+        if unknown:
+            raise UnknownIngredientError(unknown)
+        return ingredients
+
+    async def _nutrition_columns(self, lines: List[Dict], servings: int, client=None) -> Dict[str, Any]:
+        ingredients = await self._require_ingredients(lines, client)
+        totals = NutritionService.calculate_recipe_totals(self.with_ingredient_data(lines, ingredients))
+        return NutritionService.computed_recipe_columns(totals, servings)
+
+    async def create_recipe(self, data: Dict[str, Any]):
+        """
+        Creates a recipe with its steps and ingredient lines in one transaction.
+        Raises DuplicateRecipeError if the title is already taken and
+        UnknownIngredientError for ingredient ids that don't exist.
+        """
+        fields = self._recipe_fields(data)
+        ingredient_rows = self._ingredient_rows(data)
+
+        try:
+            async with self.db.tx() as tx:
+                existing = await tx.recipe.find_first(where={"title": data['title']})
+                if existing:
+                    raise DuplicateRecipeError(data['title'])
+
+                recipe = await tx.recipe.create(
+                    data={
+                        **fields,
+                        **await self._nutrition_columns(ingredient_rows, fields['servings'], tx),
+                        "steps": {"create": self._step_rows(data)},
+                        "ingredients": {"create": ingredient_rows},
+                    },
+                    include={"steps": True, "ingredients": True}
+                )
+                await reindex_recipes(tx, [recipe.id])
+                return recipe
+        except UniqueViolationError:
+            # Lost a race with a concurrent create; Recipe.title is unique
+            raise DuplicateRecipeError(data['title'])
+
+    async def update_recipe(self, recipe_id: str, data: Dict[str, Any]):
+        """
+        Updates recipe fields, replacing steps and ingredient lines when given,
+        and recomputes the stored nutrition totals. Raises DuplicateRecipeError
+        if the new title is already taken and UnknownIngredientError for
+        ingredient ids that don't exist.
+        """
+        try:
+            async with self.db.tx() as tx:
+                recipe = await tx.recipe.find_unique(where={"id": recipe_id}, include={"ingredients": True})
+                if recipe is None:
+                    raise RecipeNotFoundError(recipe_id)
+
+                fields = {key: data[key] for key in ("title", "description", "servings") if key in data}
+                servings = fields.get('servings', recipe.servings)
+
+                if 'steps' in data:
+                    await tx.recipestep.delete_many(where={"recipeId": recipe_id})
+                    fields["steps"] = {"create": self._step_rows(data)}
+                if 'ingredients' in data:
+                    await tx.recipeingredient.delete_many(where={"recipeId": recipe_id})
+                    lines = self._ingredient_rows(data)
+                    fields["ingredients"] = {"create": lines}
+                else:
+                    lines = [
+                        {"ingredientId": line.ingredientId, "quantity": line.quantity, "unit": line.unit}
+                        for line in recipe.ingredients
+                    ]
+                fields.update(await self._nutrition_columns(lines, servings, tx))
+
+                recipe = await tx.recipe.update(
+                    where={"id": recipe_id},
+                    data=fields,
+                    include={"steps": True, "ingredients": True}
+                )
+                await reindex_recipes(tx, [recipe_id])
+                return recipe
+        except UniqueViolationError:
+            raise DuplicateRecipeError(data['title'])
+
+    async def _line_totals(self, line: Dict[str, Any], client) -> Dict[str, float]:
+        ingredients = await self._require_ingredients([line], client)
+        return NutritionService.calculate_recipe_totals(self.with_ingredient_data([line], ingredients))
+
+    async def add_ingredient(self, recipe_id: str, item: Dict[str, Any]):
+        """
+        Adds an ingredient line and increments the stored totals by its contribution.
+        Raises UnknownIngredientError if the ingredient doesn't exist.
+        """
+        line = self._ingredient_rows({"ingredients": [item]})[0]
+        async with self.db.tx() as tx:
+            recipe = await tx.recipe.find_unique(where={"id": recipe_id})
+            if recipe is None:
+                raise RecipeNotFoundError(recipe_id)
+            delta = await self._line_totals(line, tx)
+            created = await tx.recipeingredient.create(data={**line, "recipeId": recipe_id})
+            await tx.recipe.update(
+                where={"id": recipe_id},
+                data=NutritionService.recipe_increments(delta, recipe.servings)
+            )
+            await reindex_recipes(tx, [recipe_id])
+            return created
+
+    async def update_ingredient(self, recipe_id: str, line_id: str, item: Dict[str, Any]):
+        """
+        Edits an ingredient line and adjusts the stored totals by the difference.
+        Raises UnknownIngredientError if the new ingredient doesn't exist.
+        """
+        async with self.db.tx() as tx:
+            existing = await tx.recipeingredient.find_first(
+                where={"id": line_id, "recipeId": recipe_id}, include={"recipe": True}
+            )
+            if existing is None:
+                raise RecipeNotFoundError(recipe_id)
+            old = {"ingredientId": existing.ingredientId, "quantity": existing.quantity, "unit": existing.unit}
+            new = {**old, **{key: item[key] for key in ("ingredientId", "quantity", "unit") if key in item}}
+
+            delta = NutritionService.subtract_totals(
+                await self._line_totals(new, tx), await self._line_totals(old, tx)
+            )
+            updated = await tx.recipeingredient.update(where={"id": line_id}, data=new)
+            await tx.recipe.update(
+                where={"id": recipe_id},
+                data=NutritionService.recipe_increments(delta, existing.recipe.servings)
+            )
+            if new["ingredientId"] != old["ingredientId"]:
+                await reindex_recipes(tx, [recipe_id])
+            return updated
+
+    async def remove_ingredient(self, recipe_id: str, line_id: str):
+        """
+        Removes an ingredient line and decrements the stored totals by its contribution.
+        """
+        async with self.db.tx() as tx:
+            existing = await tx.recipeingredient.find_first(
+                where={"id": line_id, "recipeId": recipe_id}, include={"recipe": True}
+            )
+            if existing is None:
+                raise RecipeNotFoundError(recipe_id)
+            await tx.recipeingredient.delete(where={"id": line_id})
+            contribution = await self._line_totals(
+                {"ingredientId": existing.ingredientId, "quantity": existing.quantity, "unit": existing.unit}, tx
+            )
+            delta = {macro: -value for macro, value in contribution.items()}
+            await tx.recipe.update(
+                where={"id": recipe_id},
+                data=NutritionService.recipe_increments(delta, existing.recipe.servings)
+            )
+            await reindex_recipes(tx, [recipe_id])
+
+    @staticmethod
+    async def _store_totals(client, recipes: List[Any]):
+        # recipes must include their ingredient lines with each Ingredient. A
+        # fresh converter compiles factors from these rows, not from factors the
+        # shared cache may hold for a version of the ingredient being replaced.
+        all_totals = NutritionService.calculate_batch_totals([
+            [{"ingredient": line.ingredient, "quantity": line.quantity, "unit": line.unit} for line in recipe.ingredients]
+            for recipe in recipes
+        ], UnitConverter())
+        for recipe, totals in zip(recipes, all_totals):
+            await client.recipe.update(
+                where={"id": recipe.id},
+                data=NutritionService.computed_recipe_columns(totals, recipe.servings)
+            )
+
+    async def recompute_for_ingredient(self, ingredient_id: str, client=None) -> int:
+        """
+        Recomputes stored totals for every recipe that uses the ingredient,
+        e.g. after its macros changed. Returns the number of recipes updated.
+        Runs in its own transaction unless the caller's client is passed.
+        """
+        if client is None:
+            async with self.db.tx() as tx:
+                return await self.recompute_for_ingredient(ingredient_id, tx)
+        recipes = await client.recipe.find_many(
+            where={"ingredients": {"some": {"ingredientId": ingredient_id}}},
+            include={"ingredients": {"include": {"ingredient": True}}}
+        )
+        await self._store_totals(client, recipes)
+        return len(recipes)
+
+    async def recompute_recipes(
+        self,
+        recipe_ids: List[str],
+        batch_size: int = 200,
+        client=None,
+        progress: Optional[Callable[[int, int], Awaitable[Any]]] = None,
+    ) -> int:
+        """
+        Recomputes stored totals for the given recipes, batch_size recipes per
+        transaction, or all in the caller's transaction when its client is
+        passed. progress(done, total) is awaited after every batch. Returns
+        the number of recipes updated.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        recipe_ids = list(dict.fromkeys(recipe_ids))
+        updated = 0
+        for i in range(0, len(recipe_ids), batch_size):
+            if client is None:
+                async with self.db.tx() as tx:
+                    updated += await self._recompute_batch(tx, recipe_ids[i:i + batch_size])
+            else:
+                updated += await self._recompute_batch(client, recipe_ids[i:i + batch_size])
+            if progress is not None:
+                await progress(min(i + batch_size, len(recipe_ids)), len(recipe_ids))
+        return updated
+
+    async def _recompute_batch(self, client, recipe_ids: List[str]) -> int:
+        recipes = await client.recipe.find_many(
+            where={"id": {"in": recipe_ids}},
+            include={"ingredients": {"include": {"ingredient": True}}}
+        )
+        await self._store_totals(client, recipes)
+        return len(recipes)
+
+    async def recompute_for_ingredients(
+        self,
+        ingredient_ids: List[str],
+        batch_size: int = 200,
+        client=None,
+        progress: Optional[Callable[[int, int], Awaitable[Any]]] = None,
+    ) -> int:
+        """
+        Recomputes stored totals for every recipe using any of the ingredients,
+        each recipe once, batch_size recipes per transaction (see recompute_recipes).
+        """
+        ingredient_ids = list(dict.fromkeys(ingredient_ids))
+        recipe_ids: List[str] = []
+        for i in range(0, len(ingredient_ids), REINDEX_CHUNK):
+            chunk = ingredient_ids[i:i + REINDEX_CHUNK]
+            rows = await (client or self.db).query_raw(
+                f'SELECT DISTINCT recipeId FROM "RecipeIngredient" WHERE ingredientId IN ({", ".join("?" * len(chunk))})',
+                *chunk,
+            )
+            recipe_ids.extend(row["recipeId"] for row in rows)
+        return await self.recompute_recipes(recipe_ids, batch_size, client, progress)
+
+    async def recompute_missing_totals(self, batch_size: int = 200) -> int:
+        """
+        Recomputes recipes whose totals were never computed from their lines,
+        i.e. ones written before totals were maintained on write.
+        """
+        rows = await self.db.query_raw('SELECT id FROM "Recipe" WHERE totalsComputed = 0')
+        return await self.recompute_recipes([row["id"] for row in rows], batch_size)
+
+    async def import_recipes(self, chunks: AsyncIterator[bytes], chunk_size: int = 500) -> Dict[str, Any]:
+        """
+        Imports a JSON Lines stream of recipes, committing every chunk_size
+        recipes in its own transaction. Recipes whose title already exists
+        (in the database or earlier in the stream) are skipped.
+        """
+        summary = {"imported": 0, "skipped": 0, "chunks": 0, "errors": []}
+        seen_titles: Set[str] = set()
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+
+        async for line_number, line in iter_json_lines(chunks):
+            try:
+                data = json.loads(line)
+                # Shape checks only; ingredients and units are checked per chunk
+                self._recipe_fields(data)
+                self._step_rows(data)
+                self._ingredient_rows(data)
+            except (ValueError, KeyError, TypeError) as e:
+                summary["errors"].append({"line": line_number, "error": str(e)})
+                continue
+            if data['title'] in seen_titles:
+                summary["skipped"] += 1
+                continue
+            seen_titles.add(data['title'])
+            pending.append((line_number, data))
+            if len(pending) >= chunk_size:
+                await self._import_chunk(pending, summary)
+                pending = []
+
+        if pending:
+            await self._import_chunk(pending, summary)
+        return summary
+
+    async def _import_chunk(self, recipes: List[Tuple[int, Dict[str, Any]]], summary: Dict[str, Any]):
+        # Resolve ingredients and compute totals before the transaction, so a
+        # row with an unknown ingredient or an unconvertible unit is reported
+        # on its own instead of rolling back the chunk
+        ingredients = await self.resolve_ingredients(
+            [item['ingredientId'] for _, data in recipes for item in data.get('ingredients', [])]
+        )
+        valid = []
+        for line_number, data in recipes:
+            lines = data.get('ingredients', [])
+            unknown = sorted({item['ingredientId'] for item in lines} - ingredients.keys())
+            if unknown:
+                summary["errors"].append({"line": line_number, "error": str(UnknownIngredientError(unknown))})
+                continue
+            try:
+                totals = NutritionService.calculate_recipe_totals(self.with_ingredient_data(lines, ingredients))
+            except (ValueError, TypeError) as e:
+                summary["errors"].append({"line": line_number, "error": str(e)})
+                continue
+            valid.append((line_number, data, totals))
+
+        # Titles already stored count as skipped. One taken by a concurrent
+        # writer while this chunk is written fails the insert; the chunk is then
+        # retried and that row reported as a duplicate.
+        titles = [data['title'] for _, data, _ in valid]
+        stored = {r.title for r in await self.db.recipe.find_many(where={"title": {"in": titles}})}
+        for attempt in range(1, IMPORT_CHUNK_ATTEMPTS + 1):
+            try:
+                imported, errors = await self._write_chunk(valid, stored)
+                break
+            except UniqueViolationError:
+                if attempt == IMPORT_CHUNK_ATTEMPTS:
+                    raise
+
+        summary["imported"] += imported
+        summary["skipped"] += len(stored)
+        summary["errors"].extend(errors)
+        summary["chunks"] += 1
+
+    async def _write_chunk(
+        self, valid: List[Tuple[int, Dict[str, Any], Dict[str, float]]], stored: Set[str]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        recipe_rows = []
+        step_rows = []
+        ingredient_rows = []
+        errors = []
+
+        async with self.db.tx() as tx:
+            existing = await tx.recipe.find_many(where={"title": {"in": [data['title'] for _, data, _ in valid]}})
+            existing_titles = {r.title for r in existing}
+
+            for line_number, data, totals in valid:
+                if data['title'] in existing_titles:
+                    if data['title'] not in stored:
+                        errors.append({"line": line_number, "error": str(DuplicateRecipeError(data['title']))})
+                    continue
+                # Ids are assigned here so child rows can reference them without a read-back
+                recipe_id = str(uuid.uuid4())
+                fields = self._recipe_fields(data)
+                recipe_rows.append({
+                    "id": recipe_id,
+                    **fields,
+                    **NutritionService.computed_recipe_columns(totals, fields['servings']),
+                })
+                step_rows.extend({**row, "recipeId": recipe_id} for row in self._step_rows(data))
+                ingredient_rows.extend({**row, "recipeId": recipe_id} for row in self._ingredient_rows(data))
+
+            if recipe_rows:
+                await tx.recipe.create_many(data=recipe_rows)
+            if step_rows:
+                await tx.recipestep.create_many(data=step_rows)
+            if ingredient_rows:
+                await tx.recipeingredient.create_many(data=ingredient_rows)
+            await reindex_recipes(tx, [row["id"] for row in recipe_rows])
+        return len(recipe_rows), errors
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from fastapi import Request, Response
+from services.serialization import dumps
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by ResponseCache. Values are bytes; counters back the
+    namespace versions used for invalidation and must not expire.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    async def get_counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU with a TTL on every entry.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shares the cache between workers through any client exposing the
+    redis.asyncio get/set/incr calls, so a local stand-in can replace Redis.
+    """
+
+    def __init__(self, client: Any, prefix: str = "recipemaker:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    async def get_counter(self, key: str) -> int:
+        value = await self.client.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(self.prefix + key)
+
+
+class ResponseCache:
+    """
+    Caches JSON responses of read endpoints with ETag support.
+
+    Entries are keyed by the versions of the namespaces a response depends
+    on (e.g. "recipes", "ingredients"), so invalidating a namespace is a
+    single counter bump and stale entries simply age out. A ttl of 0
+    disables storage; responses still carry an ETag.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = 60.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+    async def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            await self.backend.incr(f"version:{namespace}")
+        self.stats["invalidations"] += 1
+
+    async def _key(self, request: Request, namespaces: Iterable[str]) -> str:
+        versions = [f"{ns}={await self.backend.get_counter(f'version:{ns}')}" for ns in namespaces]
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return f"response:{','.join(versions)}:{request.url.path}?{query}"
+
+    async def respond(
+        self,
+        request: Request,
+        namespaces: Tuple[str, ...],
+        compute: Callable[[], Awaitable[Any]],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """
+        Serves the response from cache, or calls compute() and stores it.
+        compute may fill `headers` with extra response headers to cache alongside the body.
+        """
+        key = await self._key(request, namespaces) if self.ttl > 0 else None
+        cached = await self.backend.get(key) if key is not None else None
+        if cached is not None:
+            self.stats["hits"] += 1
+            meta, body = cached.split(b"\n", 1)
+            stored_headers = json.loads(meta)
+        else:
+            self.stats["misses"] += 1
+            headers = headers if headers is not None else {}
+            payload = await compute()
+            body = dumps(payload)
+            stored_headers = {**headers, "ETag": '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()}
+            if key is not None:
+                await self.backend.set(key, json.dumps(stored_headers).encode() + b"\n" + body, self.ttl)
+
+        etag = stored_headers["ETag"]
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=stored_headers)
+        return Response(content=body, media_type="application/json", headers=stored_headers)
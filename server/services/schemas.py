@@ -0,0 +1,161 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, root_validator, validator
+
+# Request bodies. Routes pass `.dict(exclude_unset=True)` on to the services,
+# which keep working on plain dicts.
+
+
+def _not_null(cls, value):
+    # Partial updates may omit these fields, but an explicit null would be
+    # written to a non-nullable column
+    if value is None:
+        raise ValueError("may not be null")
+    return value
+
+
+class IngredientCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    calories: float = Field(..., ge=0)
+    protein: float = Field(..., ge=0)
+    carbohydrates: float = Field(..., ge=0)
+    fats: float = Field(..., ge=0)
+    unit: str = "g"
+    category: str = "Other"
+    density: Optional[float] = Field(None, gt=0)
+    pieceWeight: Optional[float] = Field(None, gt=0)
+    vitamins: Optional[str] = None
+    minerals: Optional[str] = None
+    image: Optional[str] = None
+    purchaseInfo: Optional[str] = None
+
+
+class IngredientUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1)
+    calories: Optional[float] = Field(None, ge=0)
+    protein: Optional[float] = Field(None, ge=0)
+    carbohydrates: Optional[float] = Field(None, ge=0)
+    fats: Optional[float] = Field(None, ge=0)
+    unit: Optional[str] = None
+    category: Optional[str] = None
+    density: Optional[float] = Field(None, gt=0)
+    pieceWeight: Optional[float] = Field(None, gt=0)
+    vitamins: Optional[str] = None
+    minerals: Optional[str] = None
+    image: Optional[str] = None
+    purchaseInfo: Optional[str] = None
+
+    _required = validator(
+        "name", "calories", "protein", "carbohydrates", "fats", "unit", "category", pre=True, allow_reuse=True
+    )(_not_null)
+
+
+class IngredientLine(BaseModel):
+    ingredientId: str
+    quantity: float = Field(..., ge=0)
+    unit: str
+
+
+class IngredientLineUpdate(BaseModel):
+    ingredientId: Optional[str] = None
+    quantity: Optional[float] = Field(None, ge=0)
+    unit: Optional[str] = None
+
+    _required = validator("ingredientId", "quantity", "unit", pre=True, allow_reuse=True)(_not_null)
+
+
+class StepIn(BaseModel):
+    order: int
+    instruction: str
+
+
+class RecipeCreate(BaseModel):
+    title: str = Field(..., min_length=1)
+    description: Optional[str] = None
+    servings: int = Field(1, ge=1)
+    steps: List[StepIn] = []
+    ingredients: List[IngredientLine] = []
+
+
+class RecipeUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1)
+    description: Optional[str] = None
+    servings: Optional[int] = Field(None, ge=1)
+    steps: Optional[List[StepIn]] = None
+    ingredients: Optional[List[IngredientLine]] = None
+
+    _required = validator("title", "servings", "steps", "ingredients", pre=True, allow_reuse=True)(_not_null)
+
+
+class NutritionRequest(BaseModel):
+    ingredients: List[IngredientLine]
+
+
+class NutritionBulkRequest(BaseModel):
+    recipes: List[NutritionRequest]
+
+
+class GenerateRequest(BaseModel):
+    prompt: str = Field(..., min_length=1)
+    mode: str = "freestyle"
+
+
+class StepsBatchRequest(BaseModel):
+    recipes: List[List[str]]
+    batchSize: int = Field(8, ge=1)
+
+
+class NutrientsBatchRequest(BaseModel):
+    names: List[str]
+    batchSize: int = Field(50, ge=1)
+
+
+class RecipeListCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    userId: str = Field(..., min_length=1)
+
+
+class MealPlanSlot(BaseModel):
+    day: str = "all"
+    recipeId: str = Field(..., min_length=1)
+    servings: Optional[int] = Field(None, ge=1)
+
+
+class MealPlanRequest(BaseModel):
+    slots: List[MealPlanSlot] = []
+
+
+class MacroTargets(BaseModel):
+    # Per serving, any subset
+    calories: Optional[float] = Field(None, ge=0)
+    protein: Optional[float] = Field(None, ge=0)
+    carbs: Optional[float] = Field(None, ge=0)
+    fat: Optional[float] = Field(None, ge=0)
+
+    @root_validator(skip_on_failure=True)
+    def at_least_one(cls, values):
+        if all(value is None for value in values.values()):
+            raise ValueError("targets needs at least one of calories, protein, carbs, fat")
+        return values
+
+
+class RecommendRequest(BaseModel):
+    targets: MacroTargets
+    limit: int = Field(10, ge=1, le=100)
+
+
+class FitMacrosRequest(BaseModel):
+    targets: MacroTargets
+    minScale: float = Field(0.25, gt=0)
+    maxScale: float = Field(3.0, gt=0)
+
+    @root_validator(skip_on_failure=True)
+    def scale_range(cls, values):
+        if values["minScale"] > values["maxScale"]:
+            raise ValueError("minScale must not exceed maxScale")
+        return values
+
+
+class JobCreate(BaseModel):
+    type: str = Field(..., min_length=1)
+    payload: Dict[str, Any] = {}
+    maxAttempts: int = Field(3, ge=1)
@@ -0,0 +1,142 @@
+from array import array
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from prisma import Prisma
+from services.unit_conversion import unit_converter
+
+MACROS = ("calories", "protein", "carbs", "fat")
+# Ingredient columns behind each macro, in MACROS order
+_MACRO_COLUMNS = ("calories", "protein", "carbohydrates", "fats")
+
+# Every ingredient line of the requested recipes in one round trip. LEFT JOINs
+# keep recipes without ingredients so missing recipe ids can be told apart.
+_LINES_SQL = (
+    'SELECT r.id AS recipeId, r.servings AS servings, ri.quantity AS quantity, ri.unit AS lineUnit, '
+    'i.id AS ingredientId, i.name AS name, i.category AS category, i.unit AS unit, i.density AS density, '
+    'i.pieceWeight AS pieceWeight, i.calories AS calories, i.protein AS protein, '
+    'i.carbohydrates AS carbohydrates, i.fats AS fats '
+    'FROM "Recipe" r '
+    'LEFT JOIN "RecipeIngredient" ri ON ri.recipeId = r.id '
+    'LEFT JOIN "Ingredient" i ON i.id = ri.ingredientId '
+)
+
+
+class RecipesNotFoundError(Exception):
+    def __init__(self, recipe_ids: List[str]):
+        super().__init__(f"Recipes not found: {', '.join(recipe_ids)}")
+        self.recipe_ids = recipe_ids
+
+
+class ShoppingListService:
+    """
+    Consolidates the ingredients of many recipes into one shopping list.
+
+    Each recipe is scaled to its target servings, identical ingredients are
+    merged after converting every line to the ingredient's canonical unit
+    (g, ml or piece), and macros are totalled per day.
+    """
+
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def for_list(self, list_id: str, servings: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Shopping list for every recipe in a RecipeList, each scaled to
+        `servings` (the recipe's own servings when omitted).
+        """
+        rows = await self.db.query_raw(
+            _LINES_SQL + 'WHERE r.id IN (SELECT A FROM "_RecipeToRecipeList" WHERE B = ?)', list_id
+        )
+        slots = [{"recipeId": recipe_id, "servings": servings} for recipe_id in dict.fromkeys(r["recipeId"] for r in rows)]
+        return self.aggregate(slots, rows)
+
+    async def for_meal_plan(self, slots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        slots: [{day, recipeId, servings}], the same recipe may appear in many slots.
+        """
+        recipe_ids = list(dict.fromkeys(slot["recipeId"] for slot in slots))
+        if not recipe_ids:
+            return self.aggregate([], [])
+        rows = await self.db.query_raw(
+            _LINES_SQL + f'WHERE r.id IN ({", ".join("?" * len(recipe_ids))})', *recipe_ids
+        )
+        found = {row["recipeId"] for row in rows}
+        missing = [recipe_id for recipe_id in recipe_ids if recipe_id not in found]
+        if missing:
+            raise RecipesNotFoundError(missing)
+        return self.aggregate(slots, rows)
+
+    @staticmethod
+    def aggregate(slots: List[Dict[str, Any]], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # Recipe lines as flat columns: ingredient slot, per-serving macro multiplier
+        ingredient_slot: Dict[str, int] = {}
+        ingredients: List[SimpleNamespace] = []
+        lines: Dict[str, List[int]] = {}
+        line_ingredient = array("l")
+        line_multiplier = array("d")
+        for row in rows:
+            if row["ingredientId"] is None:
+                lines.setdefault(row["recipeId"], [])
+                continue
+            slot = ingredient_slot.get(row["ingredientId"])
+            if slot is None:
+                slot = ingredient_slot[row["ingredientId"]] = len(ingredients)
+                ingredients.append(SimpleNamespace(
+                    id=row["ingredientId"], name=row["name"], category=row["category"], unit=row["unit"],
+                    density=row["density"], pieceWeight=row["pieceWeight"],
+                    macros=[float(row[column]) for column in _MACRO_COLUMNS],
+                ))
+            servings = max(row["servings"] or 1, 1)
+            lines.setdefault(row["recipeId"], []).append(len(line_multiplier))
+            line_ingredient.append(slot)
+            line_multiplier.append(row["quantity"] * unit_converter.factor(ingredients[slot], row["lineUnit"]) / servings)
+
+        recipe_servings = {row["recipeId"]: max(row["servings"] or 1, 1) for row in rows}
+        # Total macro multiplier per ingredient, and macro totals per day
+        amounts = [0.0] * len(ingredients)
+        used_by: List[set] = [set() for _ in ingredients]
+        days: Dict[str, List[float]] = {}
+        for slot in slots:
+            recipe_id = slot["recipeId"]
+            servings = slot.get("servings") or recipe_servings.get(recipe_id, 1)
+            day_totals = days.setdefault(str(slot.get("day", "all")), [0.0] * len(MACROS))
+            for line in lines.get(recipe_id, ()):
+                ingredient = line_ingredient[line]
+                multiplier = line_multiplier[line] * servings
+                amounts[ingredient] += multiplier
+                used_by[ingredient].add(recipe_id)
+                macros = ingredients[ingredient].macros
+                for m in range(len(MACROS)):
+                    day_totals[m] += macros[m] * multiplier
+
+        items = []
+        for ingredient, multiplier, recipe_ids in zip(ingredients, amounts, used_by):
+            if not recipe_ids:
+                continue
+            unit, per_multiplier = unit_converter.base_amount(ingredient)
+            items.append({
+                "ingredientId": ingredient.id,
+                "name": ingredient.name,
+                "category": ingredient.category,
+                **_display_quantity(multiplier * per_multiplier, unit),
+                "recipes": len(recipe_ids),
+            })
+        # Grouped the way a store is walked: by aisle, then name
+        items.sort(key=lambda item: (item["category"], item["name"]))
+
+        totals = [sum(day[m] for day in days.values()) for m in range(len(MACROS))]
+        return {
+            "items": items,
+            "days": {day: _macro_dict(values) for day, values in days.items()},
+            "totals": _macro_dict(totals),
+        }
+
+
+def _display_quantity(amount: float, unit: str) -> Dict[str, Any]:
+    if unit in ("g", "ml") and amount >= 1000:
+        return {"quantity": round(amount / 1000, 3), "unit": "kg" if unit == "g" else "l"}
+    return {"quantity": round(amount, 2), "unit": unit}
+
+
+def _macro_dict(values: List[float]) -> Dict[str, float]:
+    return {macro: round(value, 2) for macro, value in zip(MACROS, values)}
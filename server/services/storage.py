@@ -0,0 +1,114 @@
+import itertools
+import os
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+from prisma import Prisma
+
+
+class StorageSettings:
+    """
+    SQLite connection settings, read from the environment.
+    """
+
+    def __init__(
+        self,
+        database_url: str = "file:./dev.db",
+        read_pool_size: int = 4,
+        connection_limit: int = 1,
+        socket_timeout: float = 10.0,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size_kib: int = 65536,
+        mmap_size: int = 268435456,
+        busy_timeout_ms: int = 5000,
+    ):
+        self.database_url = database_url
+        # Each reader is its own Prisma client, i.e. its own query-engine child
+        # process (benchmarks/routes.py reports their RSS); 0 sends reads to the writer
+        self.read_pool_size = read_pool_size
+        # Per client. Pragmas are per connection, so one connection per client keeps them applied.
+        self.connection_limit = connection_limit
+        # Prisma's socket_timeout connection argument, in seconds. It bounds the
+        # client's wait on the engine connection, not a statement; waits on
+        # SQLite locks are bounded by busy_timeout_ms.
+        self.socket_timeout = socket_timeout
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+
+    @classmethod
+    def from_env(cls) -> "StorageSettings":
+        return cls(
+            database_url=os.getenv("DATABASE_URL", "file:./dev.db"),
+            read_pool_size=int(os.getenv("DB_READ_POOL_SIZE", "4")),
+            connection_limit=int(os.getenv("DB_CONNECTION_LIMIT", "1")),
+            socket_timeout=float(os.getenv("DB_SOCKET_TIMEOUT", "10")),
+            journal_mode=os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+            synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+            cache_size_kib=int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536")),
+            mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", "268435456")),
+            busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        )
+
+    def client_url(self) -> str:
+        params = urlencode({"connection_limit": self.connection_limit, "socket_timeout": self.socket_timeout})
+        separator = "&" if "?" in self.database_url else "?"
+        return f"{self.database_url}{separator}{params}"
+
+    def pragmas(self) -> Dict[str, str]:
+        return {
+            "synchronous": self.synchronous,
+            # Negative cache_size is in KiB rather than pages
+            "cache_size": str(-self.cache_size_kib),
+            "mmap_size": str(self.mmap_size),
+            "busy_timeout": str(self.busy_timeout_ms),
+            "temp_store": "MEMORY",
+        }
+
+
+class Storage:
+    """
+    One writer client plus a pool of read-only clients over the same SQLite file.
+
+    With WAL enabled readers never block on the writer, and keeping writes
+    on a single connection serializes them without SQLITE_BUSY retries.
+    Every client runs a separate Prisma query-engine process, so the default
+    pool costs five engine processes per API worker; size DB_READ_POOL_SIZE
+    to the read concurrency actually needed.
+    """
+
+    def __init__(self, settings: StorageSettings, wrap: Optional[Callable[[Prisma], Any]] = None):
+        self.settings = settings
+        url = settings.client_url()
+        # wrap lets callers instrument every client, e.g. with metrics.InstrumentedClient
+        wrap = wrap or (lambda client: client)
+        self.writer = wrap(Prisma(datasource={"url": url}))
+        self.readers: List[Prisma] = [wrap(Prisma(datasource={"url": url})) for _ in range(settings.read_pool_size)]
+        self._next_reader = itertools.cycle(self.readers or [self.writer])
+
+    async def connect(self):
+        await self.writer.connect()
+        # journal_mode is persistent in the database file, so the writer sets it once
+        await self.writer.query_raw(f"PRAGMA journal_mode = {self.settings.journal_mode}")
+        await self._apply_pragmas(self.writer)
+        for reader in self.readers:
+            await reader.connect()
+            await self._apply_pragmas(reader)
+            await reader.query_raw("PRAGMA query_only = ON")
+
+    async def disconnect(self):
+        for client in [self.writer, *self.readers]:
+            if client.is_connected():
+                await client.disconnect()
+
+    def reader(self) -> Prisma:
+        """
+        Returns the next read client, round robin.
+        """
+        return next(self._next_reader)
+
+    async def _apply_pragmas(self, client: Prisma):
+        for name, value in self.settings.pragmas().items():
+            await client.query_raw(f"PRAGMA {name} = {value}")
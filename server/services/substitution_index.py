@@ -0,0 +1,266 @@
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from prisma import Prisma
+from services.ingredient_index import IngredientSearchIndex, tokenize
+from services.nutrition_service import NutritionService
+from services.recipe_service import RecipeService
+from services.unit_conversion import UnitConversionError, unit_converter
+
+# Scoring: macro-profile distance, plus a penalty for leaving the category,
+# minus a bonus for shared name tokens ("Cottage Cheese" ~ "Cream Cheese")
+CATEGORY_PENALTY = 0.15
+NAME_BONUS = 0.1
+# Energy density is capped here when scaled into [0, 1]
+MAX_KCAL_PER_100G = 900.0
+# Grid cell width in profile space
+CELL = 0.1
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Entry:
+    __slots__ = ("id", "name", "category", "tokens", "vector", "cell")
+
+    def __init__(self, ingredient: Any):
+        self.id = ingredient.id
+        self.name = ingredient.name
+        self.category = (ingredient.category or "").casefold()
+        self.tokens = set(tokenize(ingredient.name))
+        self.vector = profile(ingredient)
+        self.cell = tuple(int(v / CELL) for v in self.vector)
+
+
+def profile(ingredient: Any) -> Tuple[float, ...]:
+    """
+    Macro profile: the share of energy from protein, carbs and fat, and
+    energy density per 100 g scaled to [0, 1]. Shares make the profile
+    independent of whether macros are stated per 100 g, 100 ml or per piece.
+    """
+    protein, carbs, fat = ingredient.protein * 4, ingredient.carbohydrates * 4, ingredient.fats * 9
+    energy = protein + carbs + fat
+    shares = (protein / energy, carbs / energy, fat / energy) if energy > 0 else (0.0, 0.0, 0.0)
+    try:
+        # Multiplier for 1 g, so per 100 g is 100x; uses density/pieceWeight for ml and piece ingredients
+        kcal_per_100g = ingredient.calories * unit_converter.factor(ingredient, "g") * 100
+    except UnitConversionError:
+        kcal_per_100g = ingredient.calories
+    return (*shares, min(kcal_per_100g, MAX_KCAL_PER_100G) / MAX_KCAL_PER_100G)
+
+
+class SubstitutionIndex:
+    """
+    Nearest-neighbour index of ingredients by macro profile, category and name.
+
+    Profiles live in a uniform grid, so a lookup only scores ingredients in
+    the cells around the query, widening ring by ring until no further cell
+    can beat the k-th best score. Each ingredient's neighbour list is cached
+    after the first lookup; add() merges a new ingredient into the cached
+    lists instead of recomputing them.
+    """
+
+    def __init__(self, max_neighbours: int = 20):
+        self.max_neighbours = max_neighbours
+        self._entries: Dict[str, _Entry] = {}
+        self._grid: Dict[Tuple[int, ...], Set[str]] = {}
+        # id -> [(score, other id)] sorted best first, at most max_neighbours long
+        self._neighbours: Dict[str, List[Tuple[float, str]]] = {}
+
+    def build(self, ingredients: Iterable[Any]):
+        self._entries.clear()
+        self._grid.clear()
+        self._neighbours.clear()
+        for ingredient in ingredients:
+            self._insert(_Entry(ingredient))
+
+    def add(self, ingredient: Any):
+        """
+        Inserts or replaces an ingredient, keeping cached neighbour lists current.
+        """
+        if ingredient.id in self._entries:
+            # Its profile may have moved anywhere, so cached lists can't be patched
+            self.remove(ingredient.id)
+            self._neighbours.clear()
+        entry = _Entry(ingredient)
+        self._insert(entry)
+        for owner_id, neighbours in self._neighbours.items():
+            score = self._score(self._entries[owner_id], entry)
+            if len(neighbours) < self.max_neighbours or score < neighbours[-1][0]:
+                neighbours.append((score, entry.id))
+                neighbours.sort()
+                del neighbours[self.max_neighbours:]
+
+    def remove(self, ingredient_id: str):
+        entry = self._entries.pop(ingredient_id, None)
+        if entry is None:
+            return
+        cell = self._grid.get(entry.cell)
+        if cell is not None:
+            cell.discard(ingredient_id)
+            if not cell:
+                del self._grid[entry.cell]
+        # Lists that held it are one short now; recompute them on demand
+        self._neighbours.pop(ingredient_id, None)
+        for owner_id in [o for o, ns in self._neighbours.items() if any(i == ingredient_id for _, i in ns)]:
+            del self._neighbours[owner_id]
+
+    def neighbours(self, ingredient_id: str, k: int = 10) -> List[Tuple[float, str]]:
+        """
+        Up to k (score, ingredient id) substitutes, best (lowest score) first.
+        Lists longer than max_neighbours are searched for and not cached.
+        """
+        if ingredient_id not in self._entries:
+            return []
+        if k > self.max_neighbours:
+            return self._search(self._entries[ingredient_id], k)
+        cached = self._neighbours.get(ingredient_id)
+        if cached is None:
+            cached = self._neighbours[ingredient_id] = self._search(self._entries[ingredient_id], self.max_neighbours)
+        return cached[:k]
+
+    def get(self, ingredient_id: str) -> Optional[_Entry]:
+        return self._entries.get(ingredient_id)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _insert(self, entry: _Entry):
+        self._entries[entry.id] = entry
+        self._grid.setdefault(entry.cell, set()).add(entry.id)
+
+    @staticmethod
+    def _score(a: _Entry, b: _Entry) -> float:
+        distance = math.dist(a.vector, b.vector)
+        if a.category != b.category:
+            distance += CATEGORY_PENALTY
+        return distance - NAME_BONUS * _jaccard(a.tokens, b.tokens)
+
+    def _search(self, query: _Entry, k: int) -> List[Tuple[float, str]]:
+        # Occupied cells grouped by Chebyshev ring around the query's cell; there
+        # are never more occupied cells than ingredients, so empty space costs nothing
+        rings: Dict[int, List[Tuple[int, ...]]] = {}
+        for cell in self._grid:
+            rings.setdefault(max(abs(a - b) for a, b in zip(cell, query.cell)), []).append(cell)
+
+        best: List[Tuple[float, str]] = []  # max-heap as (-score, id)
+        for ring in sorted(rings):
+            # Everything in this ring is at least (ring - 1) cells away in profile space
+            if len(best) >= k and (ring - 1) * CELL - NAME_BONUS >= -best[0][0]:
+                break
+            for cell in rings[ring]:
+                for other_id in self._grid[cell]:
+                    if other_id == query.id:
+                        continue
+                    score = self._score(query, self._entries[other_id])
+                    if len(best) < k:
+                        heapq.heappush(best, (-score, other_id))
+                    elif score < -best[0][0]:
+                        heapq.heapreplace(best, (-score, other_id))
+        return sorted((-negative, other_id) for negative, other_id in best)
+
+
+class SubstitutionService:
+    def __init__(self, db: Prisma, index: SubstitutionIndex, ingredient_index: Optional[IngredientSearchIndex] = None):
+        self.db = db
+        self.index = index
+        self.ingredient_index = ingredient_index
+
+    async def for_line(self, recipe_id: str, line_id: str, limit: int = 5) -> Optional[Dict[str, Any]]:
+        """
+        Ranked substitutes for one ingredient line of a recipe, each with the
+        recipe's per-serving macros after the swap and the change from now.
+        Returns None when the recipe has no such line.
+        """
+        recipe = await self.db.recipe.find_unique(
+            where={"id": recipe_id}, include={"ingredients": {"include": {"ingredient": True}}}
+        )
+        line = next((line for line in recipe.ingredients if line.id == line_id), None) if recipe else None
+        if line is None:
+            return None
+        servings = max(recipe.servings or 1, 1)
+        items = [{"ingredient": r.ingredient, "quantity": r.quantity, "unit": r.unit} for r in recipe.ingredients]
+        position = recipe.ingredients.index(line)
+        current = NutritionService.calculate_recipe_totals(items)
+
+        service = RecipeService(self.db, self.ingredient_index)
+        substitutes = []
+        tried: Set[str] = set()
+        k = limit
+        # Some neighbours can't stand in for the line's unit, so widen the
+        # search until limit of them can or the index runs out
+        while True:
+            ranked = self.index.neighbours(line.ingredientId, k)
+            fresh = [(score, other_id) for score, other_id in ranked if other_id not in tried]
+            tried.update(other_id for _, other_id in fresh)
+            # Resident ingredient objects when available, one query for the rest
+            candidates = await service.resolve_ingredients([other_id for _, other_id in fresh])
+            for score, other_id in fresh:
+                if len(substitutes) == limit:
+                    break
+                substitute = self._substitute(line, position, items, current, servings, score, candidates.get(other_id))
+                if substitute is not None:
+                    substitutes.append(substitute)
+            if len(substitutes) == limit or len(ranked) < k:
+                break
+            k *= 2
+        return {
+            "recipeId": recipe.id,
+            "lineId": line.id,
+            "ingredientId": line.ingredientId,
+            "name": line.ingredient.name,
+            "quantity": line.quantity,
+            "unit": line.unit,
+            "perServing": {macro: round(value / servings, 2) for macro, value in current.items()},
+            "substitutes": substitutes,
+        }
+
+    def _substitute(
+        self,
+        line: Any,
+        position: int,
+        items: List[Dict[str, Any]],
+        current: Dict[str, float],
+        servings: int,
+        score: float,
+        ingredient: Any,
+    ) -> Optional[Dict[str, Any]]:
+        if ingredient is None:
+            return None
+        amount = self._swap_amount(line, ingredient)
+        if amount is None:
+            return None
+        quantity, unit = amount
+        swapped = list(items)
+        swapped[position] = {"ingredient": ingredient, "quantity": quantity, "unit": unit}
+        totals = NutritionService.calculate_recipe_totals(swapped)
+        delta = NutritionService.subtract_totals(totals, current)
+        return {
+            "ingredientId": ingredient.id,
+            "name": ingredient.name,
+            "category": ingredient.category,
+            "quantity": round(quantity, 2),
+            "unit": unit,
+            "score": round(score, 4),
+            "perServing": {macro: round(value / servings, 2) for macro, value in totals.items()},
+            "delta": {macro: round(value / servings, 2) for macro, value in delta.items()},
+        }
+
+    @staticmethod
+    def _swap_amount(line: Any, ingredient: Any) -> Optional[Tuple[float, str]]:
+        # Same quantity and unit where the substitute supports it ("2 tbsp" for "2 tbsp"),
+        # otherwise the same weight in grams
+        try:
+            unit_converter.factor(ingredient, line.unit)
+            return line.quantity, line.unit
+        except UnitConversionError:
+            pass
+        try:
+            grams = line.quantity * unit_converter.factor(line.ingredient, line.unit) / unit_converter.factor(line.ingredient, "g")
+            unit_converter.factor(ingredient, "g")
+            return grams, "g"
+        except UnitConversionError:
+            return None
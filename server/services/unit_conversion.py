@@ -0,0 +1,144 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# unit -> (dimension, size in the dimension's canonical unit: g, ml or piece)
+UNITS: Dict[str, Tuple[str, float]] = {
+    "mg": (MASS, 0.001),
+    "g": (MASS, 1.0),
+    "kg": (MASS, 1000.0),
+    "oz": (MASS, 28.349523125),
+    "lb": (MASS, 453.59237),
+    "ml": (VOLUME, 1.0),
+    "cl": (VOLUME, 10.0),
+    "dl": (VOLUME, 100.0),
+    "l": (VOLUME, 1000.0),
+    "tsp": (VOLUME, 4.92892159375),
+    "tbsp": (VOLUME, 14.78676478125),
+    "fl oz": (VOLUME, 29.5735295625),
+    "cup": (VOLUME, 236.5882365),
+    "pint": (VOLUME, 473.176473),
+    "piece": (COUNT, 1.0),
+}
+
+ALIASES: Dict[str, str] = {
+    "gram": "g", "grams": "g", "gr": "g",
+    "kilogram": "kg", "kilograms": "kg", "kgs": "kg",
+    "milligram": "mg", "milligrams": "mg",
+    "ounce": "oz", "ounces": "oz",
+    "pound": "lb", "pounds": "lb", "lbs": "lb",
+    "milliliter": "ml", "milliliters": "ml", "millilitre": "ml", "millilitres": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsps": "tbsp", "tbs": "tbsp",
+    "floz": "fl oz", "fluid ounce": "fl oz", "fluid ounces": "fl oz",
+    "cups": "cup", "pints": "pint",
+    "pieces": "piece", "pc": "piece", "pcs": "piece", "unit": "piece", "units": "piece",
+    "each": "piece", "whole": "piece",
+}
+
+# Assumed when an ingredient has no density, i.e. treat it like water
+DEFAULT_DENSITY = 1.0
+
+
+class UnitConversionError(ValueError):
+    pass
+
+
+def parse_unit(unit: str) -> Tuple[str, float]:
+    """
+    Returns (dimension, canonical size) for a unit name or alias.
+    """
+    key = " ".join((unit or "").lower().replace(".", "").split())
+    key = ALIASES.get(key, key)
+    if key not in UNITS:
+        raise UnitConversionError(f"Unknown unit '{unit}'")
+    return UNITS[key]
+
+
+class UnitConverter:
+    """
+    Converts recipe line units into multipliers for an ingredient's macros.
+
+    Ingredient macros are stated per 100 g / 100 ml, or per piece for
+    count-based ingredients. Crossing dimensions uses the ingredient's
+    density (g per ml) and pieceWeight (g per piece). Factors are cached
+    per (ingredient id, unit) so the nutrition loop is a plain multiply-add.
+    """
+
+    def __init__(self):
+        self._factors: Dict[Tuple[str, str], float] = {}
+
+    def factor(self, ingredient: Any, unit: str) -> float:
+        """
+        Multiplier to apply to the ingredient's macros per 1 of the given unit.
+        """
+        key = (ingredient.id, unit)
+        cached = self._factors.get(key)
+        if cached is None:
+            cached = self._factors[key] = self._compile(ingredient, unit)
+        return cached
+
+    def factors(self, ingredients: Sequence[Any], quantities: Sequence[float], units: Sequence[str]) -> List[float]:
+        """
+        Batch form of factor(): returns quantity * factor for each line.
+        """
+        factor = self.factor
+        return [qty * factor(ing, unit) for ing, qty, unit in zip(ingredients, quantities, units)]
+
+    @staticmethod
+    def base_amount(ingredient: Any) -> Tuple[str, float]:
+        """
+        The ingredient's canonical unit (g, ml or piece) and how much of it one
+        unit of macro multiplier stands for, e.g. ("g", 100.0) for per-100 g macros.
+        """
+        dimension, size = parse_unit(ingredient.unit)
+        if dimension == COUNT:
+            return "piece", size
+        return ("g" if dimension == MASS else "ml"), 100.0 * size
+
+    def invalidate(self, ingredient_id: str):
+        """
+        Drops cached factors for an ingredient whose unit, density or piece weight changed.
+        """
+        for key in [key for key in self._factors if key[0] == ingredient_id]:
+            del self._factors[key]
+
+    def _compile(self, ingredient: Any, unit: str) -> float:
+        dimension, size = parse_unit(unit)
+        base_dimension, base_size = parse_unit(ingredient.unit)
+        # Macros are per 100 g/ml, or per single piece
+        reference = base_size if base_dimension == COUNT else 100.0 * base_size
+        amount = self._convert(size, dimension, base_dimension, ingredient)
+        return amount / reference
+
+    @staticmethod
+    def _convert(amount: float, source: str, target: str, ingredient: Any) -> float:
+        if source == target:
+            return amount
+
+        density = getattr(ingredient, "density", None) or DEFAULT_DENSITY
+        piece_weight = getattr(ingredient, "pieceWeight", None)
+
+        # Go through grams, the only unit every dimension can reach
+        if source == MASS:
+            grams = amount
+        elif source == VOLUME:
+            grams = amount * density
+        else:
+            if not piece_weight:
+                raise UnitConversionError(f"'{ingredient.name}' has no piece weight to convert pieces")
+            grams = amount * piece_weight
+
+        if target == MASS:
+            return grams
+        if target == VOLUME:
+            return grams / density
+        if not piece_weight:
+            raise UnitConversionError(f"'{ingredient.name}' has no piece weight to convert to pieces")
+        return grams / piece_weight
+
+
+unit_converter = UnitConverter()
@@ -0,0 +1,7 @@
+import pytest
+from fake_prisma import FakePrisma
+
+
+@pytest.fixture
+def db():
+    return FakePrisma()
@@ -0,0 +1,267 @@
+"""
+Stand-in for the generated Prisma client, backed by an in-memory sqlite3
+database built from prisma/migrations. Raw SQL, triggers and the FTS tables
+behave as they do in production; the model API covers the subset of
+where/data/include shapes the services use.
+"""
+import sqlite3
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "prisma" / "migrations"
+
+# table -> relation field -> (related table, related column, own column, is a list)
+RELATIONS: Dict[str, Dict[str, Tuple[str, str, str, bool]]] = {
+    "Recipe": {
+        "ingredients": ("RecipeIngredient", "recipeId", "id", True),
+        "steps": ("RecipeStep", "recipeId", "id", True),
+    },
+    "RecipeIngredient": {
+        "ingredient": ("Ingredient", "id", "ingredientId", False),
+        "recipe": ("Recipe", "id", "recipeId", False),
+    },
+    "RecipeStep": {
+        "recipe": ("Recipe", "id", "recipeId", False),
+    },
+}
+
+OPERATORS = {"lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+# Fixed width, so stored values compare in time order as strings
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+class Record(SimpleNamespace):
+    pass
+
+
+class Delegate:
+    def __init__(self, client: "FakePrisma", table: str):
+        self.client = client
+        self.table = table
+        self.columns = {
+            row["name"]: (row["type"] or "").upper()
+            for row in client.conn.execute(f'PRAGMA table_info("{table}")')
+        }
+
+    def _decode(self, row: sqlite3.Row) -> Record:
+        values = {}
+        for column, kind in self.columns.items():
+            value = row[column]
+            if value is not None and kind == "DATETIME":
+                value = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+            elif value is not None and kind == "BOOLEAN":
+                value = bool(value)
+            values[column] = value
+        return Record(**values)
+
+    def _where(self, where: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        if not where:
+            return "1", []
+        clauses, params = [], []
+        for key, value in where.items():
+            if key in ("OR", "AND"):
+                parts = [self._where(branch) for branch in value]
+                clauses.append("(" + f" {key} ".join(sql for sql, _ in parts) + ")")
+                params += [param for _, branch_params in parts for param in branch_params]
+            elif key in RELATIONS.get(self.table, {}):
+                target, target_column, own_column, _ = RELATIONS[self.table][key]
+                sql, sub_params = self.client.delegate(target)._where(value["some"])
+                clauses.append(f'"{own_column}" IN (SELECT "{target_column}" FROM "{target}" WHERE {sql})')
+                params += sub_params
+            elif isinstance(value, dict):
+                for op, operand in value.items():
+                    if op == "in":
+                        clauses.append(f'"{key}" IN ({", ".join("?" * len(operand))})' if operand else "0")
+                        params += [_encode(item) for item in operand]
+                    elif op == "equals":
+                        clauses.append(f'"{key}" = ?')
+                        params.append(_encode(operand))
+                    else:
+                        clauses.append(f'"{key}" {OPERATORS[op]} ?')
+                        params.append(_encode(operand))
+            elif value is None:
+                clauses.append(f'"{key}" IS NULL')
+            else:
+                clauses.append(f'"{key}" = ?')
+                params.append(_encode(value))
+        return " AND ".join(clauses), params
+
+    def _select(
+        self,
+        where: Optional[Dict[str, Any]],
+        include: Optional[Dict[str, Any]] = None,
+        order: Any = None,
+        take: Optional[int] = None,
+    ) -> List[Record]:
+        sql, params = self._where(where)
+        query = f'SELECT * FROM "{self.table}" WHERE {sql}'
+        if order:
+            orders = order if isinstance(order, list) else [order]
+            query += " ORDER BY " + ", ".join(
+                f'"{column}" {direction.upper()}' for item in orders for column, direction in item.items()
+            )
+        else:
+            query += " ORDER BY rowid"
+        if take is not None:
+            query += f" LIMIT {int(take)}"
+        records = [self._decode(row) for row in self.client.conn.execute(query, params)]
+        for record in records:
+            self._include(record, include)
+        return records
+
+    def _include(self, record: Record, include: Optional[Dict[str, Any]]):
+        for field, spec in (include or {}).items():
+            if not spec:
+                continue
+            target, target_column, own_column, many = RELATIONS[self.table][field]
+            nested = spec.get("include") if isinstance(spec, dict) else None
+            related = self.client.delegate(target)._select({target_column: getattr(record, own_column)}, nested)
+            setattr(record, field, related if many else (related[0] if related else None))
+
+    def _insert(self, data: Dict[str, Any]) -> str:
+        now = datetime.now(timezone.utc)
+        row = {key: value for key, value in data.items() if key in self.columns}
+        row.setdefault("id", str(uuid.uuid4()))
+        for column in ("createdAt", "updatedAt"):
+            if column in self.columns:
+                row.setdefault(column, now)
+        names = ", ".join(f'"{column}"' for column in row)
+        self.client.conn.execute(
+            f'INSERT INTO "{self.table}" ({names}) VALUES ({", ".join("?" * len(row))})',
+            [_encode(value) for value in row.values()],
+        )
+        self._create_children(row["id"], data)
+        return row["id"]
+
+    def _create_children(self, record_id: str, data: Dict[str, Any]):
+        for field, spec in data.items():
+            if field in RELATIONS.get(self.table, {}):
+                target, target_column, _, _ = RELATIONS[self.table][field]
+                for child in spec["create"]:
+                    self.client.delegate(target)._insert({**child, target_column: record_id})
+
+    def _assign(self, data: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        assignments, params = [], []
+        for column, value in data.items():
+            if column not in self.columns:
+                continue
+            if isinstance(value, dict):
+                assignments.append(f'"{column}" = "{column}" + ?')
+                params.append(value["increment"])
+            else:
+                assignments.append(f'"{column}" = ?')
+                params.append(_encode(value))
+        if "updatedAt" in self.columns and "updatedAt" not in data:
+            assignments.append('"updatedAt" = ?')
+            params.append(_encode(datetime.now(timezone.utc)))
+        return ", ".join(assignments), params
+
+    async def find_many(self, where=None, include=None, order=None, take=None):
+        return self._select(where, include, order, take)
+
+    async def find_unique(self, where, include=None):
+        found = self._select(where, include, take=1)
+        return found[0] if found else None
+
+    async def find_first(self, where=None, include=None, order=None):
+        found = self._select(where, include, order, take=1)
+        return found[0] if found else None
+
+    async def count(self, where=None):
+        sql, params = self._where(where)
+        return self.client.conn.execute(f'SELECT COUNT(*) FROM "{self.table}" WHERE {sql}', params).fetchone()[0]
+
+    async def create(self, data, include=None):
+        record_id = self._insert(data)
+        return await self.find_unique({"id": record_id}, include)
+
+    async def create_many(self, data):
+        for row in data:
+            self._insert(row)
+        return len(data)
+
+    async def update(self, where, data, include=None):
+        record = await self.find_unique(where)
+        if record is None:
+            return None
+        assignments, params = self._assign(data)
+        self.client.conn.execute(f'UPDATE "{self.table}" SET {assignments} WHERE id = ?', [*params, record.id])
+        self._create_children(record.id, data)
+        return await self.find_unique({"id": record.id}, include)
+
+    async def update_many(self, where, data):
+        sql, params = self._where(where)
+        assignments, set_params = self._assign(data)
+        return self.client.conn.execute(
+            f'UPDATE "{self.table}" SET {assignments} WHERE {sql}', [*set_params, *params]
+        ).rowcount
+
+    async def delete(self, where):
+        record = await self.find_unique(where)
+        if record is not None:
+            self.client.conn.execute(f'DELETE FROM "{self.table}" WHERE id = ?', [record.id])
+        return record
+
+    async def delete_many(self, where=None):
+        sql, params = self._where(where)
+        return self.client.conn.execute(f'DELETE FROM "{self.table}" WHERE {sql}', params).rowcount
+
+
+class FakePrisma:
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:", isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        for migration in sorted(MIGRATIONS_DIR.glob("*/migration.sql")):
+            self.conn.executescript(migration.read_text())
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self._delegates: Dict[str, Delegate] = {}
+        self._depth = 0
+        tables = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        self._tables = {table.lower(): table for table in tables}
+
+    def delegate(self, table: str) -> Delegate:
+        if table not in self._delegates:
+            self._delegates[table] = Delegate(self, table)
+        return self._delegates[table]
+
+    def __getattr__(self, name: str) -> Delegate:
+        table = self.__dict__.get("_tables", {}).get(name)
+        if table is None:
+            raise AttributeError(name)
+        return self.delegate(table)
+
+    @asynccontextmanager
+    async def tx(self):
+        savepoint = f"tx{self._depth}"
+        self._depth += 1
+        self.conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute(f"ROLLBACK TO {savepoint}")
+            self.conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            self.conn.execute(f"RELEASE {savepoint}")
+        finally:
+            self._depth -= 1
+
+    async def query_raw(self, query: str, *params: Any, model: Any = None) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.conn.execute(query, [_encode(param) for param in params])]
+
+    async def execute_raw(self, query: str, *params: Any) -> int:
+        return self.conn.execute(query, [_encode(param) for param in params]).rowcount
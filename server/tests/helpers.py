@@ -0,0 +1,16 @@
+from typing import Any, AsyncIterator
+
+
+async def add_ingredient(db: Any, name: str, **fields: Any):
+    data = {
+        "name": name, "calories": 100.0, "protein": 10.0, "carbohydrates": 10.0, "fats": 1.0,
+        "unit": "g", "category": "Other", **fields,
+    }
+    return await db.ingredient.create(data=data)
+
+
+async def byte_stream(*lines: str, chunk_size: int = 7) -> AsyncIterator[bytes]:
+    # A request body as the services receive it, split mid-line
+    body = "".join(line + "\n" for line in lines).encode()
+    for i in range(0, len(body), chunk_size):
+        yield body[i:i + chunk_size]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import pytest
+
+# server/prisma (the schema) is importable as a namespace package, so probe the client
+pytest.importorskip("prisma.errors")
+
+from helpers import add_ingredient, byte_stream
+from services.catalog_import import CatalogImporter, iter_catalog_rows
+from services.recipe_service import RecipeService
+
+
+def row(name, calories=100, **fields):
+    return json.dumps({"name": name, "calories": calories, "protein": 10, "carbohydrates": 10, "fats": 1, **fields})
+
+
+async def run_import(db, *lines, fmt="jsonl", batch_size=1000):
+    return await CatalogImporter(db, batch_size).run(iter_catalog_rows(byte_stream(*lines), fmt))
+
+
+def test_creates_then_leaves_an_unchanged_catalog_alone(db):
+    async def scenario():
+        lines = [row("Oats", 389), row("Whole Milk", 64, unit="ml", category="Dairy"), row("oats ", 1)]
+        summary = await run_import(db, *lines)
+        assert (summary["created"], summary["updated"], summary["duplicates"]) == (2, 0, 1)
+
+        oats = await db.ingredient.find_first(where={"name": "Oats"})
+        assert (oats.unit, oats.category, oats.calories) == ("g", "Other", 389)
+
+        summary = await run_import(db, *lines)
+        assert (summary["created"], summary["updated"], summary["unchanged"], summary["batches"]) == (0, 0, 2, 0)
+
+    asyncio.run(scenario())
+
+
+def test_partial_rows_keep_curated_columns(db):
+    async def scenario():
+        await add_ingredient(db, "Milk", unit="ml", category="Dairy", density=1.03, image="milk.png")
+
+        summary = await run_import(db, row("milk", 61))
+        assert summary["updated"] == 1
+        milk = await db.ingredient.find_first(where={"name": "milk"})
+        assert (milk.calories, milk.unit, milk.category, milk.density, milk.image) == (61, "ml", "Dairy", 1.03, "milk.png")
+
+        # Empty CSV cells count as missing too
+        summary = await run_import(
+            db, "name,calories,protein,carbohydrates,fats,unit,category,density", "Milk,60,3,5,3,,,", fmt="csv"
+        )
+        assert summary["updated"] == 1
+        milk = await db.ingredient.find_unique(where={"id": milk.id})
+        assert (milk.calories, milk.unit, milk.category, milk.density) == (60, "ml", "Dairy", 1.03)
+
+    asyncio.run(scenario())
+
+
+def test_only_nutrition_changes_recompute_recipes(db):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats", calories=389, protein=16.9, carbohydrates=66.3, fats=6.9)
+        created = await RecipeService(db).create_recipe({
+            "title": "Porridge", "ingredients": [{"ingredientId": oats.id, "quantity": 50, "unit": "g"}],
+        })
+        catalog = {"protein": 16.9, "carbohydrates": 66.3, "fats": 6.9}
+
+        summary = await run_import(db, row("Oats", 389, image="oats.png", **catalog))
+        assert (summary["updated"], summary["recipesRecomputed"]) == (1, 0)
+
+        summary = await run_import(db, row("Oats", 379, image="oats.png", **catalog))
+        assert (summary["updated"], summary["recipesRecomputed"]) == (1, 1)
+        porridge = await db.recipe.find_unique(where={"id": created.id})
+        assert porridge.totalCalories == pytest.approx(379 * 0.5)
+
+    asyncio.run(scenario())
+
+
+def test_failed_recompute_rolls_back_the_batch_so_a_retry_redoes_it(db, monkeypatch):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats", calories=389)
+        created = await RecipeService(db).create_recipe({
+            "title": "Porridge", "ingredients": [{"ingredientId": oats.id, "quantity": 100, "unit": "g"}],
+        })
+        recompute = RecipeService.recompute_for_ingredients
+
+        async def failing_recompute(self, *args, **kwargs):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(RecipeService, "recompute_for_ingredients", failing_recompute)
+        with pytest.raises(RuntimeError):
+            await run_import(db, row("Oats", 379))
+        assert (await db.ingredient.find_unique(where={"id": oats.id})).calories == 389
+
+        monkeypatch.setattr(RecipeService, "recompute_for_ingredients", recompute)
+        summary = await run_import(db, row("Oats", 379))
+        assert (summary["updated"], summary["recipesRecomputed"]) == (1, 1)
+        assert (await db.recipe.find_unique(where={"id": created.id})).totalCalories == pytest.approx(379)
+
+    asyncio.run(scenario())
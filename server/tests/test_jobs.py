@@ -0,0 +1,145 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+
+# server/prisma (the schema) is importable as a namespace package, so probe the client
+pytest.importorskip("prisma.errors")
+
+from services.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobWorker, PermanentJobError, _now
+
+
+def worker(db, handler, worker_id="a", **options):
+    # No backoff, so a retried job is due again right away
+    return JobWorker(db, {"work": handler}, concurrency=1, backoff_base=0, backoff_max=0, worker_id=worker_id, **options)
+
+
+async def succeed(job):
+    return {"doubled": job.payload["n"] * 2}
+
+
+async def expire_lease(db, job_id):
+    await db.job.update_many(where={"id": job_id}, data={"lockedAt": _now() - timedelta(hours=1)})
+
+
+def test_a_due_job_is_claimed_once(db):
+    async def scenario():
+        queue = JobQueue(db)
+        job = await queue.enqueue("work", {"n": 2})
+        await queue.enqueue("work", {"n": 3}, delay=3600)
+        a, b = worker(db, succeed, "a"), worker(db, succeed, "b")
+
+        claimed = await a.claim()
+        assert (claimed.id, claimed.status, claimed.attempts, claimed.lockedBy) == (job.id, RUNNING, 1, "a")
+        assert await b.claim() is None
+
+        await a.execute(claimed)
+        done = await queue.get(job.id)
+        assert (done.status, done.progress, done.lockedBy) == (SUCCEEDED, 1.0, None)
+        assert json.loads(done.result) == {"doubled": 4}
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_retried_until_max_attempts(db):
+    async def fail(job):
+        raise RuntimeError(f"attempt {job.attempt}")
+
+    async def scenario():
+        job = await JobQueue(db).enqueue("work", {}, max_attempts=3)
+        pool = worker(db, fail)
+        for attempt in (1, 2):
+            await pool.execute(await pool.claim())
+            retried = await db.job.find_unique(where={"id": job.id})
+            assert (retried.status, retried.attempts, retried.error) == (QUEUED, attempt, f"attempt {attempt}")
+
+        await pool.execute(await pool.claim())
+        failed = await db.job.find_unique(where={"id": job.id})
+        assert (failed.status, failed.attempts, failed.error) == (FAILED, 3, "attempt 3")
+        assert failed.finishedAt is not None
+        assert await pool.claim() is None
+        assert pool.stats == {"claimed": 3, "succeeded": 0, "retried": 2, "failed": 1}
+
+    asyncio.run(scenario())
+
+
+def test_permanent_errors_are_not_retried(db):
+    async def reject(job):
+        raise PermanentJobError("bad payload")
+
+    async def scenario():
+        job = await JobQueue(db).enqueue("work", {}, max_attempts=3)
+        pool = worker(db, reject)
+        await pool.execute(await pool.claim())
+        failed = await db.job.find_unique(where={"id": job.id})
+        assert (failed.status, failed.attempts) == (FAILED, 1)
+
+    asyncio.run(scenario())
+
+
+def test_an_expired_lease_hands_the_job_to_another_worker(db):
+    async def scenario():
+        job = await JobQueue(db).enqueue("work", {"n": 1})
+        a, b = worker(db, succeed, "a"), worker(db, succeed, "b")
+        stale = await a.claim()
+        assert await b.claim() is None
+
+        await expire_lease(db, job.id)
+        reclaimed = await b.claim()
+        assert (reclaimed.attempts, reclaimed.lockedBy) == (2, "b")
+
+        # The first worker finishing late must not overwrite the new owner's run
+        await a.execute(stale)
+        current = await db.job.find_unique(where={"id": job.id})
+        assert (current.status, current.lockedBy) == (RUNNING, "b")
+
+        await b.execute(reclaimed)
+        assert (await db.job.find_unique(where={"id": job.id})).status == SUCCEEDED
+
+    asyncio.run(scenario())
+
+
+def test_an_expired_lease_on_the_last_attempt_fails_the_job(db):
+    async def scenario():
+        job = await JobQueue(db).enqueue("work", {}, max_attempts=1)
+        a, b = worker(db, succeed, "a"), worker(db, succeed, "b")
+        await a.claim()
+
+        await expire_lease(db, job.id)
+        assert await b.claim() is None
+        failed = await db.job.find_unique(where={"id": job.id})
+        assert (failed.status, failed.attempts, failed.lockedBy) == (FAILED, 1, None)
+        assert failed.error == "Lease expired after 1 attempts"
+        assert b.stats["failed"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_workers_keep_running_after_a_job_fails_to_finish(db):
+    async def scenario():
+        queue = JobQueue(db)
+        first = await queue.enqueue("work", {"n": 1})
+        second = await queue.enqueue("work", {"n": 2})
+        pool = worker(db, succeed, poll_interval=0.01)
+        finish = pool._finish
+
+        async def flaky_finish(job, data):
+            if job.id == first.id:
+                raise RuntimeError("database is locked")
+            await finish(job, data)
+
+        pool._finish = flaky_finish
+        pool.start()
+        try:
+            for _ in range(200):
+                if (await queue.get(second.id)).status == SUCCEEDED:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+        assert (await queue.get(second.id)).status == SUCCEEDED
+        # Left running; its lease expiring hands it on
+        assert (await queue.get(first.id)).status == RUNNING
+
+    asyncio.run(scenario())
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import pytest
+
+# server/prisma (the schema) is importable as a namespace package, so probe the client
+pytest.importorskip("prisma.errors")
+
+from helpers import add_ingredient, byte_stream
+from services.nutrition_service import NutritionService
+from services.recipe_service import RecipeService, UnknownIngredientError
+from services.unit_conversion import UNITS, unit_converter
+
+
+def recipe(title, *lines, servings=1):
+    return {
+        "title": title,
+        "servings": servings,
+        "steps": [{"order": 1, "instruction": "Mix"}],
+        "ingredients": [{"ingredientId": i, "quantity": q, "unit": u} for i, q, u in lines],
+    }
+
+
+def test_create_recipe_rejects_unknown_ingredient(db):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats")
+        with pytest.raises(UnknownIngredientError) as error:
+            await RecipeService(db).create_recipe(recipe("Porridge", (oats.id, 50, "g"), ("missing", 1, "g")))
+        assert error.value.ingredient_ids == ["missing"]
+        assert await db.recipe.count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_line_edits_reject_unknown_ingredient_and_keep_totals(db):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats")
+        service = RecipeService(db)
+        created = await service.create_recipe(recipe("Porridge", (oats.id, 50, "g")))
+        line_id = created.ingredients[0].id
+
+        with pytest.raises(UnknownIngredientError):
+            await service.add_ingredient(created.id, {"ingredientId": "missing", "quantity": 1, "unit": "g"})
+        with pytest.raises(UnknownIngredientError):
+            await service.update_ingredient(created.id, line_id, {"ingredientId": "missing"})
+
+        stored = await db.recipe.find_unique(where={"id": created.id}, include={"ingredients": True})
+        assert stored.totalCalories == pytest.approx(50.0)
+        assert [line.ingredientId for line in stored.ingredients] == [oats.id]
+
+    asyncio.run(scenario())
+
+
+def test_import_reports_bad_rows_and_skips_stored_titles(db):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats")
+        service = RecipeService(db)
+        await service.create_recipe(recipe("Stored", (oats.id, 10, "g")))
+
+        summary = await service.import_recipes(byte_stream(
+            json.dumps(recipe("Porridge", (oats.id, 50, "g"))),
+            json.dumps(recipe("Porridge", (oats.id, 80, "g"))),
+            json.dumps(recipe("Mystery", ("missing", 1, "g"))),
+            "{not json",
+            json.dumps(recipe(["Not", "a", "title"])),
+            json.dumps(recipe("Stored", (oats.id, 10, "g"))),
+        ), chunk_size=10)
+
+        assert summary["imported"] == 1
+        assert summary["skipped"] == 2
+        errors = {error["line"]: error["error"] for error in summary["errors"]}
+        assert sorted(errors) == [3, 4, 5]
+        assert errors[3] == "Unknown ingredientId: missing"
+        assert errors[5] == "title must be a non-empty string"
+        porridge = await db.recipe.find_first(where={"title": "Porridge"})
+        assert porridge.totalCalories == pytest.approx(50.0)
+
+    asyncio.run(scenario())
+
+
+def test_import_reports_title_taken_during_the_chunk(db):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats")
+        service = RecipeService(db)
+        find_many = db.recipe.find_many
+        calls = 0
+
+        async def racing_find_many(**kwargs):
+            # After the title pre-read, another writer stores "Porridge"
+            nonlocal calls
+            result = await find_many(**kwargs)
+            calls += 1
+            if calls == 1:
+                await db.recipe.create(data={"title": "Porridge"})
+            return result
+
+        db.recipe.find_many = racing_find_many
+        summary = await service.import_recipes(byte_stream(
+            json.dumps(recipe("Porridge", (oats.id, 50, "g"))),
+            json.dumps(recipe("Muesli", (oats.id, 60, "g"))),
+        ))
+
+        assert summary["imported"] == 1
+        assert summary["skipped"] == 0
+        assert summary["errors"] == [{"line": 1, "error": "Recipe with title 'Porridge' already exists"}]
+        assert await db.recipe.count() == 2
+
+    asyncio.run(scenario())
+
+
+async def stored_totals(db, recipe_id):
+    stored = await db.recipe.find_unique(where={"id": recipe_id})
+    return {column: getattr(stored, column) for pair in NutritionService.RECIPE_COLUMNS.values() for column in pair}
+
+
+def test_line_edits_match_a_full_recompute(db):
+    async def scenario():
+        oats = await add_ingredient(db, "Oats", calories=389, protein=16.9, carbohydrates=66.3, fats=6.9)
+        milk = await add_ingredient(db, "Milk", calories=64, protein=3.3, carbohydrates=4.8, fats=3.6, density=1.03)
+        egg = await add_ingredient(db, "Egg", calories=72, protein=6.3, carbohydrates=0.4, fats=4.8,
+                                   unit="piece", pieceWeight=50)
+        service = RecipeService(db)
+        created = await service.create_recipe(recipe("Porridge", (oats.id, 80, "g"), servings=2))
+
+        async def assert_matches_recompute():
+            incremental = await stored_totals(db, created.id)
+            await service.recompute_recipes([created.id])
+            assert incremental == pytest.approx(await stored_totals(db, created.id))
+
+        line = await service.add_ingredient(created.id, {"ingredientId": milk.id, "quantity": 1, "unit": "cup"})
+        await assert_matches_recompute()
+        await service.update_ingredient(created.id, line.id, {"quantity": 250, "unit": "ml"})
+        await assert_matches_recompute()
+        await service.update_ingredient(created.id, line.id, {"ingredientId": egg.id, "quantity": 2, "unit": "piece"})
+        await assert_matches_recompute()
+        await service.remove_ingredient(created.id, line.id)
+        await assert_matches_recompute()
+        assert (await stored_totals(db, created.id))["totalCalories"] == pytest.approx(389 * 0.8)
+
+    asyncio.run(scenario())
+
+
+def test_missing_totals_backfill_skips_recipes_that_really_total_zero(db):
+    async def scenario():
+        salt = await add_ingredient(db, "Salt", calories=0, protein=0, carbohydrates=0, fats=0)
+        oats = await add_ingredient(db, "Oats")
+        service = RecipeService(db)
+        await service.create_recipe(recipe("Brine", (salt.id, 5, "g")))
+        # Written without totals, as before they were maintained on write
+        legacy = await db.recipe.create(data={
+            "title": "Legacy", "ingredients": {"create": [{"ingredientId": oats.id, "quantity": 50, "unit": "g"}]},
+        })
+
+        assert await service.recompute_missing_totals() == 1
+        assert (await stored_totals(db, legacy.id))["totalCalories"] == pytest.approx(50.0)
+        assert await service.recompute_missing_totals() == 0
+
+    asyncio.run(scenario())
+
+
+def test_recompute_uses_the_stored_density_not_cached_factors(db):
+    async def scenario():
+        milk = await add_ingredient(db, "Milk", calories=64, density=1.0)
+        service = RecipeService(db)
+        created = await service.create_recipe(recipe("Glass of milk", (milk.id, 1, "cup")))
+        # The shared converter still holds the factor for the old density
+        stale = unit_converter.factor(milk, "cup")
+
+        await db.ingredient.update(where={"id": milk.id}, data={"density": 1.5})
+        await service.recompute_for_ingredient(milk.id)
+
+        assert unit_converter.factor(milk, "cup") == stale
+        expected = 64 * UNITS["cup"][1] * 1.5 / 100
+        assert (await stored_totals(db, created.id))["totalCalories"] == pytest.approx(expected)
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services.unit_conversion import UnitConversionError, UnitConverter
+
+
+def ingredient(id="milk", unit="g", density=None, pieceWeight=None):
+    return SimpleNamespace(id=id, name=id, unit=unit, density=density, pieceWeight=pieceWeight)
+
+
+def test_factors_are_cached_until_invalidated():
+    converter = UnitConverter()
+    milk = ingredient(density=1.0)
+    assert converter.factor(milk, "l") == pytest.approx(10.0)
+
+    milk.density = 1.03
+    assert converter.factor(milk, "l") == pytest.approx(10.0)
+    converter.invalidate("milk")
+    assert converter.factor(milk, "l") == pytest.approx(10.3)
+
+
+def test_invalidate_only_drops_that_ingredient():
+    converter = UnitConverter()
+    egg, oil = ingredient("egg", unit="piece", pieceWeight=50), ingredient("oil", density=0.92)
+    assert converter.factor(egg, "g") == pytest.approx(0.02)
+    assert converter.factor(oil, "tbsp") == pytest.approx(0.92 * 14.78676478125 / 100)
+
+    egg.pieceWeight, oil.density = 60, 1.0
+    converter.invalidate("egg")
+    assert converter.factor(egg, "g") == pytest.approx(1 / 60)
+    assert converter.factor(oil, "tbsp") == pytest.approx(0.92 * 14.78676478125 / 100)
+
+
+def test_failed_conversions_are_not_cached():
+    converter = UnitConverter()
+    egg = ingredient("egg", unit="piece")
+    with pytest.raises(UnitConversionError):
+        converter.factor(egg, "g")
+
+    egg.pieceWeight = 50
+    assert converter.factor(egg, "g") == pytest.approx(0.02)
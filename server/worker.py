@@ -0,0 +1,52 @@
+"""
+Runs a standalone job worker pool against the shared Job table, so AI
+generation can scale separately from the API processes.
+
+    python worker.py --concurrency 8
+    python worker.py --types recipe.generate nutrition.recompute
+
+Catalog imports and nutrition recomputation also update the API's resident
+indexes, which a separate process can't reach; by default this worker only
+takes recipe.generate and leaves the rest to the API's own pool
+(JOB_WORKER_CONCURRENCY). Set JOB_WORKER_CONCURRENCY=0 on the API to hand
+every job to standalone workers.
+"""
+import argparse
+import asyncio
+import signal
+import main
+from services.jobs import JobWorker
+
+
+async def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs run at once")
+    parser.add_argument("--types", nargs="+", default=["recipe.generate"], choices=sorted(main.job_handlers))
+    args = parser.parse_args()
+
+    await main.storage.connect()
+    worker = JobWorker(
+        main.db,
+        {job_type: main.job_handlers[job_type] for job_type in args.types},
+        concurrency=args.concurrency,
+        poll_interval=main.job_worker.poll_interval,
+        lease=main.job_worker.lease,
+        backoff_base=main.job_worker.backoff_base,
+        backoff_max=main.job_worker.backoff_max,
+    )
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+    worker.start()
+    print(f"Worker {worker.worker_id} running {', '.join(args.types)} x{args.concurrency}")
+    try:
+        await stopped.wait()
+    finally:
+        # Running jobs go back to the queue without spending an attempt
+        await worker.stop()
+        await main.storage.disconnect()
+    print(worker.stats)
+
+if __name__ == "__main__":
+    asyncio.run(run())